@@ -3,8 +3,22 @@ import mysql.connector
 from mysql.connector import Error
 import os
 import re
+import random
+import tempfile
 from werkzeug.security import generate_password_hash, check_password_hash
-from query_builder import build_search_query, build_cultures_browse_query, build_culture_artifacts_query
+from query_builder import DYNASTY_YEAR_RANGES, build_search_query, build_cultures_browse_query, build_culture_artifacts_query, build_random_page_query, build_search_cards_query, build_search_count_query, build_search_facets_query, build_era_artifacts_query, build_era_count_query, build_browse_summary_query, build_dynasties_query, build_lookup_name_query, build_lookup_artifacts_query
+from db_config import SEARCH_CONFIG
+import db_pool
+import db_metrics
+from image_sampler import ImageSampler
+from search_index import SearchIndexManager, filter_by_year, score_rows
+from search_ranking import top_k
+from search_cache import SearchCache, normalize_query
+from era_classifier import classify_many, update_era_columns
+from lookup_tables import sync_lookup_ids
+from browse_summaries import refresh_browse_summaries
+from bulk_import import import_dataframe, ImportErrorCollector, missing_required_columns, sniff_encoding, read_csv_columns, iter_csv_chunks, read_excel_frame, validate_chunks
+from import_jobs import ImportJobManager, ensure_jobs_table
 import pandas as pd
 from datetime import datetime
 from werkzeug.utils import secure_filename
@@ -15,167 +29,6 @@ from flask import session, redirect, url_for, flash, request
 from urllib.parse import quote, unquote
 
 
-import re
-
-# 1. 轉換工具：把「十九世紀」變成 19
-def chinese_to_int_century(cn_str):
-    cn_map = {'一':1, '二':2, '三':3, '四':4, '五':5, '六':6, '七':7, '八':8, '九':9, '十':10}
-    if not cn_str: return 0
-    s = cn_str.replace('世紀', '').replace('世纪', '').strip()
-    if not s: return 0
-    if s.isdigit(): return int(s)
-    
-    # 簡單處理：十, 十九, 二十, 二十一
-    if len(s) == 1: return cn_map.get(s, 0)
-    if len(s) == 2:
-        if s[0] == '十': return 10 + cn_map.get(s[1], 0)
-        if s[1] == '十': return cn_map.get(s[0], 0) * 10
-    if len(s) == 3:
-        return cn_map.get(s[0], 0) * 10 + cn_map.get(s[2], 0)
-    return 0
-
-# 2. 東方朝代關鍵字
-# 1. 關鍵字清單：加入更多特徵
-EAST_DYNASTY_KEYWORDS = [
-    "宋", "北宋", "南宋", "明", "清", "元", "唐", "漢", "汉", "秦", "晉", "晋", "隋",
-    "康熙", "雍正", "乾隆", "嘉慶", "道光", "咸豐", "同治", "光緒", "宣統", "錢", "銭"
-]
-
-def is_east_chronology(date_cn: str) -> bool:
-    if not date_cn:
-        return False
-    s = str(date_cn).strip()
-
-    # --- 關鍵修正 A：明確的西方標識優先排除 ---
-    # 只有當出現「公元」且完全沒有「朝代」字眼時才算西方
-    has_east = any(k in s for k in EAST_DYNASTY_KEYWORDS)
-    if has_east:
-        return True
-
-    # --- 關鍵修正 B：處理 MET 的純數字或世紀 ---
-    if any(k in s for k in ["公元前", "BCE", "BC"]):
-        return False
-        
-    # 如果看到「世紀」但沒朝代，歸西方
-    if "世紀" in s or "世纪" in s:
-        return False
-
-    # 如果是故宮的資料 (通常帶有朝代或特定編號)，我們默認為東方
-    # 這裡檢查是否包含數字，若只有數字且沒有「世紀」，通常也是西方
-    if re.fullmatch(r'\d+', s):
-        return False
-
-    return False
-
-def normalize_east_bucket(date_cn: str) -> str:
-    if not date_cn:
-        return "其他東"
-    s = str(date_cn).strip()
-
-    # 1. 優先處理「宋」
-    if "宋" in s:
-        if "北宋" in s: return "宋"
-        if "南宋" in s: return "宋"
-        return "宋"
-
-    # 2. 處理「清」及其年號
-    qing_years = ["康熙", "雍正", "乾隆", "嘉慶", "道光", "咸豐", "同治", "光緒", "清"]
-    if any(k in s for k in qing_years):
-        return "清"
-
-    # 3. 處理「明」
-    if "明" in s:
-        return "明"
-
-    # 4. 處理其他主要朝代
-    if "元" in s: return "元"
-    if "唐" in s: return "唐"
-    if any(k in s for k in ["漢", "汉"]): return "漢"
-    
-    # 5. 針對「購錢」或無法判定的故宮文物保底
-    return "其他東"
-
-def normalize_west_bucket(date_cn: str) -> str:
-    """
-    西方纪年桶：古代 / 中世纪 / 近世 / 近代 / 现代 / 其他西
-    按最早年份或世纪粗分。
-    """
-    if not date_cn:
-        return "其他西"
-    s = date_cn.strip()
-
-    # 1. BCE / 公元前：当成古代
-    if "公元前" in s or "BCE" in s or "BC" in s:
-        return "古代"
-
-    # 2. 数字世纪：19世纪 / 20世纪
-    m_cent = re.search(r"(\d{1,2})\s*世紀|(\d{1,2})\s*世纪", s)
-    if m_cent:
-        cent = int(m_cent.group(1) or m_cent.group(2))
-        if cent <= 4:
-            return "古代"
-        if 5 <= cent <= 15:
-            return "中世纪"
-        if 16 <= cent <= 18:
-            return "近世"
-        if cent == 19:
-            return "近代"
-        if cent >= 20:
-            return "现代"
-        return "其他西"
-
-    # 3. 中文数字世纪：十二世纪 / 二十世纪
-    m_cn_cent = re.search(r"([一二三四五六七八九十]+)\s*(世紀|世纪)", s)
-    if m_cn_cent:
-        cn_cent_str = m_cn_cent.group(1)
-        cent = chinese_to_int_century(cn_cent_str)
-        if cent > 0:
-            if cent <= 4:
-                return "古代"
-            if 5 <= cent <= 15:
-                return "中世纪"
-            if 16 <= cent <= 18:
-                return "近世"
-            if cent == 19:
-                return "近代"
-            if cent >= 20:
-                return "现代"
-        return "其他西"
-
-    # 4. 具体年份：1707, 1893, 410 等
-    m_year = re.search(r"(\d{3,4})", s)
-    if m_year:
-        y = int(m_year.group(1))
-        if y <= 500:
-            return "古代"
-        if 501 <= y <= 1500:
-            return "中世纪"
-        if 1501 <= y <= 1800:
-            return "近世"
-        if 1801 <= y <= 1900:
-            return "近代"
-        if y >= 1901:
-            return "现代"
-
-    return "其他西"
-
-
-def normalize_era_from_date_cn(date_cn: str):
-    """
-    返回 (system, bucket)
-    system: 东方纪年 / 西方纪年
-    bucket: 东方: 宋/明/清/明清/其他东
-            西方: 古代/中世纪/近世/近代/现代/其他西
-    """
-    if not date_cn:
-        return ("西方纪年", "其他西")
-
-    if is_east_chronology(date_cn):
-        return ("东方纪年", normalize_east_bucket(date_cn))
-    else:
-        return ("西方纪年", normalize_west_bucket(date_cn))
-
-
 def era_key(system: str, bucket: str) -> str:
     """
     生成 URL key：east__ming / west__modern 这种
@@ -228,14 +81,14 @@ db_config = {
     'database': os.getenv('DB_NAME', 'project')
 }
 
+# 连接池：每个请求共享一条池化连接，请求结束时自动归还
+db_pool.init_app(app, db_config)
+# 请求耗时统计：Server-Timing 响应头与慢请求日志
+db_metrics.init_app(app)
+
 def get_db_connection():
-    """建立数据库连接"""
-    try:
-        conn = mysql.connector.connect(**db_config)
-        return conn
-    except Error as e:
-        print(f"Error connecting to MySQL: {e}")
-        return None
+    """获取数据库连接（请求内复用同一条池化连接，失败返回 None）"""
+    return db_pool.get_request_connection()
 
 def check_and_update_tables():
     """檢查並更新資料庫表結構"""
@@ -337,119 +190,402 @@ def normalize_image_path(path):
         
     return f"images/{filename}"
 
+# 首页背景图片采样器：后台定期从数据库抽样，请求时只读内存
+homepage_sampler = ImageSampler(get_db_connection, normalize_image_path)
+
+# 搜索内存索引（SEARCH_INDEX_ENABLED=1 时启用，见 search_index.py）
+search_index_manager = SearchIndexManager(get_db_connection)
+
+# 搜索结果缓存（按目录版本号失效，见 search_cache.py）
+search_cache = SearchCache(get_db_connection)
+
 @app.route('/')
 def homepage():
     """
     动态主页：沉浸式首屏和自由浏览入口
+    背景图片从内存候选池中抽取（见 image_sampler.py），不在请求中查询数据库
     """
+    return render_template('homepage.html', 
+                         random_images=homepage_sampler.draw('random'),
+                         culture_images=homepage_sampler.draw('culture'),
+                         geography_images=homepage_sampler.draw('geography'),
+                         era_images=homepage_sampler.draw('era'))
+
+# 随机浏览每页条数
+RANDOM_PAGE_SIZE = 60
+
+def init_shuffle_key():
+    """確保 ARTIFACTS 表有隨機排列鍵 Shuffle_Key 及其索引（随机浏览使用）"""
+    conn = get_db_connection()
+    if not conn: return
+    
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("ALTER TABLE ARTIFACTS ADD COLUMN Shuffle_Key DOUBLE NOT NULL DEFAULT (RAND())")
+            print("列 Shuffle_Key 添加成功")
+        except Error as e:
+            if e.errno != 1060:  # 1060：列已存在
+                print(f"列 Shuffle_Key 失敗: {e}")
+        try:
+            cursor.execute("CREATE INDEX idx_artifacts_shuffle_key ON ARTIFACTS (Shuffle_Key)")
+        except Error as e:
+            if e.errno != 1061:  # 1061：索引已存在
+                print(f"索引 idx_artifacts_shuffle_key 失敗: {e}")
+        conn.commit()
+        cursor.close()
+    except Error as e:
+        print(f"資料庫更新失敗: {e}")
+    finally:
+        conn.close()
+
+def init_era_columns():
+    """確保 ARTIFACTS 表有年代分类列 Era_System / Era_Bucket 及其索引，并为尚未分类的文物补算"""
+    conn = get_db_connection()
+    if not conn: return
+    
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                ALTER TABLE ARTIFACTS
+                ADD COLUMN Era_System VARCHAR(10) NULL,
+                ADD COLUMN Era_Bucket VARCHAR(10) NULL
+            """)
+            print("列 Era_System / Era_Bucket 添加成功")
+        except Error as e:
+            if e.errno != 1060:  # 1060：列已存在
+                print(f"列 Era_System / Era_Bucket 失敗: {e}")
+        try:
+            cursor.execute("CREATE INDEX idx_artifacts_era ON ARTIFACTS (Era_System, Era_Bucket, Artifact_PK)")
+        except Error as e:
+            if e.errno != 1061:  # 1061：索引已存在
+                print(f"索引 idx_artifacts_era 失敗: {e}")
+        updated = update_era_columns(cursor, only_missing=True)
+        if updated:
+            print(f"已为 {updated} 件文物补算年代分类")
+        conn.commit()
+        cursor.close()
+    except Error as e:
+        print(f"資料庫更新失敗: {e}")
+    finally:
+        conn.close()
+
+def init_lookup_tables():
+    """確保文化 / 地理维度表及 PROPERTIES 上的外键存在，并为外键为空的属性行回填"""
+    conn = get_db_connection()
+    if not conn: return
+    
+    try:
+        cursor = conn.cursor()
+        for table, id_col, name_col, fk_name in (('CULTURES', 'Culture_ID', 'Culture_Name', 'fk_prop_culture'),
+                                                 ('GEOGRAPHIES', 'Geography_ID', 'Geography_Name', 'fk_prop_geography')):
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    {id_col} INT AUTO_INCREMENT PRIMARY KEY,
+                    {name_col} VARCHAR(100) NOT NULL,
+                    UNIQUE KEY uk_{table.lower()}_name ({name_col})
+                )
+            """)
+            try:
+                cursor.execute(f"""
+                    ALTER TABLE PROPERTIES
+                    ADD COLUMN {id_col} INT NULL,
+                    ADD CONSTRAINT {fk_name}
+                        FOREIGN KEY ({id_col}) REFERENCES {table} ({id_col}) ON DELETE SET NULL
+                """)
+                print(f"列 PROPERTIES.{id_col} 添加成功")
+            except Error as e:
+                if e.errno != 1060:  # 1060：列已存在
+                    print(f"列 PROPERTIES.{id_col} 失敗: {e}")
+            try:
+                cursor.execute(f"CREATE INDEX idx_properties_{id_col.lower()} ON PROPERTIES ({id_col}, Artifact_PK)")
+            except Error as e:
+                if e.errno != 1061:  # 1061：索引已存在
+                    print(f"索引 idx_properties_{id_col.lower()} 失敗: {e}")
+        sync_lookup_ids(cursor, only_missing=True)
+        conn.commit()
+        cursor.close()
+    except Error as e:
+        print(f"資料庫更新失敗: {e}")
+    finally:
+        conn.close()
+
+def init_browse_summaries():
+    """確保浏览页汇总表存在，并全量刷新一次（导入脚本或其他进程的写入在启动时补齐）"""
+    conn = get_db_connection()
+    if not conn: return
+    
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS BROWSE_SUMMARIES (
+                Dimension VARCHAR(20) NOT NULL,
+                Value_Group VARCHAR(20) NOT NULL DEFAULT '',
+                Value_Name VARCHAR(100) NOT NULL,
+                Value_ID INT NULL,
+                Artifact_Count INT NOT NULL DEFAULT 0,
+                Representative_Version_PK INT NULL,
+                Updated_Time TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                PRIMARY KEY (Dimension, Value_Group, Value_Name),
+                KEY idx_browse_summaries_id (Dimension, Value_ID)
+            )
+        """)
+        refresh_browse_summaries(cursor)
+        conn.commit()
+        cursor.close()
+    except Error as e:
+        print(f"資料庫更新失敗: {e}")
+    finally:
+        conn.close()
+
+def rebuild_browse_summaries():
+    """全量重建浏览页汇总表"""
     conn = get_db_connection()
     if conn is None:
-        # 如果数据库连接失败，仍然可以显示页面，只是没有背景图片
-        return render_template('homepage.html', 
-                             random_images=[], 
-                             culture_images=[],
-                             geography_images=[],
-                             era_images=[])
+        return False
     
     try:
-        cursor = conn.cursor(dictionary=True)
-        
-        # 获取随机浏览的代表性图片（随机获取4-6张图片）
-        random_query = """
-            SELECT iv.Local_Path as local_path
-            FROM IMAGE_VERSIONS iv
-            INNER JOIN ARTIFACTS a ON iv.Artifact_PK = a.Artifact_PK
-            WHERE iv.Local_Path IS NOT NULL AND iv.Local_Path != ''
-            ORDER BY RAND()
-            LIMIT 6
-        """
-        cursor.execute(random_query)
-        random_images = cursor.fetchall()
-        
-        # 获取文化浏览的代表性图片（从不同文化中获取图片）
-        culture_query = """
-            SELECT DISTINCT iv.Local_Path as local_path
-            FROM IMAGE_VERSIONS iv
-            INNER JOIN ARTIFACTS a ON iv.Artifact_PK = a.Artifact_PK
-            INNER JOIN PROPERTIES p ON a.Artifact_PK = p.Artifact_PK
-            WHERE iv.Local_Path IS NOT NULL AND iv.Local_Path != '' 
-                AND p.Culture IS NOT NULL AND p.Culture != ''
-            GROUP BY p.Culture, iv.Local_Path
-            ORDER BY RAND()
-            LIMIT 6
-        """
-        cursor.execute(culture_query)
-        culture_images = cursor.fetchall()
-        
-        # 获取地理浏览的代表性图片（从不同地理区域中获取图片）
-        geography_query = """
-            SELECT DISTINCT iv.Local_Path as local_path
-            FROM IMAGE_VERSIONS iv
-            INNER JOIN ARTIFACTS a ON iv.Artifact_PK = a.Artifact_PK
-            INNER JOIN PROPERTIES p ON a.Artifact_PK = p.Artifact_PK
-            WHERE iv.Local_Path IS NOT NULL AND iv.Local_Path != '' 
-                AND p.Geography IS NOT NULL AND p.Geography != ''
-            GROUP BY p.Geography, iv.Local_Path
-            ORDER BY RAND()
-            LIMIT 6
-        """
-        cursor.execute(geography_query)
-        geography_images = cursor.fetchall()
-        
-        # 获取年代浏览的代表性图片（从有年代信息的文物中获取图片）
-        era_query = """
-            SELECT DISTINCT iv.Local_Path as local_path
-            FROM IMAGE_VERSIONS iv
-            INNER JOIN ARTIFACTS a ON iv.Artifact_PK = a.Artifact_PK
-            WHERE iv.Local_Path IS NOT NULL AND iv.Local_Path != '' 
-                AND a.Date_CN IS NOT NULL AND a.Date_CN != ''
-            ORDER BY RAND()
-            LIMIT 6
-        """
-        cursor.execute(era_query)
-        era_images = cursor.fetchall()
-        
-        # 规范化图片路径
-        for img in random_images:
-            if img.get('local_path'):
-                img['local_path'] = normalize_image_path(img['local_path'])
-        
-        for img in culture_images:
-            if img.get('local_path'):
-                img['local_path'] = normalize_image_path(img['local_path'])
-        
-        for img in geography_images:
-            if img.get('local_path'):
-                img['local_path'] = normalize_image_path(img['local_path'])
-        
-        for img in era_images:
-            if img.get('local_path'):
-                img['local_path'] = normalize_image_path(img['local_path'])
-        
+        cursor = conn.cursor()
+        ok = refresh_browse_summaries(cursor)
+        conn.commit()
         cursor.close()
+        return ok
+    except Error as e:
+        print(f"Error refreshing browse summaries: {e}")
+        conn.rollback()
+        return False
+    finally:
         conn.close()
-        
-        return render_template('homepage.html', 
-                             random_images=[img['local_path'] for img in random_images if img.get('local_path')],
-                             culture_images=[img['local_path'] for img in culture_images if img.get('local_path')],
-                             geography_images=[img['local_path'] for img in geography_images if img.get('local_path')],
-                             era_images=[img['local_path'] for img in era_images if img.get('local_path')])
+
+def init_year_interval():
+    """確保年代区间筛选所需的 Effective_End_Year 生成列、复合索引与朝代表存在"""
+    conn = get_db_connection()
+    if not conn: return
+    
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                ALTER TABLE ARTIFACTS
+                ADD COLUMN Effective_End_Year INT AS (COALESCE(End_Year, Start_Year)) STORED
+            """)
+            print("列 Effective_End_Year 添加成功")
+        except Error as e:
+            if e.errno != 1060:  # 1060：列已存在
+                print(f"列 Effective_End_Year 失敗: {e}")
+        for name, columns in (('idx_artifacts_year_start', 'Start_Year, Effective_End_Year'),
+                              ('idx_artifacts_year_end', 'Effective_End_Year, Start_Year')):
+            try:
+                cursor.execute(f"CREATE INDEX {name} ON ARTIFACTS ({columns})")
+            except Error as e:
+                if e.errno != 1061:  # 1061：索引已存在
+                    print(f"索引 {name} 失敗: {e}")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS DYNASTIES (
+                Dynasty_Name VARCHAR(20) PRIMARY KEY,
+                Start_Year INT NOT NULL,
+                End_Year INT NOT NULL
+            )
+        """)
+        cursor.executemany(
+            "INSERT IGNORE INTO DYNASTIES (Dynasty_Name, Start_Year, End_Year) VALUES (%s, %s, %s)",
+            [(name, start, end) for name, (start, end) in DYNASTY_YEAR_RANGES.items()]
+        )
+        conn.commit()
+        cursor.close()
     except Error as e:
-        if conn:
-            conn.close()
-        # 即使查询失败，也显示页面
-        return render_template('homepage.html', 
-                             random_images=[], 
-                             culture_images=[],
-                             geography_images=[],
-                             era_images=[])
+        print(f"資料庫更新失敗: {e}")
+    finally:
+        conn.close()
+
+def init_import_index():
+    """確保批量导入按 Source_ID + Original_ID 匹配已存在文物所用的索引存在"""
+    conn = get_db_connection()
+    if not conn: return
+    
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("CREATE INDEX idx_artifacts_source_original ON ARTIFACTS (Source_ID, Original_ID)")
+        except Error as e:
+            if e.errno != 1061:  # 1061：索引已存在
+                print(f"索引 idx_artifacts_source_original 失敗: {e}")
+        cursor.close()
+    except Error as e:
+        print(f"資料庫更新失敗: {e}")
+    finally:
+        conn.close()
+
+def init_search_filters():
+    """去除搜索筛选列（文化 / 地区 / 材质）已有数据两端的空白并建立索引（见 sql/database_migration_search_filters.sql）"""
+    conn = get_db_connection()
+    if not conn: return
+    
+    try:
+        cursor = conn.cursor()
+        for table, column in (('PROPERTIES', 'Culture'), ('PROPERTIES', 'Geography'), ('ARTIFACTS', 'Material')):
+            cursor.execute(f"UPDATE {table} SET {column} = TRIM({column}) WHERE {column} <> TRIM({column})")
+            if cursor.rowcount:
+                print(f"已去除 {cursor.rowcount} 条 {table}.{column} 两端的空白")
+            index_name = f"idx_{table.lower()}_{column.lower()}"
+            try:
+                cursor.execute(f"CREATE INDEX {index_name} ON {table} ({column}, Artifact_PK)")
+            except Error as e:
+                if e.errno != 1061:  # 1061：索引已存在
+                    print(f"索引 {index_name} 失敗: {e}")
+        conn.commit()
+        cursor.close()
+    except Error as e:
+        print(f"資料庫更新失敗: {e}")
+    finally:
+        conn.close()
+
+def init_import_jobs():
+    """確保后台导入任务表 IMPORT_JOBS 存在"""
+    conn = get_db_connection()
+    if not conn: return
+    
+    try:
+        cursor = conn.cursor()
+        ensure_jobs_table(cursor)
+        conn.commit()
+        cursor.close()
+    except Error as e:
+        print(f"資料庫更新失敗: {e}")
+    finally:
+        conn.close()
+
+_dynasty_ranges = {}
+
+def get_dynasty_ranges():
+    """朝代 → (起始年, 结束年)：首次使用时读取 DYNASTIES 表，读取失败时使用内置区间"""
+    if not _dynasty_ranges:
+        ranges = dict(DYNASTY_YEAR_RANGES)
+        conn = get_db_connection()
+        if conn is not None:
+            try:
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute(build_dynasties_query())
+                for row in cursor.fetchall():
+                    ranges[row['name']] = (row['start_year'], row['end_year'])
+                cursor.close()
+            except Error as e:
+                print(f"Error loading dynasties: {e}")
+            finally:
+                conn.close()
+        _dynasty_ranges.update(ranges)
+    return _dynasty_ranges
+
+def backfill_era_columns():
+    """全量重算所有文物的年代分类（分类规则调整后执行）"""
+    conn = get_db_connection()
+    if conn is None:
+        return 0
+    
+    try:
+        cursor = conn.cursor()
+        updated = update_era_columns(cursor)
+        if updated:
+            refresh_browse_summaries(cursor)
+        conn.commit()
+        cursor.close()
+        return updated
+    except Error as e:
+        print(f"Error backfilling era columns: {e}")
+        conn.rollback()
+        return 0
+    finally:
+        conn.close()
+
+def init_catalogue_version():
+    """確保目录版本号表存在（搜索缓存的失效依据，见 search_cache.py）"""
+    conn = get_db_connection()
+    if not conn: return
+    
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS CATALOGUE_VERSION (
+                Id TINYINT PRIMARY KEY,
+                Version BIGINT NOT NULL DEFAULT 0,
+                Updated_Time TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("INSERT IGNORE INTO CATALOGUE_VERSION (Id, Version) VALUES (1, 0)")
+        conn.commit()
+        cursor.close()
+    except Error as e:
+        print(f"資料庫更新失敗: {e}")
+    finally:
+        conn.close()
+
+def reshuffle_artifacts():
+    """重新生成所有文物的随机排列键（建议定期执行，例如每天一次）"""
+    conn = get_db_connection()
+    if conn is None:
+        return 0
+    
+    try:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE ARTIFACTS SET Shuffle_Key = RAND()")
+        updated = cursor.rowcount
+        conn.commit()
+        cursor.close()
+        return updated
+    except Error as e:
+        print(f"Error reshuffling artifacts: {e}")
+        conn.rollback()
+        return 0
+    finally:
+        conn.close()
+
+@app.cli.command('reshuffle')
+def reshuffle_command():
+    """flask reshuffle：重新生成随机浏览的排列顺序"""
+    print(f"已重新排列 {reshuffle_artifacts()} 件文物")
+
+@app.cli.command('backfill-eras')
+def backfill_eras_command():
+    """flask backfill-eras：按当前分类规则重算所有文物的 Era_System / Era_Bucket"""
+    updated = backfill_era_columns()
+    if updated:
+        search_cache.bump_version()
+    print(f"已重算 {updated} 件文物的年代分类")
+
+@app.cli.command('refresh-browse-summaries')
+def refresh_browse_summaries_command():
+    """flask refresh-browse-summaries：全量重建文化 / 地理 / 年代浏览页的汇总表"""
+    if rebuild_browse_summaries():
+        print("浏览页汇总已刷新")
+
+def _random_shuffle_seed():
+    """
+    获取随机浏览的种子（0 <= seed < 1）
+    优先使用 URL 中的 seed（保证翻页稳定），否则使用会话中的种子；?reseed=1 换一个新种子
+    """
+    seed = request.args.get('seed', type=float)
+    if seed is not None and 0 <= seed < 1:
+        return seed
+    
+    seed = session.get('shuffle_seed')
+    if seed is None or request.args.get('reseed'):
+        seed = round(random.random(), 6)
+        session['shuffle_seed'] = seed
+    return seed
 
 @app.route('/explore')
 @app.route('/random')
 def random_browse():
     """
-    随机浏览页面：随机排序展示所有文物条目
+    随机浏览页面：按持久化的随机排列键分页展示文物条目
+    每个会话从排列中的不同位置（种子）开始，顺序读到末尾后回绕到开头，
+    "下一页"通过 (after, wrapped) 续读，同一种子的翻页结果稳定
     """
+    seed = _random_shuffle_seed()
+    after = request.args.get('after', type=float)
+    wrapped = request.args.get('wrapped', 0, type=int) == 1
+    
     conn = get_db_connection()
     if conn is None:
         return render_template('error.html', 
@@ -458,21 +594,37 @@ def random_browse():
     try:
         cursor = conn.cursor(dictionary=True)
         
-        # 随机排序查询（使用RAND()函数）
-        query = """
-            SELECT 
-                a.Artifact_PK AS artifact_id, 
-                a.Title_CN AS title, 
-                a.Date_CN AS date_text, 
-                ANY_VALUE(iv.Local_Path) AS local_path
-            FROM ARTIFACTS a
-            LEFT JOIN IMAGE_VERSIONS iv ON a.Artifact_PK = iv.Artifact_PK
-            GROUP BY a.Artifact_PK
-            ORDER BY RAND()
-        """
+        # 多取一条用于判断是否还有下一页
+        wanted = RANDOM_PAGE_SIZE + 1
+        artifacts = []
         
-        cursor.execute(query)
-        artifacts = cursor.fetchall()
+        if not wrapped:
+            # 第一段：[seed, 1)
+            lower = after if after is not None else seed
+            cursor.execute(build_random_page_query(inclusive_start=after is None),
+                           (lower, 1.0, wanted))
+            for row in cursor.fetchall():
+                row['wrapped'] = 0
+                artifacts.append(row)
+            # 读到末尾后回绕：第二段 [0, seed)
+            if len(artifacts) < wanted:
+                cursor.execute(build_random_page_query(inclusive_start=True),
+                               (0.0, seed, wanted - len(artifacts)))
+                for row in cursor.fetchall():
+                    row['wrapped'] = 1
+                    artifacts.append(row)
+        else:
+            cursor.execute(build_random_page_query(), (after or 0.0, seed, wanted))
+            for row in cursor.fetchall():
+                row['wrapped'] = 1
+                artifacts.append(row)
+        
+        next_url = None
+        if len(artifacts) > RANDOM_PAGE_SIZE:
+            artifacts = artifacts[:RANDOM_PAGE_SIZE]
+            last = artifacts[-1]
+            next_url = url_for('random_browse', seed=seed,
+                               after=repr(last['shuffle_key']), wrapped=last['wrapped'])
         
         # 规范化图片路径
         for artifact in artifacts:
@@ -482,7 +634,9 @@ def random_browse():
         cursor.close()
         conn.close()
         
-        return render_template('index.html', artifacts=artifacts, page_title='随机浏览')
+        return render_template('index.html', artifacts=artifacts, page_title='随机浏览',
+                               next_url=next_url,
+                               reshuffle_url=url_for('random_browse', reseed=1))
     except Error as e:
         if conn:
             conn.close()
@@ -676,12 +830,132 @@ def download_artifact_image(artifact_id):
             connection.close()
         return f"下载错误: {str(e)}", 500
 
+# MySQL 错误码：找不到与列清单匹配的 FULLTEXT 索引
+ER_FT_MATCHING_KEY_NOT_FOUND = 1191
+
+# 运行期的搜索状态（FULLTEXT 索引缺失时自动降级为 LIKE）
+_search_state = {'fulltext_available': True}
+
+def _search_mode():
+    """当前使用的搜索模式：配置为 fulltext 且索引可用时走 FULLTEXT，否则走 LIKE"""
+    if SEARCH_CONFIG['mode'] == 'fulltext' and _search_state['fulltext_available']:
+        return 'fulltext'
+    return 'like'
+
+# 搜索结果每页条数
+SEARCH_PAGE_SIZE = 60
+# SQL 路径相关度排序时参与打分的候选条数（取整页的倍数，打分范围之后的页按 SQL 预排序分页）
+RELEVANCE_WINDOW = max(-(-SEARCH_CONFIG['relevance_candidates'] // SEARCH_PAGE_SIZE), 1) * SEARCH_PAGE_SIZE
+
+def _search_page_url(page):
+    """保留当前搜索的所有参数，只替换页码"""
+    args = request.args.to_dict(flat=False)
+    args['page'] = page
+    return url_for('search', **args)
+
+def attach_search_cards(cursor, artifacts):
+    """
+    内存索引的结果不含标题和图片，SQL 路径的缓存只有文物 ID：按当前页的 ID 一次性补齐卡片数据
+    （行中已有的字段保持不变）
+    """
+    ids = [a['artifact_id'] for a in artifacts]
+    cursor.execute(build_search_cards_query(len(ids)), ids)
+    cards = {row['artifact_id']: row for row in cursor.fetchall()}
+    for artifact in artifacts:
+        card = cards.get(artifact['artifact_id'], {})
+        artifact['title'] = card.get('title')
+        artifact['local_path'] = card.get('local_path')
+        for key in ('date_text', 'culture_name', 'medium'):
+            artifact.setdefault(key, card.get(key))
+
+def _execute_search(cursor, build, search_term, *args, **kwargs):
+    """执行搜索相关查询；FULLTEXT 索引缺失时本进程内退回 LIKE 模式后重试"""
+    query, params = build(search_term, *args, mode=_search_mode(), **kwargs)
+    try:
+        cursor.execute(query, params)
+    except Error as e:
+        if e.errno != ER_FT_MATCHING_KEY_NOT_FOUND:
+            raise
+        # 未建立 FULLTEXT 索引：本进程内退回 LIKE 模式
+        print("FULLTEXT 索引不存在，搜索退回 LIKE 模式。请执行 sql/database_fulltext_search.sql")
+        _search_state['fulltext_available'] = False
+        query, params = build(search_term, *args, mode='like', **kwargs)
+        cursor.execute(query, params)
+
+def filter_search_results(artifacts, culture_filters=(), material_filters=(), region_filters=(), era_filters=()):
+    """在内存中应用筛选条件（内存索引的结果，以及 SQL 路径上的年代筛选）"""
+    if culture_filters or material_filters or region_filters or era_filters:
+        filtered_artifacts = []
+        # 年代分类批量计算（相同的年代文字只分类一次）
+        date_texts = [(artifact.get('date_text') or '').strip() for artifact in artifacts] if era_filters else []
+        eras = classify_many(date_texts)
+        for i, artifact in enumerate(artifacts):
+            # 检查文化筛选
+            if culture_filters:
+                artifact_culture = artifact.get('culture_name', '') or ''
+                artifact_culture = artifact_culture.strip()
+                if artifact_culture not in culture_filters:
+                    continue
+            
+            # 检查材质筛选
+            if material_filters:
+                artifact_material = artifact.get('medium', '') or ''
+                artifact_material = artifact_material.strip()
+                if artifact_material not in material_filters:
+                    continue
+            
+            # 检查地区筛选
+            if region_filters:
+                artifact_geography = artifact.get('geography', '') or ''
+                artifact_geography = artifact_geography.strip()
+                if artifact_geography not in region_filters:
+                    continue
+            
+            # 检查年代筛选
+            if era_filters:
+                if not date_texts[i]:
+                    # 如果没有年代信息，跳过
+                    continue
+                system, bucket = eras[i]
+                # 年代筛选值格式：system__bucket
+                if f"{system}__{bucket}" not in era_filters:
+                    continue
+            
+            filtered_artifacts.append(artifact)
+        
+        artifacts = filtered_artifacts
+    
+    return artifacts
+
+def sort_search_results(artifacts, sort_by, k):
+    """在内存中排序；相关度排序只用堆取前 k 条"""
+    if sort_by == 'era_asc':
+        # 按年代从早到晚排序（start_year 升序）
+        artifacts = sorted(artifacts, key=lambda x: (
+            x.get('start_year') is None,  # None 值放到最后
+            x.get('start_year') or float('inf')  # 按 start_year 升序
+        ))
+    elif sort_by == 'era_desc':
+        # 按年代从晚到早排序（start_year 降序）
+        artifacts = sorted(artifacts, key=lambda x: (
+            x.get('start_year') is None,  # None 值放到最后
+            -(x.get('start_year') or float('-inf'))  # 按 start_year 降序
+        ))
+    elif sort_by == 'newest':
+        # 按最新入库排序（artifact_id 降序）
+        artifacts = sorted(artifacts, key=lambda x: x.get('artifact_id', 0), reverse=True)
+    else:
+        # 'relevance' 或其他：按 BM25 分数用堆取到当前页为止的前 k 条
+        artifacts = top_k(artifacts, k)
+    return artifacts
+
 @app.route('/search')
 def search():
     """
     搜索页面：根据关键词搜索文物
     支持在标题、艺术家、文化、部门、年代、描述、材质中搜索
     支持高级筛选（年代、文化、材质、地区）和排序功能
+    未启用内存索引时，文化/材质/地区筛选、排序和分页都在 SQL 中完成，筛选项统计由分组聚合查询得到
     """
     search_term = request.args.get('q', '').strip()
     
@@ -691,8 +965,9 @@ def search():
     material_filters = request.args.getlist('material')
     region_filters = request.args.getlist('region')
     
-    # 获取排序参数
+    # 获取排序与分页参数
     sort_by = request.args.get('sort', 'relevance')
+    page = max(request.args.get('page', 1, type=int), 1)
     
     # 构建激活的筛选字典（用于显示筛选标签）
     active_filters = {}
@@ -717,114 +992,128 @@ def search():
     try:
         cursor = conn.cursor(dictionary=True)
         
-        # 获取年代筛选参数（如果存在）
+        # 获取年代筛选参数（如果存在）：直接给出年份区间，或按朝代（?dynasty=明）换算
         start_year = request.args.get('start_year', type=int)
         end_year = request.args.get('end_year', type=int)
-        
-        # 构建搜索查询
-        query, params = build_search_query(search_term, start_year, end_year)
-        if query is None:
-            cursor.close()
-            conn.close()
-            return redirect(url_for('homepage'))
-        
-        # 执行搜索查询，使用返回的参数列表
-        cursor.execute(query, params)
-        artifacts = cursor.fetchall()
+        dynasty_range = get_dynasty_ranges().get(request.args.get('dynasty', '').strip())
+        if dynasty_range and (start_year is None or end_year is None):
+            start_year, end_year = dynasty_range
+        
+        # 相关度排序（默认）需要 BM25 打分：内存索引自带分数，SQL 路径对预排序的前若干条取文本列在应用内打分
+        rank_by_relevance = sort_by not in ('era_asc', 'era_desc', 'newest')
+        
+        # 缓存键：规范化的查询 + 年代区间（导入或替换图像后整体失效）
+        query_key = (normalize_query(search_term), start_year, end_year)
+        sql_filters = {'culture': culture_filters, 'material': material_filters, 'region': region_filters,
+                       'era': era_filters}
+        filters_key = tuple(tuple(sorted(values)) for values in sql_filters.values())
+        
+        # 优先使用内存索引（未启用或尚未构建完成时返回 None，走 SQL 搜索）
+        cached = search_cache.get(('index',) + query_key)
+        if cached is None:
+            index_rows = search_index_manager.search(search_term)
+            if index_rows is not None:
+                index_rows = filter_by_year(index_rows, start_year, end_year)
+                cached = (index_rows, get_filter_options_from_results(index_rows))
+                search_cache.put(('index',) + query_key, cached)
+        from_index = cached is not None
+        
+        if from_index:
+            # 内存索引：候选结果已在内存中，筛选与排序也在内存中完成
+            artifacts, filter_options = cached
+            artifacts = filter_search_results(artifacts, culture_filters, material_filters,
+                                              region_filters, era_filters)
+            total_count = len(artifacts)
+            artifacts = sort_search_results(artifacts, sort_by, page * SEARCH_PAGE_SIZE)
+            paged = False
+        else:
+            # 获取筛选选项数据（基于关键词与年代命中的全部结果，不受文化/材质/地区筛选影响）
+            try:
+                facets_key = ('facets',) + query_key
+                filter_options = search_cache.get(facets_key)
+                if filter_options is None:
+                    _execute_search(cursor, build_search_facets_query, search_term, start_year, end_year)
+                    filter_options = get_filter_options_from_facets(cursor.fetchall())
+                    search_cache.put(facets_key, filter_options)
+            except Error as e:
+                print(f"Error getting filter options: {e}")
+                # 如果获取失败，使用空数据
+                filter_options = {
+                    'eras': [],
+                    'cultures': [],
+                    'materials': [],
+                    'regions': []
+                }
+            
+            # 总数由 SQL 计算
+            count_key = ('count',) + query_key + (filters_key,)
+            total_count = search_cache.get(count_key)
+            if total_count is None:
+                _execute_search(cursor, build_search_count_query, search_term, start_year, end_year,
+                                filters=sql_filters)
+                total_count = cursor.fetchone()['total']
+                search_cache.put(count_key, total_count)
+            page = min(page, max((total_count + SEARCH_PAGE_SIZE - 1) // SEARCH_PAGE_SIZE, 1))
+            sql_sort = 'relevance' if rank_by_relevance else sort_by
+            
+            # 缓存只保存排好序的文物 ID（相关度排序带分数），当前页的卡片数据按 ID 另行读取
+            if rank_by_relevance and page * SEARCH_PAGE_SIZE <= RELEVANCE_WINDOW:
+                # 相关度打分需要文本列：只取回 SQL 预排序（标题命中优先）的前 RELEVANCE_WINDOW 条，在应用内打分
+                ranked_key = ('ranked',) + query_key + (filters_key,)
+                ranked = search_cache.get(ranked_key)
+                if ranked is None:
+                    _execute_search(cursor, build_search_query, search_term, start_year, end_year,
+                                    with_text=True, filters=sql_filters, sort_by='relevance',
+                                    limit=RELEVANCE_WINDOW)
+                    rows = cursor.fetchall()
+                    score_rows(rows, search_term)
+                    ranked = [(row['artifact_id'], row['score']) for row in top_k(rows, len(rows))]
+                    search_cache.put(ranked_key, ranked)
+                artifacts = [{'artifact_id': artifact_id, 'score': score} for artifact_id, score
+                             in ranked[(page - 1) * SEARCH_PAGE_SIZE:page * SEARCH_PAGE_SIZE]]
+            else:
+                # 按年代或入库时间排序，以及相关度排序打分范围之后的页：当前页由 SQL 排序分页
+                page_key = ('page',) + query_key + (filters_key, sql_sort, page)
+                page_ids = search_cache.get(page_key)
+                if page_ids is None:
+                    _execute_search(cursor, build_search_query, search_term, start_year, end_year,
+                                    filters=sql_filters, sort_by=sql_sort,
+                                    limit=SEARCH_PAGE_SIZE, offset=(page - 1) * SEARCH_PAGE_SIZE)
+                    page_ids = [row['artifact_id'] for row in cursor.fetchall()]
+                    search_cache.put(page_key, page_ids)
+                artifacts = [{'artifact_id': artifact_id} for artifact_id in page_ids]
+            paged = True
+        
+        # 分页：只渲染、只查询当前页的文物
+        total_pages = max((total_count + SEARCH_PAGE_SIZE - 1) // SEARCH_PAGE_SIZE, 1)
+        page = min(page, total_pages)
+        if not paged:
+            artifacts = artifacts[(page - 1) * SEARCH_PAGE_SIZE:page * SEARCH_PAGE_SIZE]
+        # 复制当前页的行再补齐卡片数据，避免改动缓存中的结果
+        artifacts = [dict(a) for a in artifacts]
+        if artifacts:
+            attach_search_cards(cursor, artifacts)
         
         # 规范化图片路径
         for artifact in artifacts:
             if artifact.get('local_path'):
                 artifact['local_path'] = normalize_image_path(artifact['local_path'])
         
-        # 获取筛选选项数据（基于原始搜索结果，在筛选前计算）
-        try:
-            filter_options = get_filter_options_from_results(artifacts)
-        except Exception as e:
-            print(f"Error getting filter options: {e}")
-            # 如果获取失败，使用空数据
-            filter_options = {
-                'eras': [],
-                'cultures': [],
-                'materials': [],
-                'regions': []
-            }
-        
-        # 应用筛选条件（在计算筛选选项之后）
-        if culture_filters or material_filters or region_filters or era_filters:
-            filtered_artifacts = []
-            for artifact in artifacts:
-                # 检查文化筛选
-                if culture_filters:
-                    artifact_culture = artifact.get('culture_name', '') or ''
-                    artifact_culture = artifact_culture.strip()
-                    if artifact_culture not in culture_filters:
-                        continue
-                
-                # 检查材质筛选
-                if material_filters:
-                    artifact_material = artifact.get('medium', '') or ''
-                    artifact_material = artifact_material.strip()
-                    if artifact_material not in material_filters:
-                        continue
-                
-                # 检查地区筛选
-                if region_filters:
-                    artifact_geography = artifact.get('geography', '') or ''
-                    artifact_geography = artifact_geography.strip()
-                    if artifact_geography not in region_filters:
-                        continue
-                
-                # 检查年代筛选
-                if era_filters:
-                    artifact_date = artifact.get('date_text', '') or ''
-                    if artifact_date:
-                        try:
-                            system, bucket = normalize_era_from_date_cn(artifact_date.strip())
-                            # 年代筛选值格式：system__bucket
-                            era_key = f"{system}__{bucket}"
-                            # 检查是否匹配
-                            if era_key not in era_filters:
-                                continue
-                        except Exception:
-                            # 如果解析失败，跳过该文物
-                            continue
-                    else:
-                        # 如果没有年代信息，跳过
-                        continue
-                
-                filtered_artifacts.append(artifact)
-            
-            artifacts = filtered_artifacts
-        
-        # 应用排序逻辑
-        if sort_by == 'era_asc':
-            # 按年代从早到晚排序（start_year 升序）
-            artifacts = sorted(artifacts, key=lambda x: (
-                x.get('start_year') is None,  # None 值放到最后
-                x.get('start_year') or float('inf')  # 按 start_year 升序
-            ))
-        elif sort_by == 'era_desc':
-            # 按年代从晚到早排序（start_year 降序）
-            artifacts = sorted(artifacts, key=lambda x: (
-                x.get('start_year') is None,  # None 值放到最后
-                -(x.get('start_year') or float('-inf'))  # 按 start_year 降序
-            ))
-        elif sort_by == 'newest':
-            # 按最新入库排序（artifact_id 降序）
-            artifacts = sorted(artifacts, key=lambda x: x.get('artifact_id', 0), reverse=True)
-        # 'relevance' 或其他：保持默认排序
-        
         cursor.close()
         conn.close()
         
         # 渲染搜索结果页面
         return render_template('search.html', 
                              artifacts=artifacts, 
+                             total_count=total_count,
                              search_term=search_term,
                              active_filters=active_filters,
                              filter_options=filter_options,
-                             sort_by=sort_by)
+                             sort_by=sort_by,
+                             prev_url=_search_page_url(page - 1) if page > 1 else None,
+                             next_url=_search_page_url(page + 1) if page < total_pages else None,
+                             page=page,
+                             total_pages=total_pages)
     except Error as e:
         if conn:
             conn.close()
@@ -842,7 +1131,11 @@ def get_filter_options_from_results(artifacts):
     geography_count = {}
     era_count = {}
     
-    for artifact in artifacts:
+    # 年代分类批量计算（相同的年代文字只分类一次）
+    date_texts = [(artifact.get('date_text') or '').strip() for artifact in artifacts]
+    eras = classify_many(date_texts)
+    
+    for artifact, date_text, (system, bucket) in zip(artifacts, date_texts, eras):
         # 统计文化
         culture = artifact.get('culture_name')
         if culture and culture.strip():
@@ -862,17 +1155,39 @@ def get_filter_options_from_results(artifacts):
             geography_count[geography] = geography_count.get(geography, 0) + 1
         
         # 统计年代
-        date_text = artifact.get('date_text')
-        if date_text and date_text.strip():
-            try:
-                system, bucket = normalize_era_from_date_cn(date_text.strip())
-                # 使用 system__bucket 作为唯一标识
-                era_key = f"{system}__{bucket}"
-                era_count[era_key] = era_count.get(era_key, 0) + 1
-            except Exception:
-                # 如果解析失败，跳过
-                pass
+        if date_text:
+            # 使用 system__bucket 作为唯一标识
+            era_key = f"{system}__{bucket}"
+            era_count[era_key] = era_count.get(era_key, 0) + 1
+    
+    return _format_filter_options(culture_count, material_count, geography_count, era_count)
+
+def get_filter_options_from_facets(facet_rows):
+    """
+    从分组聚合查询（build_search_facets_query）的结果构建筛选选项
+    文化、材质、地区、年代分类均直接使用分组计数
+    """
+    counts = {'culture': {}, 'material': {}, 'region': {}}
+    era_count = {}
+    
+    for row in facet_rows:
+        value = row.get('value')
+        if not value or not str(value).strip():
+            continue
+        value = str(value).strip()
+        count = int(row.get('count') or 0)
+        
+        if row['facet'] == 'era':
+            # 已是 "纪年体系__年代分类" 形式（写入时分类并保存在 Era_System / Era_Bucket 列）
+            era_count[value] = era_count.get(value, 0) + count
+        else:
+            facet_count = counts[row['facet']]
+            facet_count[value] = facet_count.get(value, 0) + count
     
+    return _format_filter_options(counts['culture'], counts['material'], counts['region'], era_count)
+
+def _format_filter_options(culture_count, material_count, geography_count, era_count):
+    """把各类别的计数转换为模板使用的筛选选项列表"""
     # 转换为列表格式，按数量降序排列
     cultures = [
         {
@@ -939,33 +1254,17 @@ def browse_cultures():
     try:
         cursor = conn.cursor(dictionary=True)
         
-        # 构建文化浏览查询（从PROPERTIES表获取文化信息）
-        query = """
-            SELECT 
-                p.Culture AS culture_name,
-                COUNT(DISTINCT a.Artifact_PK) AS artifact_count,
-                ANY_VALUE(iv.Local_Path) AS representative_image
-            FROM PROPERTIES p
-            LEFT JOIN ARTIFACTS a ON p.Artifact_PK = a.Artifact_PK
-            LEFT JOIN IMAGE_VERSIONS iv ON a.Artifact_PK = iv.Artifact_PK
-            WHERE p.Culture IS NOT NULL AND p.Culture != ''
-            GROUP BY p.Culture
-            HAVING artifact_count > 0
-            ORDER BY artifact_count DESC, p.Culture
-        """
-        cursor.execute(query)
-        cultures_raw = cursor.fetchall()
-        
-        # 转换数据格式，添加culture_id（使用culture_name的hash作为临时ID）
-        cultures = []
-        for idx, culture in enumerate(cultures_raw, 1):
-            culture_dict = {
-                'culture_id': idx,  # 临时ID，实际应该根据culture_name生成唯一ID
-                'culture_name': culture['culture_name'],
-                'artifact_count': culture['artifact_count'],
-                'representative_image': culture['representative_image']
+        # 读取物化的浏览汇总（culture_id 为 CULTURES 中的稳定 ID）
+        cursor.execute(build_browse_summary_query(), ('culture', ''))
+        cultures = [
+            {
+                'culture_id': row['id'],
+                'culture_name': row['name'],
+                'artifact_count': row['artifact_count'],
+                'representative_image': row['representative_image']
             }
-            cultures.append(culture_dict)
+            for row in cursor.fetchall()
+        ]
         
         # 为每个文化添加描述和规范化图片路径
         for culture in cultures:
@@ -1000,52 +1299,17 @@ def culture_detail(culture_id):
     try:
         cursor = conn.cursor(dictionary=True)
         
-        # 获取文化列表并找到对应的文化名称（使用与browse_cultures相同的排序方式）
-        culture_list_query = """
-            SELECT 
-                p.Culture AS culture_name,
-                COUNT(DISTINCT a.Artifact_PK) AS artifact_count
-            FROM PROPERTIES p
-            LEFT JOIN ARTIFACTS a ON p.Artifact_PK = a.Artifact_PK
-            WHERE p.Culture IS NOT NULL AND p.Culture != ''
-            GROUP BY p.Culture
-            HAVING artifact_count > 0
-            ORDER BY artifact_count DESC, p.Culture
-        """
-        cursor.execute(culture_list_query)
-        all_cultures = cursor.fetchall()
-        
-        # 根据culture_id找到对应的文化名称（culture_id现在是索引，需与browse_cultures保持一致）
-        culture = None
-        culture_name = None
-        try:
-            culture_idx = int(culture_id) - 1
-            if 0 <= culture_idx < len(all_cultures):
-                culture_name = all_cultures[culture_idx]['culture_name']
-                culture = {'culture_id': culture_id, 'culture_name': culture_name}
-        except (ValueError, IndexError):
-            pass
-        
-        if not culture or not culture_name:
+        # 按主键取文化名称
+        cursor.execute(build_lookup_name_query('culture'), (culture_id,))
+        row = cursor.fetchone()
+        if not row:
             cursor.close()
             conn.close()
             abort(404)
+        culture = {'culture_id': culture_id, 'culture_name': row['name']}
         
-        # 构建该文化下的文物列表查询
-        query = """
-            SELECT 
-                a.Artifact_PK AS artifact_id,
-                a.Title_CN AS title,
-                a.Date_CN AS date_text,
-                ANY_VALUE(iv.Local_Path) AS local_path
-            FROM ARTIFACTS a
-            LEFT JOIN PROPERTIES p ON a.Artifact_PK = p.Artifact_PK
-            LEFT JOIN IMAGE_VERSIONS iv ON a.Artifact_PK = iv.Artifact_PK
-            WHERE p.Culture = %s
-            GROUP BY a.Artifact_PK
-            ORDER BY a.Artifact_PK DESC
-        """
-        cursor.execute(query, (culture_name,))
+        # 该文化下的文物列表（按外键索引筛选）
+        cursor.execute(build_lookup_artifacts_query('culture'), (culture_id,))
         artifacts = cursor.fetchall()
         
         # 规范化图片路径
@@ -1078,33 +1342,17 @@ def browse_geographies():
     try:
         cursor = conn.cursor(dictionary=True)
         
-        # 构建地理浏览查询（从PROPERTIES表获取地理信息）
-        query = """
-            SELECT 
-                p.Geography AS geography_name,
-                COUNT(DISTINCT a.Artifact_PK) AS artifact_count,
-                ANY_VALUE(iv.Local_Path) AS representative_image
-            FROM PROPERTIES p
-            LEFT JOIN ARTIFACTS a ON p.Artifact_PK = a.Artifact_PK
-            LEFT JOIN IMAGE_VERSIONS iv ON a.Artifact_PK = iv.Artifact_PK
-            WHERE p.Geography IS NOT NULL AND p.Geography != ''
-            GROUP BY p.Geography
-            HAVING artifact_count > 0
-            ORDER BY artifact_count DESC, p.Geography
-        """
-        cursor.execute(query)
-        geographies_raw = cursor.fetchall()
-        
-        # 转换数据格式，添加geography_id
-        geographies = []
-        for idx, geography in enumerate(geographies_raw, 1):
-            geography_dict = {
-                'geography_id': idx,
-                'geography_name': geography['geography_name'],
-                'artifact_count': geography['artifact_count'],
-                'representative_image': geography['representative_image']
+        # 读取物化的浏览汇总（geography_id 为 GEOGRAPHIES 中的稳定 ID）
+        cursor.execute(build_browse_summary_query(), ('geography', ''))
+        geographies = [
+            {
+                'geography_id': row['id'],
+                'geography_name': row['name'],
+                'artifact_count': row['artifact_count'],
+                'representative_image': row['representative_image']
             }
-            geographies.append(geography_dict)
+            for row in cursor.fetchall()
+        ]
         
         # 为每个地理区域添加描述和规范化图片路径
         for geography in geographies:
@@ -1138,52 +1386,17 @@ def geography_detail(geography_id):
     try:
         cursor = conn.cursor(dictionary=True)
         
-        # 获取地理列表并找到对应的地理名称（使用与browse_geographies相同的排序方式）
-        geography_list_query = """
-            SELECT 
-                p.Geography AS geography_name,
-                COUNT(DISTINCT a.Artifact_PK) AS artifact_count
-            FROM PROPERTIES p
-            LEFT JOIN ARTIFACTS a ON p.Artifact_PK = a.Artifact_PK
-            WHERE p.Geography IS NOT NULL AND p.Geography != ''
-            GROUP BY p.Geography
-            HAVING artifact_count > 0
-            ORDER BY artifact_count DESC, p.Geography
-        """
-        cursor.execute(geography_list_query)
-        all_geographies = cursor.fetchall()
-        
-        # 根据geography_id找到对应的地理名称（geography_id现在是索引，需与browse_geographies保持一致）
-        geography = None
-        geography_name = None
-        try:
-            geography_idx = int(geography_id) - 1
-            if 0 <= geography_idx < len(all_geographies):
-                geography_name = all_geographies[geography_idx]['geography_name']
-                geography = {'geography_id': geography_id, 'geography_name': geography_name}
-        except (ValueError, IndexError):
-            pass
-        
-        if not geography or not geography_name:
+        # 按主键取地理名称
+        cursor.execute(build_lookup_name_query('geography'), (geography_id,))
+        row = cursor.fetchone()
+        if not row:
             cursor.close()
             conn.close()
             abort(404)
+        geography = {'geography_id': geography_id, 'geography_name': row['name']}
         
-        # 构建该地理区域下的文物列表查询
-        query = """
-            SELECT 
-                a.Artifact_PK AS artifact_id,
-                a.Title_CN AS title,
-                a.Date_CN AS date_text,
-                ANY_VALUE(iv.Local_Path) AS local_path
-            FROM ARTIFACTS a
-            LEFT JOIN PROPERTIES p ON a.Artifact_PK = p.Artifact_PK
-            LEFT JOIN IMAGE_VERSIONS iv ON a.Artifact_PK = iv.Artifact_PK
-            WHERE p.Geography = %s
-            GROUP BY a.Artifact_PK
-            ORDER BY a.Artifact_PK DESC
-        """
-        cursor.execute(query, (geography_name,))
+        # 该地理区域下的文物列表（按外键索引筛选）
+        cursor.execute(build_lookup_artifacts_query('geography'), (geography_id,))
         artifacts = cursor.fetchall()
         
         # 规范化图片路径
@@ -1203,17 +1416,6 @@ def geography_detail(geography_id):
 
 
 
-def get_db_connection():
-    """建立資料庫連線的通用函數"""
-    try:
-        # 假設你的 db_config 已經修正了正確的密碼
-        conn = mysql.connector.connect(**db_config)
-        return conn
-    except Error as e:
-        print(f"Error connecting to MySQL: {e}")
-        return None
-
-
 def era_key(system, bucket):
     """將年代體系和名稱組合成 URL 友好的 key"""
     # 使用 quote 確保中文能夠在 URL 中正確傳輸
@@ -1308,9 +1510,9 @@ def browse_eras():
                              west_images=[])
 
 
-def _build_era_buckets():
+def _build_era_buckets(system):
     """
-    从数据库抓 Date_CN + 代表图，然后按 (system, bucket) 统计数量与代表图。
+    按 (system, bucket) 读取物化的数量与代表图（BROWSE_SUMMARIES）
     """
     conn = get_db_connection()
     if conn is None:
@@ -1318,28 +1520,17 @@ def _build_era_buckets():
                                       error_message="无法连接到数据库。请检查数据库配置和连接状态。"), 500)
     try:
         cursor = conn.cursor(dictionary=True)
-        query = """
-            SELECT
-                a.Artifact_PK,
-                a.Date_CN AS date_text,
-                ANY_VALUE(iv.Local_Path) AS representative_image
-            FROM ARTIFACTS a
-            LEFT JOIN IMAGE_VERSIONS iv ON a.Artifact_PK = iv.Artifact_PK
-            WHERE a.Date_CN IS NOT NULL AND a.Date_CN != ''
-            GROUP BY a.Artifact_PK
-        """
-        cursor.execute(query)
+        cursor.execute(build_browse_summary_query(), ('era', system))
         rows = cursor.fetchall()
 
         buckets = {}
         for r in rows:
-            system, bucket = normalize_era_from_date_cn(r.get('date_text', ''))
-            k = (system, bucket)
-            if k not in buckets:
-                buckets[k] = {"count": 0, "rep_img": None}
-            buckets[k]["count"] += 1
-            if buckets[k]["rep_img"] is None and r.get("representative_image"):
-                buckets[k]["rep_img"] = normalize_image_path(r["representative_image"])
+            k = (r['value_group'], r['name'])
+            rep_img = r.get('representative_image')
+            buckets[k] = {
+                "count": r['artifact_count'],
+                "rep_img": normalize_image_path(rep_img) if rep_img else None
+            }
 
         cursor.close()
         conn.close()
@@ -1355,7 +1546,7 @@ def _build_era_buckets():
 
 @app.route('/browse_eras/east')
 def browse_eras_east():
-    buckets, err = _build_era_buckets()
+    buckets, err = _build_era_buckets("东方纪年")
     if err:
         return err
 
@@ -1382,7 +1573,7 @@ def browse_eras_east():
 
 @app.route('/browse_eras/west')
 def browse_eras_west():
-    buckets, err = _build_era_buckets()
+    buckets, err = _build_era_buckets("西方纪年")
     if err:
         return err
 
@@ -1417,15 +1608,20 @@ def browse_eras_west():
         eras=eras
     )
 
+# 年代详情页每页条数
+ERA_PAGE_SIZE = 60
+
 @app.route('/era/<era_key_str>')
 def era_detail(era_key_str):
     """
-    年代桶详情：显示该(东方/西方 + bucket)下的所有文物卡片
+    年代桶详情：分页显示该(东方/西方 + bucket)下的文物卡片（按 Era_System / Era_Bucket 索引查询）
     """
     system, bucket = era_from_key(era_key_str)
     if not system or not bucket:
         abort(404)
 
+    page = max(request.args.get('page', 1, type=int), 1)
+
     conn = get_db_connection()
     if conn is None:
         return render_template('error.html',
@@ -1433,29 +1629,17 @@ def era_detail(era_key_str):
 
     try:
         cursor = conn.cursor(dictionary=True)
-        query = """
-            SELECT
-                a.Artifact_PK AS artifact_id,
-                a.Title_CN AS title,
-                a.Date_CN AS date_text,
-                ANY_VALUE(iv.Local_Path) AS local_path
-            FROM ARTIFACTS a
-            LEFT JOIN IMAGE_VERSIONS iv ON a.Artifact_PK = iv.Artifact_PK
-            WHERE a.Date_CN IS NOT NULL AND a.Date_CN != ''
-            GROUP BY a.Artifact_PK
-            ORDER BY a.Artifact_PK DESC
-        """
-        cursor.execute(query)
-        rows = cursor.fetchall()
+        cursor.execute(build_era_count_query(), (system, bucket))
+        total_count = cursor.fetchone()['total']
+        total_pages = max((total_count + ERA_PAGE_SIZE - 1) // ERA_PAGE_SIZE, 1)
+        page = min(page, total_pages)
 
-        artifacts = []
-        for r in rows:
-            sys2, bucket2 = normalize_era_from_date_cn(r.get("date_text", ""))
-            if sys2 != system or bucket2 != bucket:
-                continue
+        cursor.execute(build_era_artifacts_query(),
+                       (system, bucket, ERA_PAGE_SIZE, (page - 1) * ERA_PAGE_SIZE))
+        artifacts = cursor.fetchall()
+        for r in artifacts:
             if r.get("local_path"):
                 r["local_path"] = normalize_image_path(r["local_path"])
-            artifacts.append(r)
 
         cursor.close()
         conn.close()
@@ -1463,7 +1647,12 @@ def era_detail(era_key_str):
         return render_template(
             'era_detail.html',
             era={"system": system, "bucket": bucket, "era_key": era_key_str},
-            artifacts=artifacts
+            artifacts=artifacts,
+            total_count=total_count,
+            page=page,
+            total_pages=total_pages,
+            prev_url=url_for('era_detail', era_key_str=era_key_str, page=page - 1) if page > 1 else None,
+            next_url=url_for('era_detail', era_key_str=era_key_str, page=page + 1) if page < total_pages else None
         )
 
     except Error as e:
@@ -2789,98 +2978,27 @@ def admin_import():
         if file and allowed_file(file.filename):
             filename = secure_filename(file.filename)
             
-            # 读取文件
-            try:
-                if filename.endswith('.csv'):
-                    # 尝试多种编码
-                    try:
-                        df = pd.read_csv(file, encoding='utf-8-sig')  # 支持Excel导出的CSV（BOM）
-                    except:
-                        try:
-                            df = pd.read_csv(file, encoding='utf-8')
-                        except:
-                            df = pd.read_csv(file, encoding='gbk')  # 中文Windows默认编码
-                else:
-                    df = pd.read_excel(file)
-                
-                # 标准化列名：去除前后空格
-                df.columns = df.columns.str.strip()
-                
-                # 列名映射（支持常见的列名变体）
-                column_mapping = {
-                    '来源ID': 'Source_ID',
-                    '来源机构ID': 'Source_ID',
-                    '原始编号': 'Original_ID',
-                    '文物编号': 'Original_ID',
-                    '中文标题': 'Title_CN',
-                    '标题': 'Title_CN',
-                    '英文标题': 'Title_EN',
-                    '中文描述': 'Description_CN',
-                    '描述': 'Description_CN',
-                    '分类': 'Classification',
-                    '材质': 'Material',
-                    '中文年代': 'Date_CN',
-                    '年代': 'Date_CN',
-                    '英文年代': 'Date_EN',
-                    '起始年份': 'Start_Year',
-                    '结束年份': 'End_Year',
-                    '地理': 'Geography',
-                    '地区': 'Geography',
-                    '文化': 'Culture',
-                    '艺术家': 'Artist',
-                    '作者': 'Artist',
-                    '版权说明': 'Credit_Line',
-                    '版权': 'Credit_Line',
-                    '页面链接': 'Page_Link',
-                    '链接': 'Page_Link',
-                    '尺寸类型': 'Size_Type',
-                    '尺寸值': 'Size_Value',
-                    '尺寸数值': 'Size_Value',
-                    '尺寸单位': 'Size_Unit',
-                    '图像链接': 'Image_Link',
-                    '图片链接': 'Image_Link',
-                    '本地路径': 'Local_Path',
-                    '本地图片路径': 'Local_Path',
-                    '图像路径': 'Local_Path',
-                    '版本类型': 'Version_Type'
-                }
-                
-                # 应用列名映射
-                df.rename(columns=column_mapping, inplace=True)
-                
-                # 再次标准化列名（确保一致）
-                df.columns = [col.strip() for col in df.columns]
-                
-                # 验证必需列（不区分大小写）
-                required_columns = ['Title_CN', 'Source_ID', 'Original_ID']
-                df_columns_lower = [col.lower() for col in df.columns]
-                missing_columns = []
-                for req_col in required_columns:
-                    if req_col not in df.columns and req_col.lower() not in df_columns_lower:
-                        missing_columns.append(req_col)
-                
-                if missing_columns:
-                    flash(f'缺少必需列: {", ".join(missing_columns)}。请确保CSV包含以下列：Source_ID, Original_ID, Title_CN', 'error')
+            # 试运行：只校验，不排队、不取导入锁、不访问数据库，在页面上直接显示校验报告
+            if request.form.get('dry_run'):
+                try:
+                    report = validate_import_file(file, filename)
+                except Exception as e:
+                    flash(f'校验失败: {str(e)}', 'error')
                     return redirect(request.url)
-                
-                # 导入数据
+                return render_template('admin_import.html', import_jobs=import_job_manager.recent(),
+                                       validation_report=report, validation_file=filename)
+            
+            # 保存文件并加入导入队列，由后台线程执行（见 import_jobs.py）
+            try:
                 import_mode = request.form.get('import_mode', 'skip')  # skip/update
-                result = import_artifacts_from_dataframe(df, import_mode)
-                
-                # 构建反馈消息
-                success_msg = f'导入完成：新增 {result["inserted"]} 条，更新 {result["updated"]} 条，跳过 {result["skipped"]} 条'
-                if result.get('failed', 0) > 0:
-                    success_msg += f'，失败 {result["failed"]} 条'
-                    flash(success_msg, 'warning')
-                else:
-                    flash(success_msg, 'success')
-                
-                # 如果有错误，提示查看日志
-                if result.get('errors'):
-                    error_summary = f'批量导入中有 {len(result["errors"])} 条记录失败，详细信息请查看系统操作日志'
-                    flash(error_summary, 'error')
+                user_id = session.get('username', 'admin') if session.get('is_admin') else 'admin'
+                job_id = import_job_manager.submit(file, filename, import_mode, user_id)
+                if job_id is None:
+                    flash('无法连接到数据库', 'error')
+                    return redirect(request.url)
                 
-                return redirect(url_for('admin_dashboard'))
+                flash(f'文件已上传，导入任务 #{job_id} 已加入队列，可在下方查看进度', 'success')
+                return redirect(url_for('admin_import'))
                 
             except Exception as e:
                 flash(f'导入失败: {str(e)}', 'error')
@@ -2889,7 +3007,18 @@ def admin_import():
             flash('不支持的文件格式，请上传 CSV 或 Excel 文件', 'error')
             return redirect(request.url)
     
-    return render_template('admin_import.html')
+    # 工作线程通常已在启动时运行；以 WSGI 服务器加载（不经过 __main__）时在这里补启动
+    import_job_manager.ensure_started()
+    return render_template('admin_import.html', import_jobs=import_job_manager.recent())
+
+@app.route('/admin/import/jobs/<int:job_id>')
+@admin_required
+def admin_import_job_status(job_id):
+    """导入任务进度（管理页面轮询）"""
+    job = import_job_manager.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': '导入任务不存在'}), 404
+    return jsonify({'success': True, 'job': job})
 def log_system_action(action, table, status, desc):
     """輔助函數：將後台行為寫入 LOGS 表"""
     conn = get_db_connection()
@@ -2901,168 +3030,111 @@ def log_system_action(action, table, status, desc):
     conn.commit()
     conn.close()
 
-def import_artifacts_from_dataframe(df, import_mode='skip'):
+def open_import_chunks(stream, path, file_name):
+    """
+    打开上传的文件，返回列名已标准化的数据块序列（CSV 按块读取，Excel 整表为一块）
+    缺少必需列时抛出 ValueError
+    """
+    if file_name.endswith('.csv'):
+        encoding = sniff_encoding(stream)
+        columns = read_csv_columns(stream, encoding)
+        chunks = iter_csv_chunks(stream, encoding)
+    else:
+        df = read_excel_frame(path)
+        columns = list(df.columns)
+        chunks = [df]
+    
+    # 验证必需列（不区分大小写）
+    missing_columns = missing_required_columns(columns)
+    if missing_columns:
+        raise ValueError(f'缺少必需列: {", ".join(missing_columns)}。请确保文件包含以下列：Source_ID, Original_ID, Title_CN')
+    return chunks
+
+def validate_import_file(upload, file_name):
+    """试运行：只校验上传的文件（不访问数据库），返回校验报告（错误行数有上限，见 bulk_import.validate_chunks）"""
+    os.makedirs(import_job_manager.upload_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=f'_{file_name}', dir=import_job_manager.upload_dir)
+    os.close(fd)
+    try:
+        upload.save(path)
+        with open(path, 'rb') as stream:
+            return validate_chunks(open_import_chunks(stream, path, file_name))
+    finally:
+        os.remove(path)
+
+def run_import_job(path, file_name, import_mode, user_id, progress):
     """
-    从DataFrame导入文物数据
-    使用存储过程 sp_import_artifact_metadata 进行批量导入
+    后台执行一个导入任务（由 import_job_manager 在工作线程中调用）
+    CSV 流式读取：编码只在文件开头探测一次，之后按块读取、逐块导入并提交；Excel 整表读取（解析结果有缓存）
+    """
+    with open(path, 'rb') as stream:
+        chunks = open_import_chunks(stream, path, file_name)
+        result = import_artifacts_from_chunks(chunks, import_mode, user_id, progress)
+    
+    homepage_sampler.request_refresh()
+    search_index_manager.refresh_artifacts(result['artifact_ids'])
+    search_cache.bump_version()
+    
+    # 构建反馈消息
+    message = f'导入完成：新增 {result["inserted"]} 条，更新 {result["updated"]} 条，跳过 {result["skipped"]} 条'
+    if result.get('failed', 0) > 0:
+        message += f'，失败 {result["failed"]} 条，详细信息请查看系统操作日志'
+    result['message'] = message
+    return result
+
+# 后台导入任务队列（见 import_jobs.py）
+import_job_manager = ImportJobManager(get_db_connection, run_import_job)
+
+def import_artifacts_from_dataframe(df, import_mode='skip', user_id='admin'):
+    """从DataFrame导入文物数据"""
+    return import_artifacts_from_chunks([df], import_mode, user_id)
+
+def import_artifacts_from_chunks(chunks, import_mode='skip', user_id='admin', progress=None):
+    """
+    逐块导入文物数据（chunks 为列名已标准化的 DataFrame 序列，可以是按块读取 CSV 的生成器）
+    每块整表清洗后经临时暂存表用集合语句批量导入（见 bulk_import.py），逐批提交；
+    年代分类与维度表外键也逐块补齐，内存占用只与块大小有关
+    progress(已处理行数, 累计结果) 在每块处理完后调用
     """
     conn = get_db_connection()
     if conn is None:
         raise Exception("无法连接到数据库")
     
-    result = {'inserted': 0, 'updated': 0, 'skipped': 0, 'failed': 0, 'errors': []}
+    result = {'inserted': 0, 'updated': 0, 'skipped': 0, 'failed': 0, 'errors': [], 'artifact_ids': []}
     
     try:
         cursor = conn.cursor()
-        user_id = session.get('username', 'admin') if session.get('is_admin') else 'admin'
         
-        for index, row in df.iterrows():
-            try:
-                # 准备参数，处理NaN值
-                def safe_get(key, default=None):
-                    if key not in row.index:
-                        return default
-                    val = row[key]
-                    # 处理NaN、空字符串、None
-                    if pd.isna(val) or val == '' or val is None:
-                        return default
-                    # 处理数值类型
-                    if key in ['Source_ID', 'Start_Year', 'End_Year']:
-                        try:
-                            return int(float(val)) if val is not None else default
-                        except (ValueError, TypeError):
-                            return default
-                    if key == 'Size_Value':
-                        try:
-                            # 处理复合尺寸（如 "66 x 35.6 x 27.3"），提取第一个数值
-                            if val and isinstance(val, str):
-                                # 尝试提取第一个数字（可能包含小数点）
-                                match = re.search(r'(\d+\.?\d*)', str(val).strip())
-                                if match:
-                                    return float(match.group(1))
-                            return float(val) if val is not None else default
-                        except (ValueError, TypeError):
-                            return default
-                    # 转换为字符串并去除空格
-                    return str(val).strip() if val is not None else default
-                
-                # 验证必需字段
-                source_id = safe_get('Source_ID')
-                original_id = safe_get('Original_ID')
-                title_cn = safe_get('Title_CN')
-                
-                if source_id is None:
-                    raise ValueError('Source_ID 不能为空')
-                if not original_id:
-                    raise ValueError('Original_ID 不能为空')
-                if not title_cn:
-                    raise ValueError('Title_CN 不能为空')
-                
-                # 调用存储过程（OUT参数用@变量接收）
-                # 参数顺序必须与存储过程定义完全一致
-                # 存储过程需要24个IN参数：1-23是数据字段，24是user_id，25是import_mode
-                cursor.execute("""
-                    CALL sp_import_artifact_metadata(
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                        %s, %s,
-                        @p_artifact_id, @p_result_status, @p_result_message
-                    )
-                """, (
-                    source_id,  # p_source_id
-                    original_id,  # p_original_id
-                    title_cn,  # p_title_cn
-                    safe_get('Title_EN'),  # p_title_en
-                    safe_get('Description_CN'),  # p_description_cn
-                    safe_get('Classification'),  # p_classification
-                    safe_get('Material'),  # p_material
-                    safe_get('Date_CN'),  # p_date_cn
-                    safe_get('Date_EN'),  # p_date_en
-                    safe_get('Start_Year'),  # p_start_year
-                    safe_get('End_Year'),  # p_end_year
-                    safe_get('Geography'),  # p_geography
-                    safe_get('Culture'),  # p_culture
-                    safe_get('Artist'),  # p_artist
-                    safe_get('Credit_Line'),  # p_credit_line
-                    safe_get('Page_Link'),  # p_page_link
-                    safe_get('Size_Type'),  # p_size_type
-                    safe_get('Size_Value'),  # p_size_value
-                    safe_get('Size_Unit'),  # p_size_unit
-                    safe_get('Image_Link'),  # p_image_link
-                    safe_get('Local_Path'),  # p_local_path
-                    safe_get('Version_Type', 'Original'),  # p_version_type
-                    user_id,  # p_user_id
-                    import_mode  # p_import_mode
-                ))
-                
-                # 获取OUT参数
-                cursor.execute("SELECT @p_artifact_id as artifact_id, @p_result_status as status, @p_result_message as message")
-                out_result = cursor.fetchone()
-                
-                if out_result:
-                    status = out_result.get('status') or out_result[1] if isinstance(out_result, tuple) else None
-                    if status == 'Inserted':
-                        result['inserted'] += 1
-                    elif status == 'Updated':
-                        result['updated'] += 1
-                    elif status == 'Skipped':
-                        result['skipped'] += 1
-                    else:
-                        result['failed'] += 1
-                        error_msg = out_result.get('message') or (out_result[2] if isinstance(out_result, tuple) and len(out_result) > 2 else '未知错误')
-                        result['errors'].append(f"行 {index + 2}: {error_msg}")
-                        # 记录失败日志
-                        cursor.execute("""
-                            CALL sp_log_import_error(%s, %s, %s, %s)
-                        """, (
-                            safe_get('Title_CN', '未知'),
-                            error_msg,
-                            user_id,
-                            index + 2
-                        ))
-                
+        # 失败行每块一次写入 LOGS，超过上限后只写一条汇总
+        error_collector = ImportErrorCollector(user_id)
+        first_row = 2
+        chunk_count = 0
+        for chunk in chunks:
+            chunk_result = import_dataframe(conn, cursor, chunk, import_mode, user_id, first_row=first_row,
+                                            error_collector=error_collector)
+            first_row += len(chunk)
+            chunk_count += 1
+            for key in ('inserted', 'updated', 'skipped', 'failed', 'errors', 'artifact_ids'):
+                result[key] += chunk_result[key]
+            
+            # 写入时完成年代分类（Era_System / Era_Bucket），同步文化 / 地理维度表的外键
+            if chunk_result['artifact_ids']:
+                update_era_columns(cursor, chunk_result['artifact_ids'])
+                sync_lookup_ids(cursor, chunk_result['artifact_ids'])
                 conn.commit()
-                
-            except mysql.connector.Error as e:
-                conn.rollback()
-                result['failed'] += 1
-                error_msg = f"行 {index + 2}: {str(e)}"
-                result['errors'].append(error_msg)
-                # 记录失败日志
-                try:
-                    cursor.execute("""
-                        CALL sp_log_import_error(%s, %s, %s, %s)
-                    """, (
-                        safe_get('Title_CN', '未知') if 'safe_get' in locals() else '未知',
-                        str(e),
-                        user_id,
-                        index + 2
-                    ))
-                    conn.commit()
-                except:
-                    pass
-            except Exception as e:
-                conn.rollback()
-                result['failed'] += 1
-                error_msg = f"行 {index + 2}: {str(e)}"
-                result['errors'].append(error_msg)
-                # 记录失败日志
-                try:
-                    def safe_get_local(key, default=None):
-                        val = row.get(key, default) if isinstance(row, dict) else getattr(row, key, default) if hasattr(row, key) else default
-                        return None if pd.isna(val) or val == '' else val
-                    
-                    cursor.execute("""
-                        CALL sp_log_import_error(%s, %s, %s, %s)
-                    """, (
-                        safe_get_local('Title_CN', '未知'),
-                        str(e),
-                        user_id,
-                        index + 2
-                    ))
-                    conn.commit()
-                except:
-                    pass
+            
+            if progress:
+                progress(first_row - 2, result)
+        
+        error_collector.finish(cursor)
+        conn.commit()
+        
+        # 浏览页汇总：单块且只有新增时按受影响的分类增量刷新；
+        # 更新模式下文物可能离开旧分类，多块导入涉及的文物较多，全量刷新
+        if result['artifact_ids']:
+            incremental = chunk_count == 1 and not result['updated']
+            refresh_browse_summaries(cursor, result['artifact_ids'] if incremental else None)
+            conn.commit()
         
         cursor.close()
         conn.close()
@@ -3320,10 +3392,15 @@ def admin_replace_image(version_id):
                 ) AS temp
             )
         """, (current_user, current_user, artifact_id))
+        # 原先没有图片的文物可能成为所属分类的代表图
+        refresh_browse_summaries(cursor, [artifact_id])
         
         conn.commit()
         cursor.close()
         conn.close()
+        homepage_sampler.request_refresh()
+        search_index_manager.refresh_artifacts([artifact_id])
+        search_cache.bump_version()
         
         return jsonify({'success': True, 'message': '图像替换成功'})
         
@@ -3476,12 +3553,27 @@ if __name__ == '__main__':
     print("正在檢查資料庫結構...")
     init_user_tables()         # 執行用戶表初始化
     check_and_update_tables()  # 檢查並更新表結構
+    init_shuffle_key()         # 隨機瀏覽的排列鍵
+    init_era_columns()         # 年代分類列
+    init_year_interval()       # 年代区间筛选的列、索引与朝代表
+    init_lookup_tables()       # 文化 / 地理维度表
+    init_browse_summaries()    # 浏览页汇总
+    init_import_index()        # 批量导入的去重索引
+    init_search_filters()      # 搜索筛选列的空白清理与索引
+    init_import_jobs()         # 后台导入任务表
+    init_catalogue_version()   # 搜索緩存的目錄版本號
     
     # 2. 設定連接埠 (Port)
     # 優先使用環境變數中的 PORT，如果沒有則使用 5001
     port = int(os.getenv('PORT', 5001))
+    debug = True
+    
+    # 后台导入线程随应用启动：重启前排队的任务直接继续执行，不必等管理员打开导入页面
+    # （debug 模式的 reloader 监视进程不处理请求，只在实际运行应用的子进程中启动）
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        import_job_manager.ensure_started()
     
     # 3. 啟動 Flask 程式
     print(f"系統啟動中... 訪問地址: http://127.0.0.1:{port}")
-    app.run(debug=True, host='0.0.0.0', port=port)
+    app.run(debug=debug, host='0.0.0.0', port=port)
 
@@ -0,0 +1,347 @@
+"""
+导入吞吐量基准测试
+生成 MET / NPM / 后台导入格式的合成表格（可设定行数，年代与尺寸文字仿照真实数据），
+在一个临时 MySQL 数据库中分别运行各导入流程，报告：
+- 行/秒：每个场景从读取文件到提交完成（含年代分类、维度表、浏览页汇总等后续步骤）的吞吐量
+- 峰值内存：场景进程（及其清洗进程池）的峰值 RSS
+- 往返/行：场景期间服务器收到的语句数（GLOBAL STATUS 的 Questions 增量）除以行数
+
+场景：
+    admin       后台导入（app.import_artifacts_from_chunks，按块流式读取 CSV，与后台任务相同）
+    met         database/loader.py 导入 MET（database/load.py 即调用它）
+    met-delta   在 met 之后以 --delta 重新导入同一文件（内容无变化，衡量增量比对的开销）
+    npm         database/loader.py 导入 NPM（database_npm/data_importer_multi_table.py 即调用它）
+
+每个场景在独立的子进程中运行（峰值内存互不影响），开始前清空临时库的数据表（met-delta 除外）。
+临时库的表结构从 BENCH_SCHEMA_FROM 数据库复制（CREATE TABLE ... LIKE，不含外键与触发器），
+每次运行前删除重建；往返次数包含同一服务器上其他客户端的语句，应使用本机的专用 MySQL。
+生成的文件缓存在工作目录中，相同行数与随机种子再次运行时直接使用。
+
+用法（项目根目录）：
+    python benchmarks/import_benchmark.py --rows 1000 10000
+    python benchmarks/import_benchmark.py --rows 100000 --scenarios met met-delta npm --json bench.jsonl
+
+环境变量：
+    DB_HOST / DB_USER / DB_PASSWORD   MySQL 连接（与应用相同）
+    BENCH_DB_NAME       临时数据库（默认 project_bench，每次运行前删除重建）
+    BENCH_SCHEMA_FROM   复制表结构的数据库（默认 DB_NAME，未设置时为 project）
+
+MET / NPM 场景需要写入 .xlsx（openpyxl）；内存统计在 Windows 上需要 psutil，缺少时不报告。
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import mysql.connector
+import numpy as np
+import pandas as pd
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _ROOT)
+sys.path.insert(0, os.path.join(_ROOT, 'database'))
+
+BENCH_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'user': os.getenv('DB_USER', 'root'),
+    'password': os.getenv('DB_PASSWORD', 'leeanna'),
+    'bench_db': os.getenv('BENCH_DB_NAME', 'project_bench'),
+    'schema_from': os.getenv('BENCH_SCHEMA_FROM', os.getenv('DB_NAME', 'project')),
+}
+
+SCENARIOS = ('admin', 'met', 'met-delta', 'npm')
+
+# 每个场景开始前清空的数据表（SOURCES、DYNASTIES 等参考表保留）
+DATA_TABLES = ('ARTIFACTS', 'PROPERTIES', 'DIMENSIONS', 'IMAGE_VERSIONS', 'LOGS',
+               'BROWSE_SUMMARIES', 'CULTURES', 'GEOGRAPHIES', 'IMPORT_JOBS')
+# 连同数据一起复制到临时库的参考表
+REFERENCE_TABLES = ('DYNASTIES', 'CATALOGUE_VERSION')
+
+BENCH_SOURCE = ('BENCH', '基准测试')
+
+_RESULT_PREFIX = 'BENCH_RESULT '
+
+# --- 1. 合成数据 ---
+TITLES = ['青花缠枝莲纹碗', '铜镜', '玉璧', '山水图轴', '佛坐像', '剔红花卉纹漆盒', '粉彩花鸟纹瓶',
+          '青铜鼎', '花鸟图册页', '白玉雕龙纹佩', '釉里红梅瓶', '鎏金铜观音像']
+MATERIALS = ['瓷', '青铜', '玉', '绢本设色', '纸本水墨', '木胎漆器', '鎏金铜', '象牙']
+MET_DATES = ['公元前3世纪', '约1700年', '12世纪', '1368–1644年', '公元前1046–前771年', '18世纪晚期',
+             '明（1368–1644年）', '清，乾隆时期（1736–95年）', '约公元前1世纪', None]
+NPM_DATES = ['清代', '明代', '宋代', '元代', '唐代', '商代晚期', '西周', '清 乾隆', '明 宣德',
+             '公元1725年', '新石器时代', '战国时期', None]
+DEPARTMENTS = ['亚洲艺术', '古埃及艺术', '希腊和罗马艺术', '欧洲雕塑和装饰艺术', '伊斯兰艺术']
+CULTURES = ['中国', '日本', '朝鲜', '古埃及', '希腊', '伊朗', None]
+GEOGRAPHIES = ['中国', '日本京都', '埃及底比斯', '伊朗内沙布尔', None, None]
+ARTISTS = ['佚名', '王翚', '郎世宁', '文徵明', None, None, None]
+CREDIT_LINES = ['罗杰斯基金，1923年', '弗莱彻基金，1947年', '匿名捐赠，2001年']
+NPM_SIZE_TYPES = ['高', '口径', '足径', '长', '宽', '径长']
+CLASSIFICATIONS = ['瓷器', '铜器', '玉器', '书画', '漆器', '雕塑']
+
+
+def _choice(rng, values, n):
+    return np.array(values, dtype=object)[rng.integers(0, len(values), n)]
+
+
+def _sizes(rng, n, low=1.0, high=80.0):
+    return np.round(rng.uniform(low, high, n), 1)
+
+
+def make_met_frame(n, seed=0):
+    """MET 格式（database/data.xlsx 的列名）"""
+    rng = np.random.default_rng(seed)
+    h, w, d = _sizes(rng, n), _sizes(rng, n), _sizes(rng, n)
+    has_dims = rng.random(n) < 0.9
+    has_image = rng.random(n) < 0.7
+    return pd.DataFrame({
+        '馆藏编号（Object Number）': [f'{1900 + i % 120}.{i}' for i in range(n)],
+        '品名（Title）': _choice(rng, TITLES, n),
+        '材质（Medium）': _choice(rng, MATERIALS, n),
+        '时代（Date）': _choice(rng, MET_DATES, n),
+        '所属部门（Curatorial Department）': _choice(rng, DEPARTMENTS, n),
+        '尺寸（Dimensions）': [
+            f'整体：{a / 2.54:.2f} x {b / 2.54:.2f} x {c / 2.54:.2f} 英寸 ({a} x {b} x {c} 厘米)' if ok else None
+            for a, b, c, ok in zip(h, w, d, has_dims)
+        ],
+        '地区（Geography）': _choice(rng, GEOGRAPHIES, n),
+        '文化（Culture）': _choice(rng, CULTURES, n),
+        '艺术家（Artist）': _choice(rng, ARTISTS, n),
+        '版权与来源（Credit Line）': _choice(rng, CREDIT_LINES, n),
+        '资源链接（Source URL）': [f'https://www.metmuseum.org/art/collection/search/{i}' for i in range(n)],
+        'Local Image Path': [f'static/images/met_images/{i}.jpg' if ok else None for i, ok in enumerate(has_image)],
+    })
+
+
+def make_npm_frame(n, seed=0):
+    """NPM 格式（database_npm/内容清单_with_sizes.xlsx 的列名）"""
+    rng = np.random.default_rng(seed)
+    first_type, second_type = _choice(rng, NPM_SIZE_TYPES, n), _choice(rng, NPM_SIZE_TYPES, n)
+    first, second = _sizes(rng, n), _sizes(rng, n)
+    has_image = rng.random(n) < 0.8
+    return pd.DataFrame({
+        '标题': _choice(rng, TITLES, n),
+        '文物编号': [f'故瓷{i:06d}' for i in range(n)],
+        '分类': _choice(rng, CLASSIFICATIONS, n),
+        '年代': _choice(rng, NPM_DATES, n),
+        '材质': _choice(rng, MATERIALS, n),
+        '尺寸': [f'{t1}{v1}厘米 {t2}{v2}厘米' for t1, v1, t2, v2 in zip(first_type, first, second_type, second)],
+        '英文品名': _choice(rng, ['Bowl', 'Mirror', 'Disc', 'Landscape', 'Seated Buddha', 'Box'], n),
+        '页面链接': [f'https://digitalarchive.npm.gov.tw/Antique/Content?uid={i}' for i in range(n)],
+        '图片链接': [f'https://digitalarchive.npm.gov.tw/Image/{i}.jpg' if ok else None
+                     for i, ok in enumerate(has_image)],
+        '本地图片路径': [f'static/images/palace_images/{i}.jpg' if ok else None for i, ok in enumerate(has_image)],
+        '来源标题': '国立故宫博物院',
+        '来源': 'NPM',
+        '作者': _choice(rng, ARTISTS, n),
+        '图片大小(MB)': np.round(rng.uniform(0.2, 8.0, n), 2),
+    })
+
+
+def make_admin_frame(n, source_id, seed=0):
+    """后台导入格式（bulk_import.IMPORT_COLUMN_MAPPING 映射后的列名），约 1% 的行缺少必需字段"""
+    rng = np.random.default_rng(seed)
+    bad = rng.random(n) < 0.01
+    return pd.DataFrame({
+        'Source_ID': source_id,
+        'Original_ID': [f'BENCH-{i:07d}' for i in range(n)],
+        'Title_CN': [None if b else t for b, t in zip(bad, _choice(rng, TITLES, n))],
+        'Title_EN': _choice(rng, ['Bowl', 'Mirror', 'Disc', 'Landscape', None], n),
+        'Classification': _choice(rng, CLASSIFICATIONS, n),
+        'Material': _choice(rng, MATERIALS, n),
+        'Date_CN': _choice(rng, NPM_DATES, n),
+        'Culture': _choice(rng, CULTURES, n),
+        'Geography': _choice(rng, GEOGRAPHIES, n),
+        'Size_Type': '整体',
+        'Size_Value': [f'{a} x {b} x {c}' for a, b, c in zip(_sizes(rng, n), _sizes(rng, n), _sizes(rng, n))],
+        'Size_Unit': 'cm',
+        'Image_Link': [f'https://example.org/images/{i}.jpg' for i in range(n)],
+    })
+
+
+def generate_file(kind, n, workdir, seed, source_id):
+    """生成（或复用已生成的）合成文件，返回路径"""
+    extension = 'csv' if kind == 'admin' else 'xlsx'
+    path = os.path.join(workdir, f'{kind}_{n}_{seed}.{extension}')
+    if os.path.exists(path):
+        return path
+    started = time.perf_counter()
+    if kind == 'admin':
+        make_admin_frame(n, source_id, seed).to_csv(path, index=False, encoding='utf-8-sig')
+    else:
+        frame = make_met_frame(n, seed) if kind == 'met' else make_npm_frame(n, seed)
+        frame.to_excel(path, index=False)
+    print(f"已生成 {os.path.basename(path)}（{time.perf_counter() - started:.1f} 秒）")
+    return path
+
+
+# --- 2. 临时数据库 ---
+def connect(database=None):
+    config = {k: BENCH_CONFIG[k] for k in ('host', 'user', 'password')}
+    if database:
+        config['database'] = database
+    return mysql.connector.connect(**config)
+
+
+def create_bench_database(cursor):
+    """删除并重建临时库，按 BENCH_SCHEMA_FROM 复制表结构与参考表数据"""
+    bench, source = BENCH_CONFIG['bench_db'], BENCH_CONFIG['schema_from']
+    if bench == source:
+        raise ValueError(f"BENCH_DB_NAME 与 BENCH_SCHEMA_FROM 相同（{bench}），拒绝删除该数据库")
+    cursor.execute(f"DROP DATABASE IF EXISTS `{bench}`")
+    cursor.execute(f"CREATE DATABASE `{bench}` CHARACTER SET utf8mb4")
+    cursor.execute("""
+        SELECT TABLE_NAME FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = %s AND TABLE_TYPE = 'BASE TABLE'
+    """, (source,))
+    tables = [row[0] for row in cursor.fetchall()]
+    for table in tables:
+        cursor.execute(f"CREATE TABLE `{bench}`.`{table}` LIKE `{source}`.`{table}`")
+        if table in REFERENCE_TABLES:
+            cursor.execute(f"INSERT INTO `{bench}`.`{table}` SELECT * FROM `{source}`.`{table}`")
+    cursor.execute(f"INSERT INTO `{bench}`.SOURCES (Museum_Code, Museum_Name_CN) VALUES (%s, %s)", BENCH_SOURCE)
+    source_id = cursor.lastrowid
+    print(f"临时库 {bench} 已从 {source} 复制 {len(tables)} 张表")
+    return tables, source_id
+
+
+def reset_data(cursor, tables):
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    for table in DATA_TABLES:
+        if table in tables:
+            cursor.execute(f"TRUNCATE TABLE `{BENCH_CONFIG['bench_db']}`.`{table}`")
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+
+
+def server_questions(cursor):
+    cursor.execute("SHOW GLOBAL STATUS LIKE 'Questions'")
+    return int(cursor.fetchone()[1])
+
+
+# --- 3. 场景（在子进程中运行） ---
+def peak_rss_mb():
+    """本进程与已结束子进程（清洗进程池）中较大的峰值 RSS（MB）；无法获取时返回 None"""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 1024 / 1024
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux 上单位为 KB，macOS 上为字节
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def run_scenario(scenario, path, use_cache):
+    """运行一个场景并打印结果行（由主进程解析）"""
+    started = time.perf_counter()
+    if scenario == 'admin':
+        import app
+        with open(path, 'rb') as stream:
+            chunks = app.open_import_chunks(stream, path, os.path.basename(path))
+            result = app.import_artifacts_from_chunks(chunks, 'skip', 'bench')
+        detail = {key: result[key] for key in ('inserted', 'updated', 'skipped', 'failed')}
+    else:
+        import loader
+        source = 'MET' if scenario.startswith('met') else 'NPM'
+        loader.SOURCE_PROFILES[source]['file'] = path
+        loader.load_sources([source], delta=scenario == 'met-delta', use_cache=use_cache)
+        detail = {}
+    elapsed = time.perf_counter() - started
+    print(_RESULT_PREFIX + json.dumps({'seconds': elapsed, 'peak_rss_mb': peak_rss_mb(), **detail}))
+
+
+def _spawn(scenario, path, use_cache):
+    """在子进程中运行场景，返回结果字典；失败时返回 None 并打印子进程的输出末尾"""
+    env = dict(os.environ, DB_NAME=BENCH_CONFIG['bench_db'])
+    command = [sys.executable, os.path.abspath(__file__), '--run', scenario, path]
+    if use_cache:
+        command.append('--parse-cache')
+    proc = subprocess.run(command, env=env, cwd=_ROOT, capture_output=True, text=True, encoding='utf-8')
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(_RESULT_PREFIX):
+            return json.loads(line[len(_RESULT_PREFIX):])
+    print(f"场景 {scenario} 运行失败（退出码 {proc.returncode}）：")
+    print('\n'.join((proc.stdout + proc.stderr).splitlines()[-20:]))
+    return None
+
+
+# --- 4. 主流程 ---
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=_ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _format(value, pattern):
+    return pattern.format(value) if value is not None else '-'
+
+
+def run_benchmarks(sizes, scenarios, workdir, seed=0, use_cache=False, json_path=None):
+    os.makedirs(workdir, exist_ok=True)
+    admin = connect()
+    admin.autocommit = True
+    cursor = admin.cursor()
+    tables, source_id = create_bench_database(cursor)
+    commit = _git_commit()
+
+    results = []
+    for n in sizes:
+        for scenario in scenarios:
+            path = generate_file(scenario.split('-')[0], n, workdir, seed, source_id)
+            if scenario != 'met-delta':
+                reset_data(cursor, tables)
+            before = server_questions(cursor)
+            outcome = _spawn(scenario, path, use_cache)
+            statements = server_questions(cursor) - before - 1  # 不计本次 SHOW STATUS
+            if outcome is None:
+                continue
+            cursor.execute(f"SELECT COUNT(*) FROM `{BENCH_CONFIG['bench_db']}`.ARTIFACTS")
+            result = {
+                'time': time.strftime('%Y-%m-%d %H:%M:%S'), 'commit': commit, 'scenario': scenario,
+                'rows': n, 'artifacts': cursor.fetchone()[0], 'statements': statements,
+                'rows_per_sec': n / outcome['seconds'] if outcome['seconds'] else None,
+                'round_trips_per_row': statements / n, **outcome,
+            }
+            results.append(result)
+            print(f"{scenario:<10} {n:>9} 行  {result['seconds']:8.2f} 秒  "
+                  f"{result['rows_per_sec']:10.0f} 行/秒  峰值内存 {_format(result['peak_rss_mb'], '{:.0f}')} MB  "
+                  f"往返/行 {result['round_trips_per_row']:.3f}")
+
+    cursor.close()
+    admin.close()
+
+    print(f"\n{'场景':<10} {'行数':>9} {'秒':>8} {'行/秒':>10} {'峰值内存(MB)':>12} {'往返/行':>8} {'文物数':>9}")
+    for r in results:
+        print(f"{r['scenario']:<10} {r['rows']:>9} {r['seconds']:>8.2f} {r['rows_per_sec']:>10.0f} "
+              f"{_format(r['peak_rss_mb'], '{:.0f}'):>12} {r['round_trips_per_row']:>8.3f} {r['artifacts']:>9}")
+    if json_path:
+        with open(json_path, 'a', encoding='utf-8') as f:
+            for r in results:
+                f.write(json.dumps(r, ensure_ascii=False) + '\n')
+        print(f"结果已追加到 {json_path}")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='导入吞吐量基准测试（合成数据 + 临时数据库）')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000], help='每个场景的行数（可给多个）')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS), help='要运行的场景')
+    parser.add_argument('--workdir', default=os.path.join(_ROOT, '.cache', 'bench'), help='合成文件的存放目录')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--parse-cache', action='store_true', help='使用表格解析缓存（默认每次重新解析）')
+    parser.add_argument('--json', dest='json_path', help='把结果按行追加到该 JSON Lines 文件，便于不同版本间比较')
+    parser.add_argument('--run', nargs=2, metavar=('SCENARIO', 'FILE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_scenario(args.run[0], args.run[1], args.parse_cache)
+    else:
+        run_benchmarks(args.rows, args.scenarios, args.workdir, args.seed, args.parse_cache, args.json_path)
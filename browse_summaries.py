@@ -0,0 +1,142 @@
+"""
+浏览页汇总表
+文化、地理、年代浏览页原先每次访问都在三表连接上 COUNT(DISTINCT ...) 并取 ANY_VALUE 代表图，
+这里把结果物化到 BROWSE_SUMMARIES 表（每个维度取值一行：文物数 + 代表图的 Version_PK），
+浏览页只需读取几十行：
+- 全量刷新：应用启动、导入脚本结束、flask refresh-browse-summaries
+- 增量刷新：后台导入、替换图像后只重算受影响文物所属的文化 / 地理 / 年代分类
+代表图保存 IMAGE_VERSIONS 的主键，替换图像文件（更新同一版本行）后无需刷新。
+
+本模块不依赖 Flask，导入脚本可直接调用。
+"""
+
+from mysql.connector import Error
+
+from db_config import TABLES, FIELDS, LOOKUP_DIMENSIONS
+
+# MySQL 错误码：表不存在
+ER_NO_SUCH_TABLE = 1146
+
+SUMMARY_TABLE = 'BROWSE_SUMMARIES'
+
+_INSERT = (
+    f"INSERT INTO {SUMMARY_TABLE} "
+    f"(Dimension, Value_Group, Value_Name, Value_ID, Artifact_Count, Representative_Version_PK)"
+)
+
+
+def _placeholders(count):
+    return ', '.join(['%s'] * count)
+
+
+def _image_join(artifact_column):
+    """只取有本地图片的版本作为代表图"""
+    return (
+        f"LEFT JOIN {TABLES['image_versions']} iv ON iv.{FIELDS['image']['artifact_id']} = {artifact_column} "
+        f"AND iv.{FIELDS['image']['local_path']} IS NOT NULL AND iv.{FIELDS['image']['local_path']} != ''"
+    )
+
+
+def _refresh_lookup(cursor, kind, value_ids=None):
+    """重算文化 / 地理维度的汇总行（value_ids 为 None 时全量）"""
+    dim = LOOKUP_DIMENSIONS[kind]
+    delete = f"DELETE FROM {SUMMARY_TABLE} WHERE Dimension = %s"
+    where = ''
+    params = []
+    if value_ids is not None:
+        if not value_ids:
+            return
+        delete += f" AND Value_ID IN ({_placeholders(len(value_ids))})"
+        where = f"WHERE d.{dim['id']} IN ({_placeholders(len(value_ids))})"
+        params = list(value_ids)
+
+    cursor.execute(delete, [kind] + params)
+    cursor.execute(f"""
+        {_INSERT}
+        SELECT %s, '', d.{dim['name']}, d.{dim['id']},
+               COUNT(DISTINCT p.{FIELDS['property']['artifact_id']}), MIN(iv.{FIELDS['image']['id']})
+        FROM {dim['table']} d
+        INNER JOIN {TABLES['properties']} p ON p.{dim['fk']} = d.{dim['id']}
+        {_image_join('p.' + FIELDS['property']['artifact_id'])}
+        {where}
+        GROUP BY d.{dim['id']}
+    """, [kind] + params)
+
+
+def _refresh_eras(cursor, era_pairs=None):
+    """重算年代分类的汇总行（Value_Group 为纪年体系，Value_Name 为年代分类；era_pairs 为 None 时全量）"""
+    era_system = FIELDS['artifact']['era_system']
+    era_bucket = FIELDS['artifact']['era_bucket']
+    delete = f"DELETE FROM {SUMMARY_TABLE} WHERE Dimension = 'era'"
+    where = f"WHERE a.{era_bucket} IS NOT NULL"
+    params = []
+    if era_pairs is not None:
+        if not era_pairs:
+            return
+        pairs = ', '.join(['(%s, %s)'] * len(era_pairs))
+        delete += f" AND (Value_Group, Value_Name) IN ({pairs})"
+        where += f" AND (a.{era_system}, a.{era_bucket}) IN ({pairs})"
+        params = [value for pair in era_pairs for value in pair]
+
+    cursor.execute(delete, params)
+    cursor.execute(f"""
+        {_INSERT}
+        SELECT 'era', a.{era_system}, a.{era_bucket}, NULL,
+               COUNT(DISTINCT a.{FIELDS['artifact']['id']}), MIN(iv.{FIELDS['image']['id']})
+        FROM {TABLES['artifacts']} a
+        {_image_join('a.' + FIELDS['artifact']['id'])}
+        {where}
+        GROUP BY a.{era_system}, a.{era_bucket}
+    """, params)
+
+
+def _row_values(row):
+    return tuple(row.values()) if isinstance(row, dict) else tuple(row)
+
+
+def _affected_values(cursor, artifact_ids):
+    """查出这些文物当前所属的文化 ID、地理 ID 与年代分类"""
+    placeholders = _placeholders(len(artifact_ids))
+    affected = {}
+    for kind, dim in LOOKUP_DIMENSIONS.items():
+        cursor.execute(f"""
+            SELECT DISTINCT {dim['fk']} FROM {TABLES['properties']}
+            WHERE {FIELDS['property']['artifact_id']} IN ({placeholders}) AND {dim['fk']} IS NOT NULL
+        """, artifact_ids)
+        affected[kind] = [_row_values(row)[0] for row in cursor.fetchall()]
+    cursor.execute(f"""
+        SELECT DISTINCT {FIELDS['artifact']['era_system']}, {FIELDS['artifact']['era_bucket']}
+        FROM {TABLES['artifacts']}
+        WHERE {FIELDS['artifact']['id']} IN ({placeholders}) AND {FIELDS['artifact']['era_bucket']} IS NOT NULL
+    """, artifact_ids)
+    affected['era'] = [_row_values(row) for row in cursor.fetchall()]
+    return affected
+
+
+def refresh_browse_summaries(cursor, artifact_ids=None):
+    """
+    刷新浏览页汇总表（由调用方 commit）
+    artifact_ids: 只重算这些文物当前所属的文化 / 地理 / 年代分类（新增文物、替换图像后调用）；
+                  为 None 时全量重建（文物的分类可能从旧值改为新值时使用）
+    汇总表尚未创建时打印提示并返回 False
+    """
+    try:
+        if artifact_ids is None:
+            for kind in LOOKUP_DIMENSIONS:
+                _refresh_lookup(cursor, kind)
+            _refresh_eras(cursor)
+            return True
+
+        artifact_ids = [int(i) for i in artifact_ids if i is not None]
+        if not artifact_ids:
+            return True
+        affected = _affected_values(cursor, artifact_ids)
+        for kind in LOOKUP_DIMENSIONS:
+            _refresh_lookup(cursor, kind, affected[kind])
+        _refresh_eras(cursor, affected['era'])
+    except Error as e:
+        if e.errno != ER_NO_SUCH_TABLE:
+            raise
+        print(f"{SUMMARY_TABLE} 表不存在，浏览页无法显示统计。请执行 sql/database_browse_summaries.sql")
+        return False
+    return True
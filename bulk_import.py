@@ -0,0 +1,638 @@
+"""
+集合式批量导入
+后台导入原先对每一行调用 sp_import_artifact_metadata、再 SELECT 出参并提交（每行三次往返、一个事务），
+这里改为：
+- 整列清洗与校验（必需字段、整数 / 尺寸数值转换、长度与取值范围），校验失败的行直接计为失败；
+  validate_chunks 只做这一步（试运行），返回校验报告而不访问数据库
+- 按批把清洗后的行用多行 INSERT 写入临时暂存表 import_staging
+- 每批用少量集合语句完成 跳过 / 更新 / 新增：
+  ARTIFACTS、PROPERTIES、DIMENSIONS、IMAGE_VERSIONS 与 LOGS 各一两条语句，一个事务
+- 某一批执行出错时回滚并二分重试，只有真正出错的行计为失败
+语义与存储过程一致（按 Source_ID + Original_ID 判断是否已存在，更新模式用 COALESCE 保留原值），
+区别：跳过模式下已存在的文物不再追加尺寸与图像记录；同一文件中重复出现的文物，跳过模式只处理第一行，
+更新模式把文物与属性字段合并到第一行，尺寸与图像仍逐行写入（同一类型只保留最后一行，与逐行先删后插一致）。
+
+CSV 上传按块流式读取（iter_csv_chunks）：编码只在文件开头的一段字节上探测一次，
+之后每次只读入 IMPORT_CHUNK_ROWS 行，逐块完成列名映射、校验与写入，内存占用与文件大小无关。
+Excel 上传整表解析，解析结果按文件内容缓存（read_excel_frame，见 parse_cache.py），重新提交同一文件时跳过解析。
+
+环境变量：
+    IMPORT_BATCH_SIZE     每个事务处理的行数（默认 5000）
+    IMPORT_CHUNK_ROWS     CSV 每次读入的行数（默认 20000）
+    IMPORT_SNIFF_BYTES    探测编码时读取的字节数（默认 65536）
+    IMPORT_ERROR_LOG_LIMIT  一次导入逐行记录到 LOGS 的失败行数上限，超出的只写一条汇总（默认 1000）
+
+本模块不依赖 Flask，导入脚本可直接调用 import_dataframe()。
+"""
+
+import codecs
+import os
+
+import numpy as np
+import pandas as pd
+from mysql.connector import Error
+
+from parse_cache import load_frame
+
+BULK_IMPORT_CONFIG = {
+    'batch_size': int(os.getenv('IMPORT_BATCH_SIZE', 5000)),
+    'chunk_rows': int(os.getenv('IMPORT_CHUNK_ROWS', 20000)),
+    'sniff_bytes': int(os.getenv('IMPORT_SNIFF_BYTES', 65536)),
+    'error_log_limit': int(os.getenv('IMPORT_ERROR_LOG_LIMIT', 1000)),
+}
+
+# CSV 编码按顺序尝试：utf-8-sig 兼容 Excel 导出的带 BOM 文件与普通 UTF-8，gbk 为中文 Windows 默认编码
+CSV_ENCODINGS = ('utf-8-sig', 'gbk')
+
+# 列名映射（支持常见的列名变体）
+IMPORT_COLUMN_MAPPING = {
+    '来源ID': 'Source_ID',
+    '来源机构ID': 'Source_ID',
+    '原始编号': 'Original_ID',
+    '文物编号': 'Original_ID',
+    '中文标题': 'Title_CN',
+    '标题': 'Title_CN',
+    '英文标题': 'Title_EN',
+    '中文描述': 'Description_CN',
+    '描述': 'Description_CN',
+    '分类': 'Classification',
+    '材质': 'Material',
+    '中文年代': 'Date_CN',
+    '年代': 'Date_CN',
+    '英文年代': 'Date_EN',
+    '起始年份': 'Start_Year',
+    '结束年份': 'End_Year',
+    '地理': 'Geography',
+    '地区': 'Geography',
+    '文化': 'Culture',
+    '艺术家': 'Artist',
+    '作者': 'Artist',
+    '版权说明': 'Credit_Line',
+    '版权': 'Credit_Line',
+    '页面链接': 'Page_Link',
+    '链接': 'Page_Link',
+    '尺寸类型': 'Size_Type',
+    '尺寸值': 'Size_Value',
+    '尺寸数值': 'Size_Value',
+    '尺寸单位': 'Size_Unit',
+    '图像链接': 'Image_Link',
+    '图片链接': 'Image_Link',
+    '本地路径': 'Local_Path',
+    '本地图片路径': 'Local_Path',
+    '图像路径': 'Local_Path',
+    '版本类型': 'Version_Type'
+}
+
+REQUIRED_COLUMNS = ['Title_CN', 'Source_ID', 'Original_ID']
+
+# 每条多行 INSERT 的行数
+INSERT_BATCH = 1000
+
+STAGING_TABLE = 'import_staging'
+
+KEY_COLUMNS = ['Source_ID', 'Original_ID']
+ARTIFACT_COLUMNS = [
+    'Title_CN', 'Title_EN', 'Description_CN', 'Classification', 'Material',
+    'Date_CN', 'Date_EN', 'Start_Year', 'End_Year'
+]
+PROPERTY_COLUMNS = ['Geography', 'Culture', 'Artist', 'Credit_Line', 'Page_Link']
+DIMENSION_COLUMNS = ['Size_Type', 'Size_Value', 'Size_Unit']
+IMAGE_COLUMNS = ['Image_Link', 'Local_Path', 'Version_Type']
+VALUE_COLUMNS = ARTIFACT_COLUMNS + PROPERTY_COLUMNS + DIMENSION_COLUMNS + IMAGE_COLUMNS
+STAGING_COLUMNS = ['Row_Num'] + KEY_COLUMNS + VALUE_COLUMNS
+# 写入暂存表的列：Is_Duplicate 标记同一文件中重复出现的行（只写尺寸与图像）
+_STAGED_COLUMNS = STAGING_COLUMNS + ['Is_Duplicate']
+
+INTEGER_COLUMNS = ['Source_ID', 'Start_Year', 'End_Year']
+
+# 文字列的长度上限与 Size_Value、整数列的取值范围（与暂存表 / 正式表的列类型一致），超出的行在写入前即计为失败
+TEXT_LIMITS = {
+    'Original_ID': 50, 'Title_CN': 255, 'Title_EN': 255, 'Classification': 100, 'Material': 255,
+    'Date_CN': 100, 'Date_EN': 100, 'Geography': 100, 'Culture': 100, 'Artist': 255,
+    'Size_Type': 50, 'Size_Unit': 20, 'Local_Path': 255, 'Version_Type': 50,
+}
+SIZE_VALUE_LIMIT = 10 ** 7  # DECIMAL(10, 3)
+# 试运行报告中最多保留的错误行数
+VALIDATION_ERROR_LIMIT = 200
+
+# MySQL INT 列的取值范围（Source_ID、Start_Year、End_Year）
+INT_MIN, INT_MAX = -2 ** 31, 2 ** 31 - 1
+
+_NUMBER_RE = r'(\d+\.?\d*)'
+
+# 暂存表列类型与 sp_import_artifact_metadata 的参数一致
+_CREATE_STAGING = f"""
+    CREATE TEMPORARY TABLE IF NOT EXISTS {STAGING_TABLE} (
+        Row_Num         INT PRIMARY KEY,
+        Source_ID       INT NOT NULL,
+        Original_ID     VARCHAR(50) NOT NULL,
+        Title_CN        VARCHAR(255),
+        Title_EN        VARCHAR(255),
+        Description_CN  TEXT,
+        Classification  VARCHAR(100),
+        Material        VARCHAR(255),
+        Date_CN         VARCHAR(100),
+        Date_EN         VARCHAR(100),
+        Start_Year      INT,
+        End_Year        INT,
+        Geography       VARCHAR(100),
+        Culture         VARCHAR(100),
+        Artist          VARCHAR(255),
+        Credit_Line     TEXT,
+        Page_Link       TEXT,
+        Size_Type       VARCHAR(50),
+        Size_Value      DECIMAL(10, 3),
+        Size_Unit       VARCHAR(20),
+        Image_Link      TEXT,
+        Local_Path      VARCHAR(255),
+        Version_Type    VARCHAR(50),
+        Is_Duplicate    TINYINT NOT NULL DEFAULT 0,
+        Artifact_PK     INT NULL,
+        Is_Existing     TINYINT NOT NULL DEFAULT 0,
+        KEY idx_staging_key (Source_ID, Original_ID)
+    )
+"""
+
+_INSERT_STAGING = (
+    f"INSERT INTO {STAGING_TABLE} ({', '.join(_STAGED_COLUMNS)}) "
+    f"VALUES ({', '.join(['%s'] * len(_STAGED_COLUMNS))})"
+)
+
+_INSERT_ERROR_LOG = """
+    INSERT INTO LOGS (Artifact_PK, Table_Name, Operation_Type, User_ID, Status, Description)
+    VALUES (NULL, 'ARTIFACTS', 'BATCH_IMPORT', %s, 'Failed', %s)
+"""
+
+
+# --- 1. 读取上传文件 ---
+def normalize_columns(df):
+    """标准化列名：去除前后空格并应用列名映射"""
+    df.columns = [str(col).strip() for col in df.columns]
+    df.rename(columns=IMPORT_COLUMN_MAPPING, inplace=True)
+    df.columns = [col.strip() for col in df.columns]
+    return df
+
+
+def read_excel_frame(path):
+    """读取上传的 Excel 文件并标准化列名（解析结果按文件内容与列名映射缓存）"""
+    return load_frame(path, repr(sorted(IMPORT_COLUMN_MAPPING.items())),
+                      lambda p: normalize_columns(pd.read_excel(p)))
+
+
+def missing_required_columns(columns):
+    """缺少的必需列（不区分大小写）"""
+    columns_lower = [col.lower() for col in columns]
+    return [col for col in REQUIRED_COLUMNS if col not in columns and col.lower() not in columns_lower]
+
+
+def sniff_encoding(stream, sample_bytes=None):
+    """读取文件开头的一段字节探测编码，之后把读取位置还原到开头"""
+    sample = stream.read(sample_bytes or BULK_IMPORT_CONFIG['sniff_bytes'])
+    stream.seek(0)
+    for encoding in CSV_ENCODINGS:
+        try:
+            # 增量解码：样本末尾被截断的多字节字符不算错误
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return CSV_ENCODINGS[-1]
+
+
+def read_csv_columns(stream, encoding):
+    """只读取表头（标准化后的列名），之后把读取位置还原到开头"""
+    columns = normalize_columns(pd.read_csv(stream, encoding=encoding, nrows=0)).columns
+    stream.seek(0)
+    return list(columns)
+
+
+def iter_csv_chunks(stream, encoding, chunk_rows=None):
+    """
+    按块读取 CSV，每块为列名已标准化的 DataFrame
+    所有列按文本读取，各块的类型一致（不受某一块恰好全为数字或含空值的影响），由 prepare_import_frame 统一转换
+    """
+    reader = pd.read_csv(stream, encoding=encoding, dtype=str,
+                         chunksize=chunk_rows or BULK_IMPORT_CONFIG['chunk_rows'])
+    with reader:
+        for chunk in reader:
+            yield normalize_columns(chunk)
+
+
+# --- 2. 整列清洗 ---
+def _text_column(series):
+    """转换为去除首尾空白的字符串，空值与空字符串为 NA"""
+    text = series.astype('string').str.strip()
+    return text.mask(text == '')
+
+
+def _integer_values(series):
+    """整数列的数值（与 int(float(val)) 一致，小数向零截断），无法转换的值为 NA；尚未检查取值范围"""
+    numbers = pd.to_numeric(_text_column(series), errors='coerce')
+    return pd.Series(np.trunc(numbers), index=series.index)
+
+
+def _in_int_range(numbers):
+    return numbers.between(INT_MIN, INT_MAX).fillna(False).astype(bool)
+
+
+def _integer_column(series):
+    """整数列：无法转换或超出 MySQL INT 范围的值为 NA"""
+    numbers = _integer_values(series)
+    return numbers.where(_in_int_range(numbers)).astype('Int64')
+
+
+def _size_value_column(series):
+    """尺寸数值：文字取第一个数字（如 "66 x 35.6 x 27.3" 取 66），数值直接使用"""
+    is_text = series.map(lambda v: isinstance(v, str))
+    numbers = pd.to_numeric(series.where(~is_text), errors='coerce')
+    extracted = _text_column(series.where(is_text)).str.extract(_NUMBER_RE, expand=False)
+    return numbers.fillna(pd.to_numeric(extracted, errors='coerce')).astype('Float64')
+
+
+def validate_import_frame(df, first_row=2):
+    """
+    整列清洗并校验上传的表格（不访问数据库）：返回 (clean, errors)
+    clean: 清洗后的表格（列为 STAGING_COLUMNS，Row_Num 为表格中的行号，表头为第 1 行；
+           分块读取时 first_row 为本块第一行的行号）
+    errors: 与 clean 同索引的布尔表，每列为一条校验规则（列名即错误信息），True 表示该行违反此规则
+    """
+    clean = pd.DataFrame(index=df.index)
+    clean['Row_Num'] = np.arange(len(df)) + first_row
+    for column in KEY_COLUMNS + VALUE_COLUMNS:
+        if column not in df.columns:
+            clean[column] = pd.Series(pd.NA, index=df.index, dtype='string')
+        elif column in INTEGER_COLUMNS:
+            clean[column] = _integer_column(df[column])
+        elif column == 'Size_Value':
+            clean[column] = _size_value_column(df[column])
+        else:
+            clean[column] = _text_column(df[column])
+
+    errors = pd.DataFrame(index=df.index)
+    for column in ('Title_CN', 'Original_ID'):
+        errors[f'{column} 不能为空'] = clean[column].isna()
+    # Source_ID 区分未填写与无法转换为整数
+    source_text = _text_column(df['Source_ID']) if 'Source_ID' in df.columns else clean['Source_ID']
+    errors['Source_ID 不能为空'] = source_text.isna()
+    source_numbers = _integer_values(df['Source_ID']) if 'Source_ID' in df.columns else clean['Source_ID']
+    errors['Source_ID 不是有效的整数'] = source_text.notna() & source_numbers.isna()
+    for column, limit in TEXT_LIMITS.items():
+        errors[f'{column} 超过 {limit} 个字符'] = clean[column].str.len().gt(limit).fillna(False).astype(bool)
+    errors[f'Size_Value 超出范围（绝对值须小于 {SIZE_VALUE_LIMIT}）'] = \
+        clean['Size_Value'].abs().ge(SIZE_VALUE_LIMIT).fillna(False).astype(bool)
+    for column in INTEGER_COLUMNS:
+        if column in df.columns:
+            numbers = _integer_values(df[column])
+            errors[f'{column} 超出整数范围'] = numbers.notna() & ~_in_int_range(numbers)
+    return clean, errors
+
+
+def _split_failures(clean, errors):
+    """按校验结果拆分：返回 (通过校验的行, [(行号, 中文标题, 第一条错误信息)])"""
+    failed = errors.any(axis=1)
+    first_error = errors[failed].idxmax(axis=1)
+    failures = [
+        (row_num, title if not pd.isna(title) else None, message)
+        for row_num, title, message in zip(clean.loc[failed, 'Row_Num'],
+                                           clean.loc[failed, 'Title_CN'],
+                                           first_error)
+    ]
+    return clean.loc[~failed, STAGING_COLUMNS].reset_index(drop=True), failures
+
+
+def prepare_import_frame(df, first_row=2):
+    """
+    清洗并校验上传的表格：返回 (records, failures)
+    records: 通过校验的行（列为 STAGING_COLUMNS）
+    failures: [(行号, 中文标题, 错误信息)]，每行只报告第一条违反的规则
+    """
+    return _split_failures(*validate_import_frame(df, first_row))
+
+
+def validate_chunks(chunks, error_limit=None, progress=None):
+    """
+    试运行：只清洗与校验，不访问数据库
+    返回 {'total', 'valid', 'failed', 'duplicates', 'rule_counts', 'errors', 'errors_omitted'}，
+    rule_counts 为每条规则违反的行数（一行可能违反多条），duplicates 为同一文件中重复的记录数；
+    errors 只保留前 error_limit 行（默认 VALIDATION_ERROR_LIMIT）的错误信息，其余只计入 errors_omitted
+    progress(已处理行数, 累计报告) 在每块校验完后调用
+    """
+    error_limit = VALIDATION_ERROR_LIMIT if error_limit is None else error_limit
+    report = {'total': 0, 'valid': 0, 'failed': 0, 'duplicates': 0, 'rule_counts': {},
+              'errors': [], 'errors_omitted': 0}
+    seen = set()
+    first_row = 2
+    for chunk in chunks:
+        clean, errors = validate_import_frame(chunk, first_row)
+        first_row += len(chunk)
+        records, failures = _split_failures(clean, errors)
+
+        report['total'] += len(clean)
+        report['valid'] += len(records)
+        report['failed'] += len(failures)
+        for message, count in errors.sum().items():
+            if count:
+                report['rule_counts'][message] = report['rule_counts'].get(message, 0) + int(count)
+        room = max(error_limit - len(report['errors']), 0)
+        report['errors'].extend(f"行 {row_num}: {message}" for row_num, _, message in failures[:room])
+        report['errors_omitted'] += max(len(failures) - room, 0)
+        for key in zip(records['Source_ID'], records['Original_ID']):
+            if key in seen:
+                report['duplicates'] += 1
+            else:
+                seen.add(key)
+        if progress:
+            progress(first_row - 2, report)
+    return report
+
+
+def _to_rows(frame):
+    """DataFrame → executemany 参数（NA 转为 None，numpy 标量转为 Python 值）"""
+    values = frame.astype(object).where(frame.notna(), None)
+    return [
+        tuple(v.item() if isinstance(v, np.generic) else v for v in row)
+        for row in values.itertuples(index=False, name=None)
+    ]
+
+
+# --- 3. 集合式写入 ---
+def _any_not_null(columns):
+    return '(' + ' OR '.join(f"s.{c} IS NOT NULL" for c in columns) + ')'
+
+
+def _apply_batch(cursor, rows, import_mode, user_id):
+    """把一批行写入暂存表并应用到正式表；返回 {行号: (Artifact_PK, 是否已存在)}"""
+    update = import_mode == 'update'
+    # 跳过模式下已存在的文物不做任何改动
+    applied = "1 = 1" if update else "s.Is_Existing = 0"
+
+    cursor.execute(f"DELETE FROM {STAGING_TABLE}")
+    for i in range(0, len(rows), INSERT_BATCH):
+        cursor.executemany(_INSERT_STAGING, rows[i:i + INSERT_BATCH])
+
+    # 1. 按 Source_ID + Original_ID 匹配已存在的文物
+    cursor.execute(f"""
+        UPDATE {STAGING_TABLE} s
+        INNER JOIN ARTIFACTS a ON a.Source_ID = s.Source_ID AND a.Original_ID = s.Original_ID
+        SET s.Artifact_PK = a.Artifact_PK, s.Is_Existing = 1
+    """)
+
+    # 2. 新增文物，再取回自增主键
+    cursor.execute(f"""
+        INSERT INTO ARTIFACTS (Source_ID, Original_ID, {', '.join(ARTIFACT_COLUMNS)})
+        SELECT s.Source_ID, s.Original_ID, {', '.join('s.' + c for c in ARTIFACT_COLUMNS)}
+        FROM {STAGING_TABLE} s
+        WHERE s.Is_Existing = 0 AND s.Is_Duplicate = 0
+        ORDER BY s.Row_Num
+    """)
+    cursor.execute(f"""
+        UPDATE {STAGING_TABLE} s
+        INNER JOIN ARTIFACTS a ON a.Source_ID = s.Source_ID AND a.Original_ID = s.Original_ID
+        SET s.Artifact_PK = a.Artifact_PK
+        WHERE s.Is_Existing = 0
+    """)
+
+    # 3. 更新模式：已存在的文物与属性只覆盖表格中有值的字段
+    if update:
+        cursor.execute(f"""
+            UPDATE ARTIFACTS a
+            INNER JOIN {STAGING_TABLE} s ON s.Artifact_PK = a.Artifact_PK
+            SET {', '.join(f"a.{c} = COALESCE(s.{c}, a.{c})" for c in ARTIFACT_COLUMNS)}
+            WHERE s.Is_Existing = 1 AND s.Is_Duplicate = 0
+        """)
+        cursor.execute(f"""
+            UPDATE PROPERTIES p
+            INNER JOIN {STAGING_TABLE} s ON s.Artifact_PK = p.Artifact_PK
+            SET {', '.join(f"p.{c} = COALESCE(s.{c}, p.{c})" for c in PROPERTY_COLUMNS)}
+            WHERE s.Is_Existing = 1 AND s.Is_Duplicate = 0 AND {_any_not_null(PROPERTY_COLUMNS)}
+        """)
+    cursor.execute(f"""
+        INSERT INTO PROPERTIES (Artifact_PK, {', '.join(PROPERTY_COLUMNS)})
+        SELECT s.Artifact_PK, {', '.join('s.' + c for c in PROPERTY_COLUMNS)}
+        FROM {STAGING_TABLE} s
+        WHERE s.Is_Existing = 0 AND s.Is_Duplicate = 0 AND {_any_not_null(PROPERTY_COLUMNS)}
+        ORDER BY s.Row_Num
+    """)
+
+    # 4. 尺寸：更新模式先删除同类型的旧记录（重复行的文物未能写入时 Artifact_PK 为空，不写入）
+    has_size = "s.Artifact_PK IS NOT NULL AND s.Size_Type IS NOT NULL AND s.Size_Value IS NOT NULL"
+    if update:
+        cursor.execute(f"""
+            DELETE d FROM DIMENSIONS d
+            INNER JOIN {STAGING_TABLE} s ON s.Artifact_PK = d.Artifact_PK AND s.Size_Type = d.Size_Type
+            WHERE s.Is_Existing = 1 AND s.Size_Value IS NOT NULL
+        """)
+    cursor.execute(f"""
+        INSERT INTO DIMENSIONS (Artifact_PK, Size_Type, Size_Value, Size_Unit)
+        SELECT s.Artifact_PK, s.Size_Type, s.Size_Value, s.Size_Unit
+        FROM {STAGING_TABLE} s
+        WHERE {has_size} AND {applied}
+        ORDER BY s.Row_Num
+    """)
+
+    # 5. 图像：更新模式先删除同版本类型的旧记录
+    has_image = "s.Artifact_PK IS NOT NULL AND (s.Image_Link IS NOT NULL OR s.Local_Path IS NOT NULL)"
+    if update:
+        cursor.execute(f"""
+            DELETE iv FROM IMAGE_VERSIONS iv
+            INNER JOIN {STAGING_TABLE} s ON s.Artifact_PK = iv.Artifact_PK
+                AND iv.Version_Type = COALESCE(s.Version_Type, 'Original')
+            WHERE s.Is_Existing = 1 AND {has_image}
+        """)
+    cursor.execute(f"""
+        INSERT INTO IMAGE_VERSIONS (Artifact_PK, Version_Type, Image_Link, Local_Path)
+        SELECT s.Artifact_PK, COALESCE(s.Version_Type, 'Original'), s.Image_Link, s.Local_Path
+        FROM {STAGING_TABLE} s
+        WHERE {has_image} AND {applied}
+        ORDER BY s.Row_Num
+    """)
+
+    # 6. 操作日志（与存储过程写入的内容一致）
+    existing_message = "'更新文物记录: '" if update else "'跳过已存在的记录: '"
+    cursor.execute(f"""
+        INSERT INTO LOGS (Artifact_PK, Table_Name, Operation_Type, User_ID, Status, Description)
+        SELECT s.Artifact_PK, 'ARTIFACTS', IF(s.Is_Existing = 0, 'INSERT', 'UPDATE'), %s, 'Success',
+               CONCAT(IF(s.Is_Existing = 0, '创建新文物记录: ', {existing_message}),
+                      COALESCE(s.Title_CN, s.Original_ID))
+        FROM {STAGING_TABLE} s
+        WHERE s.Is_Duplicate = 0
+        ORDER BY s.Row_Num
+    """, (user_id or 'system',))
+
+    cursor.execute(f"SELECT Row_Num, Artifact_PK, Is_Existing FROM {STAGING_TABLE}")
+    return {
+        row[0]: (row[1], bool(row[2]))
+        for row in (tuple(r.values()) if isinstance(r, dict) else r for r in cursor.fetchall())
+    }
+
+
+def _apply_with_retry(conn, cursor, rows, import_mode, user_id):
+    """执行一批并提交；出错时回滚并二分重试。返回 (状态, [(行, 错误信息)])"""
+    try:
+        statuses = _apply_batch(cursor, rows, import_mode, user_id)
+        conn.commit()
+        return statuses, []
+    except Error as e:
+        conn.rollback()
+        if len(rows) == 1:
+            return {}, [(rows[0], str(e))]
+    middle = len(rows) // 2
+    first, first_failures = _apply_with_retry(conn, cursor, rows[:middle], import_mode, user_id)
+    second, second_failures = _apply_with_retry(conn, cursor, rows[middle:], import_mode, user_id)
+    first.update(second)
+    return first, first_failures + second_failures
+
+
+def _error_description(row_num, title, message):
+    """失败日志的内容（与 sp_log_import_error 一致）"""
+    return f"批量导入失败 - 第{row_num}行: {title or '未知文物'}. 错误: {message}"
+
+
+def log_import_errors(cursor, failures, user_id):
+    """批量写入失败日志（与 sp_log_import_error 的内容一致），failures 为 [(行号, 中文标题, 错误信息)]"""
+    if not failures:
+        return
+    rows = [(user_id or 'system', _error_description(*failure)) for failure in failures]
+    for i in range(0, len(rows), INSERT_BATCH):
+        cursor.executemany(_INSERT_ERROR_LOG, rows[i:i + INSERT_BATCH])
+
+
+class ImportErrorCollector:
+    """
+    导入失败行的收集器（一次导入共用一个）
+    失败行先缓存在内存中，每块结束时 flush() 用多行 INSERT 一次写入 LOGS（由调用方 commit）；
+    失败行数超过上限（IMPORT_ERROR_LOG_LIMIT）后不再逐行记录与返回，只计数，
+    finish() 时写入一条汇总日志，错误的文件不会产生成千上万条日志
+    """
+
+    def __init__(self, user_id, limit=None):
+        self.user_id = user_id or 'system'
+        self.limit = BULK_IMPORT_CONFIG['error_log_limit'] if limit is None else limit
+        self.total = 0
+        self.suppressed = 0
+        self._pending = []
+
+    def add(self, failures):
+        """记录失败行 [(行号, 中文标题, 错误信息)]，返回未超过上限、逐行记录的错误信息"""
+        messages = []
+        for failure in failures:
+            self.total += 1
+            if self.total > self.limit:
+                self.suppressed += 1
+                continue
+            self._pending.append(failure)
+            messages.append(f"行 {failure[0]}: {failure[2]}")
+        return messages
+
+    def flush(self, cursor):
+        """把缓存的失败行写入 LOGS"""
+        log_import_errors(cursor, self._pending, self.user_id)
+        self._pending = []
+
+    def finish(self, cursor):
+        """写入剩余的失败行，超过上限时追加一条汇总日志"""
+        self.flush(cursor)
+        if self.suppressed:
+            cursor.execute(_INSERT_ERROR_LOG, (
+                self.user_id,
+                f"批量导入失败 {self.total} 行，超过记录上限 {self.limit} 行，其余 {self.suppressed} 行未逐行记录"
+            ))
+
+
+def _collapse_duplicates(records, duplicated):
+    """
+    更新模式下的重复行：逐行 COALESCE 更新等价于文物与属性的每列取最后一个非空值，合并到第一次出现的行；
+    尺寸与图像不合并（不同的行来自不同的记录），每行各写一条，同一文物同一尺寸类型 / 图像版本类型
+    出现多次时只保留最后一行（逐行执行时后一行会先删除前一行写入的记录）。返回带 Is_Duplicate 列的行
+    """
+    merged_columns = ARTIFACT_COLUMNS + PROPERTY_COLUMNS
+    records = records.copy()
+    values = records.groupby(KEY_COLUMNS, sort=False)[merged_columns].last()
+    merged = records[KEY_COLUMNS].merge(values, left_on=KEY_COLUMNS, right_index=True, how='left')
+    records[merged_columns] = merged[merged_columns].set_axis(records.index)
+    records.loc[duplicated, merged_columns] = None
+
+    has_size = records['Size_Type'].notna() & records['Size_Value'].notna()
+    replaced = records[has_size].duplicated(KEY_COLUMNS + ['Size_Type'], keep='last')
+    records.loc[replaced[replaced].index, DIMENSION_COLUMNS] = None
+
+    has_image = records['Image_Link'].notna() | records['Local_Path'].notna()
+    versions = records[KEY_COLUMNS].assign(Version_Type=records['Version_Type'].fillna('Original'))[has_image]
+    replaced = versions.duplicated(keep='last')
+    records.loc[replaced[replaced].index, IMAGE_COLUMNS] = None
+
+    return records.assign(Is_Duplicate=duplicated.astype(int))
+
+
+def import_dataframe(conn, cursor, df, import_mode='skip', user_id='admin', batch_size=None, first_row=2,
+                     error_collector=None):
+    """
+    批量导入上传的表格（或分块读取的一块），import_mode 为 'skip'（已存在则跳过）或 'update'（已存在则更新）
+    每批一个事务，返回 {'inserted', 'updated', 'skipped', 'failed', 'errors', 'artifact_ids'}，
+    artifact_ids 为新增或更新的文物（用于刷新年代分类、维度表与搜索索引）
+    error_collector: 分块导入时共用的 ImportErrorCollector（由调用方在全部完成后 finish()）；
+                     为 None 时本次调用单独收集并写入失败日志
+    """
+    batch_size = batch_size or BULK_IMPORT_CONFIG['batch_size']
+    result = {'inserted': 0, 'updated': 0, 'skipped': 0, 'failed': 0, 'errors': [], 'artifact_ids': []}
+
+    records, failures = prepare_import_frame(df, first_row)
+
+    # 同一文件中重复出现的文物：第一次出现的行决定新增 / 已存在，之后的行依次视为已存在
+    duplicated = records.duplicated(KEY_COLUMNS, keep='first')
+    duplicates = records.loc[duplicated, ['Row_Num'] + KEY_COLUMNS]
+    if import_mode == 'update':
+        records = _collapse_duplicates(records, duplicated)
+    else:
+        records = records.loc[~duplicated].assign(Is_Duplicate=0)
+
+    rows = _to_rows(records[_STAGED_COLUMNS])
+    statuses = {}
+    cursor.execute(_CREATE_STAGING)
+    try:
+        for i in range(0, len(rows), batch_size):
+            batch_statuses, batch_failures = _apply_with_retry(
+                conn, cursor, rows[i:i + batch_size], import_mode, user_id)
+            statuses.update(batch_statuses)
+            title_index = STAGING_COLUMNS.index('Title_CN')
+            failures.extend((row[0], row[title_index], message) for row, message in batch_failures)
+    finally:
+        cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {STAGING_TABLE}")
+
+    key_status = {}
+    for row in rows:
+        status = statuses.get(row[0])
+        if status is None or row[-1]:
+            continue
+        artifact_id, existing = status
+        key_status[(row[1], row[2])] = artifact_id
+        if not existing:
+            result['inserted'] += 1
+            result['artifact_ids'].append(artifact_id)
+        elif import_mode == 'update':
+            result['updated'] += 1
+            result['artifact_ids'].append(artifact_id)
+        else:
+            result['skipped'] += 1
+
+    # 重复行：所属文物写入成功时计为更新 / 跳过，否则随第一行一起失败（自身写入尺寸或图像出错的已计为失败）
+    failed_rows = {failure[0] for failure in failures}
+    for row_num, source_id, original_id in duplicates.itertuples(index=False, name=None):
+        if row_num in failed_rows:
+            continue
+        if (source_id, original_id) in key_status:
+            result['updated' if import_mode == 'update' else 'skipped'] += 1
+        else:
+            failures.append((row_num, None, '同一文件中重复的记录未能导入'))
+
+    failures.sort(key=lambda failure: failure[0])
+    result['failed'] = len(failures)
+    collector = error_collector or ImportErrorCollector(user_id)
+    result['errors'] = collector.add(failures)
+    if failures:
+        if error_collector is None:
+            collector.finish(cursor)
+        else:
+            collector.flush(cursor)
+        conn.commit()
+    return result
@@ -1,7 +1,16 @@
 import mysql.connector
 import re
 import os
+import time
+import pandas as pd
 from mysql.connector import Error
+import sys
+# 复用项目根目录下的公共模块
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from search_cache import bump_catalogue_version
+from loader import DYNASTY_MAP
 
 # --- 1. 日期解析逻辑 (源自 date_process.py) ---
 def parse_date_string(date_str):
@@ -84,8 +93,161 @@ def parse_date_string(date_str):
     year = numbers[0]
     return year * is_bc, year * is_bc
 
+# --- 1b. 整列批量解析（向量化版本，规则与 parse_date_string 一致，另外补充朝代名称） ---
+_CN_CENTURY_DIGITS = {'一': 1, '二': 2, '三': 3, '四': 4, '五': 5, '六': 6, '七': 7, '八': 8, '九': 9, '十': 10}
+# 每个字符串中的前两段数字
+_FIRST_TWO_NUMBERS = r'(\d+)(?:\D+(\d+))?'
+# 可接受的最大数字（更长的数字串不是年份）
+_MAX_NUMBER = 10 ** 6
+# 朝代名称：整个值为朝代名，或以朝代名开头且其后为空白、"代"、"朝"、"时期"、"晚期"或括号等（如"清 乾隆"、"明代"、"西周晚期"）；
+# 不做子串匹配，"公元前"、"西元"、"明治时代"等不会被当作朝代
+_DYNASTY_RE = re.compile(
+    '^(' + '|'.join(sorted(map(re.escape, DYNASTY_MAP), key=len, reverse=True)) + r')(?:$|[\s代朝（(·,，、]|时期|[早中晚]期)'
+)
+# 未能解析的值最多打印多少种
+UNPARSED_REPORT_LIMIT = 20
+# 每条多行 INSERT 的行数 / 逐行模式下每次提交的行数
+UPDATE_BATCH = 1000
+# 集合式写回时每个事务（暂存表分块）的行数
+STAGING_CHUNK = 20000
+
+def parse_date_column(dates):
+    """
+    批量解析一整列日期字符串，返回与输入同索引的 DataFrame：start_year, end_year（可空整数）
+    数字规则与 parse_date_string 相同（世纪、年份范围、公元前、/西元 后缀、单个年份），
+    不含数字的值以朝代名称开头时（如"清"、"明 宣德"）按 loader.DYNASTY_MAP 换算，其余留空。
+    日期文字重复度很高：先对取值去重，只解析不同的值，再按编码展开回整列
+    """
+    dates = pd.Series(dates, dtype=object)
+    codes, uniques = pd.factorize(dates.map(lambda v: str(v).strip() if pd.notna(v) else None))
+    parsed = _parse_unique_dates(pd.Series(uniques, dtype=object))
+    # 空值的编码为 -1：追加一行空结果供其引用
+    parsed = pd.concat([parsed, pd.DataFrame({'start_year': [pd.NA], 'end_year': [pd.NA]}, dtype='Int64')],
+                       ignore_index=True)
+    result = parsed.iloc[codes].reset_index(drop=True)
+    result.index = dates.index
+    return result
+
+def _parse_unique_dates(s):
+    """对去重后的日期文字做整列解析（pandas 字符串操作），规则见 parse_date_column"""
+    s = s.astype('string')
+
+    # 1. 中文数字世纪（"九世纪" → "9世纪"），与逐行版本一样替换该汉字的所有出现
+    has_cn_century = s.str.contains(f"[{''.join(_CN_CENTURY_DIGITS)}]世纪", na=False)
+    if has_cn_century.any():
+        cn_part = s[has_cn_century]
+        for cn, num in _CN_CENTURY_DIGITS.items():
+            mask = cn_part.str.contains(f"{cn}世纪", regex=False, na=False)
+            cn_part = cn_part.mask(mask, cn_part.str.replace(cn, str(num), regex=False))
+        s = s.mask(has_cn_century, cn_part)
+
+    # 2. 公元前标记
+    sign = pd.Series(1, index=s.index, dtype='Int64')
+    sign = sign.mask(s.str.contains('公元前', regex=False, na=False) | s.str.contains('B.C.', regex=False, na=False), -1)
+
+    # 超出 INT 列合理范围的数字（多段数字粘连等）视为无法解析
+    numbers = s.str.extract(_FIRST_TWO_NUMBERS).apply(pd.to_numeric, errors='coerce')
+    numbers = numbers.where(numbers < _MAX_NUMBER).astype('Int64')
+    y1, y2 = numbers[0], numbers[1]
+    start = pd.Series(pd.NA, index=s.index, dtype='Int64')
+    end = pd.Series(pd.NA, index=s.index, dtype='Int64')
+    pending = y1.notna()
+
+    # 3. "/西元 1707 年" 后缀优先
+    if s.str.contains('/西元', regex=False, na=False).any():
+        western = pd.to_numeric(s.str.split('/西元').str[1].str.extract(r'(\d+)')[0],
+                                errors='coerce').astype('Int64')
+        hit = pending & western.notna()
+        start, end = start.mask(hit, western), end.mask(hit, western)
+        pending &= ~hit
+
+    # 4. 世纪：9世纪 = 800-899；公元前1世纪 = -99 到 0
+    hit = pending & s.str.contains('世纪', regex=False, na=False)
+    century_start = (y1 - 1) * 100
+    century_end = century_start + 99
+    bc = sign == -1
+    start = start.mask(hit & ~bc, century_start).mask(hit & bc, -century_end)
+    end = end.mask(hit & ~bc, century_end).mask(hit & bc, -century_start)
+    pending &= ~hit
+
+    # 5. 年份范围："1890-1896"、"1775-79"（简写补全世纪）；非公元前且结束早于开始时取开始年份
+    hit = pending & y2.notna() & (s.str.contains('-', regex=False, na=False) | s.str.contains('至', regex=False, na=False))
+    range_end = y2.mask((y2 < 100) & (y1 > 100), (y1 // 100) * 100 + y2)
+    range_end = range_end.mask(~bc & (range_end < y1), y1)
+    start = start.mask(hit, y1 * sign)
+    end = end.mask(hit, range_end * sign)
+    pending &= ~hit
+
+    # 6. 单个年份
+    start = start.mask(pending, y1 * sign)
+    end = end.mask(pending, y1 * sign)
+
+    # 7. 不含数字的值：以朝代名称开头时按朝代对照表换算，其余保持无法解析（出现在报告中）
+    no_number = y1.isna() & s.notna() & (s != '')
+    if no_number.any():
+        dynasty = s[no_number].str.extract(_DYNASTY_RE)[0]
+        start = start.mask(no_number, dynasty.map(lambda k: DYNASTY_MAP[k][0], na_action='ignore').astype('Int64'))
+        end = end.mask(no_number, dynasty.map(lambda k: DYNASTY_MAP[k][1], na_action='ignore').astype('Int64'))
+
+    return pd.DataFrame({'start_year': start, 'end_year': end})
+
 # --- 2. 数据库操作逻辑 ---
-def update_database():
+def apply_year_updates_row_by_row(conn, cursor, rows):
+    """逐行 UPDATE（每行一次往返），rows 为 (Artifact_PK, start_year, end_year)；返回受影响行数"""
+    update_sql = """
+        UPDATE ARTIFACTS 
+        SET Start_Year = %s, End_Year = %s 
+        WHERE Artifact_PK = %s
+    """
+    changed = 0
+    for i in range(0, len(rows), UPDATE_BATCH):
+        for pk, start, end in rows[i:i + UPDATE_BATCH]:
+            cursor.execute(update_sql, (start, end, pk))
+            changed += cursor.rowcount
+        conn.commit()
+        print(f"已处理 {min(i + UPDATE_BATCH, len(rows))} 条...")
+    return changed
+
+def apply_year_updates_bulk(conn, cursor, rows, chunk_size=None):
+    """
+    集合式写回：rows 为 (Artifact_PK, start_year, end_year)
+    每个分块先用多行 INSERT 写入临时暂存表，再用一条 UPDATE ... JOIN 应用到 ARTIFACTS，
+    分块提交（每个事务只锁定一个分块的行），只有年份实际变化的行会被改写；返回受影响行数
+    """
+    chunk_size = chunk_size or STAGING_CHUNK
+    cursor.execute("""
+        CREATE TEMPORARY TABLE IF NOT EXISTS year_staging (
+            Artifact_PK INT PRIMARY KEY,
+            Start_Year INT,
+            End_Year INT
+        )
+    """)
+    insert_sql = "INSERT INTO year_staging (Artifact_PK, Start_Year, End_Year) VALUES (%s, %s, %s)"
+    apply_sql = """
+        UPDATE ARTIFACTS a
+        INNER JOIN year_staging s ON s.Artifact_PK = a.Artifact_PK
+        SET a.Start_Year = s.Start_Year, a.End_Year = s.End_Year
+        WHERE NOT (a.Start_Year <=> s.Start_Year AND a.End_Year <=> s.End_Year)
+    """
+    changed = 0
+    started = time.perf_counter()
+    try:
+        for i in range(0, len(rows), chunk_size):
+            chunk = rows[i:i + chunk_size]
+            cursor.execute("DELETE FROM year_staging")
+            # executemany 会把 INSERT ... VALUES 合并为多行插入；每条语句最多 UPDATE_BATCH 行
+            for j in range(0, len(chunk), UPDATE_BATCH):
+                cursor.executemany(insert_sql, chunk[j:j + UPDATE_BATCH])
+            cursor.execute(apply_sql)
+            changed += cursor.rowcount
+            conn.commit()
+            done = i + len(chunk)
+            print(f"已处理 {done}/{len(rows)} 条（{done / max(time.perf_counter() - started, 1e-9):.0f} 条/秒）...")
+    finally:
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS year_staging")
+    return changed
+
+def update_database(bulk=True):
     # 数据库配置 - 请根据您的实际情况修改
     db_config = {
         'host': 'localhost',
@@ -100,54 +262,47 @@ def update_database():
         if conn.is_connected():
             print("成功连接到数据库")
             
-            cursor = conn.cursor(dictionary=True)
+            cursor = conn.cursor()
             
             # 1. 读取所有数据
+            started = time.perf_counter()
             print("正在读取 ARTIFACTS 表...")
             cursor.execute("SELECT Artifact_PK, Date_CN FROM ARTIFACTS")
-            artifacts = cursor.fetchall()
+            artifacts = pd.DataFrame(cursor.fetchall(), columns=['Artifact_PK', 'Date_CN'])
             print(f"共找到 {len(artifacts)} 条记录，开始处理...")
             
-            updated_count = 0
-            error_count = 0
+            # 2. 整列解析
+            years = parse_date_column(artifacts['Date_CN'])
+            parsed = years['start_year'].notna() & years['end_year'].notna()
+            print(f"解析完成，用时 {time.perf_counter() - started:.1f} 秒")
             
-            # 2. 遍历并更新
-            for art in artifacts:
-                pk = art['Artifact_PK']
-                date_cn = art['Date_CN']
-                
-                try:
-                    start_year, end_year = parse_date_string(date_cn)
-                    
-                    if start_year is not None and end_year is not None:
-                        # 执行更新 SQL
-                        update_sql = """
-                            UPDATE ARTIFACTS 
-                            SET Start_Year = %s, End_Year = %s 
-                            WHERE Artifact_PK = %s
-                        """
-                        cursor.execute(update_sql, (start_year, end_year, pk))
-                        updated_count += 1
-                        
-                        # 每100条打印一次进度
-                        if updated_count % 100 == 0:
-                            print(f"已处理 {updated_count} 条...")
-                            conn.commit() # 阶段性提交
-                    else:
-                        # 无法解析的记录（可选：打印出来以便手动检查）
-                        # print(f"无法解析: ID={pk}, Date={date_cn}")
-                        pass
-                        
-                except Exception as e:
-                    print(f"处理 ID={pk} 时出错: {e}")
-                    error_count += 1
-
-            # 提交剩余的更改
+            # 3. 写回
+            rows = [
+                (int(pk), int(start), int(end))
+                for pk, start, end in zip(artifacts.loc[parsed, 'Artifact_PK'],
+                                          years.loc[parsed, 'start_year'],
+                                          years.loc[parsed, 'end_year'])
+            ]
+            if bulk:
+                changed_count = apply_year_updates_bulk(conn, cursor, rows)
+            else:
+                changed_count = apply_year_updates_row_by_row(conn, cursor, rows)
+            updated_count = len(rows)
+
+            # 让应用的搜索缓存失效
+            bump_catalogue_version(cursor)
             conn.commit()
             print("-" * 30)
-            print(f"处理完成！")
-            print(f"成功更新: {updated_count} 条")
+            print(f"处理完成！用时 {time.perf_counter() - started:.1f} 秒")
+            print(f"成功解析: {updated_count} 条（其中年份有变化: {changed_count} 条）")
             print(f"出错/无法解析: {len(artifacts) - updated_count} 条")
+            
+            # 4. 报告无法解析的值（按出现次数）
+            unparsed = artifacts.loc[~parsed, 'Date_CN'].fillna('(空)').value_counts()
+            if len(unparsed):
+                print(f"无法解析的日期（共 {len(unparsed)} 种，显示前 {UNPARSED_REPORT_LIMIT} 种）：")
+                for value, count in unparsed.head(UNPARSED_REPORT_LIMIT).items():
+                    print(f"  {value!r}: {count} 条")
 
     except Error as e:
         print(f"数据库连接错误: {e}")
@@ -158,4 +313,9 @@ def update_database():
             print("数据库连接已关闭")
 
 if __name__ == '__main__':
-    update_database()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description='根据 Date_CN 重新计算 ARTIFACTS 的 Start_Year / End_Year')
+    parser.add_argument('--row-by-row', action='store_true',
+                        help='逐行 UPDATE（默认经临时暂存表集合式写回）')
+    args = parser.parse_args()
+    update_database(bulk=not args.row_by_row)
\ No newline at end of file
@@ -0,0 +1,645 @@
+"""
+统一的馆藏数据导入
+原先 database/load.py（MET）与 database_npm/data_importer_multi_table.py（NPM）各自逐行 iterrows、
+每行每张表一条 INSERT。这里合并为一个导入器：
+- 每个来源一份配置（SOURCE_PROFILES）：Excel 文件、列名映射、取值清洗、尺寸解析、年份换算、默认值；
+  新增博物馆只需添加一份配置
+- Excel 解析结果缓存为旁路文件（parse_cache.py），文件与列名映射未变时再次运行跳过解析
+- 表格按块交给进程池清洗与解析（尺寸、年份等纯 Python 逻辑可以并行）
+- 主进程按块用 executemany 多行 INSERT 写入 ARTIFACTS、PROPERTIES、IMAGE_VERSIONS、DIMENSIONS，
+  每块一个事务；新文物的主键按插入顺序取回；某块写入出错时回滚并二分重试，只有真正出错的行计为失败
+- 增量导入（--delta）：每行清洗后的数据计算内容哈希（ARTIFACTS.Row_Hash），按 Source_ID + Original_ID
+  与已有文物比对，只新增新记录、原地更新有变化的记录；源文件中已不存在的文物加 --delete-missing 才删除
+- 全部来源导入后补齐年代分类列、文化 / 地理维度表，刷新浏览页汇总，并让应用的搜索缓存失效
+
+用法（项目根目录）：
+    python database/loader.py                 # 重新导入全部来源
+    python database/loader.py MET             # 只导入大都会
+    python database/loader.py NPM --workers 4 --chunk-rows 1000
+    python database/loader.py MET --delta --delete-missing
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+import mysql.connector
+import pandas as pd
+from mysql.connector import Error
+
+# 复用项目根目录下的公共模块
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _ROOT)
+from search_cache import bump_catalogue_version
+from era_classifier import update_era_columns
+from lookup_tables import sync_lookup_ids
+from browse_summaries import refresh_browse_summaries
+from parse_cache import load_frame
+
+# ================= 配置区域 =================
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'user': os.getenv('DB_USER', 'root'),
+    'password': os.getenv('DB_PASSWORD', 'leeanna'),  # 可通过环境变量DB_PASSWORD设置，否则使用默认值
+    'database': os.getenv('DB_NAME', 'project'),
+    'autocommit': False
+}
+
+# 每块交给一个工作进程清洗的行数
+CHUNK_ROWS = 5000
+# 每条多行 INSERT 的行数
+INSERT_BATCH = 1000
+# ===========================================
+
+
+# --- 1. 各来源的取值清洗与解析 ---
+def clean_text(val):
+    """处理Excel中的空值，转换为SQL的None；其余转为去除首尾空白的字符串"""
+    if pd.isna(val) or val == '':
+        return None
+    return str(val).strip()
+
+
+def clean_raw(val):
+    """将 Pandas/Numpy 的 NaN 值转换为 Python 的 None，其余保持原值（numpy 标量转为 Python 值）"""
+    if pd.isna(val):
+        return None
+    return val.item() if hasattr(val, 'item') else val
+
+
+def parse_met_dimensions(dim_str):
+    """
+    从 MET 的尺寸字符串中提取长宽高。
+    例如: "整体... (2.7 x 10.3 x 7.1 厘米)" -> [(Height/Length, 2.7, cm), (Width, 10.3, cm), (Depth/Thick, 7.1, cm)]
+    """
+    if not dim_str:
+        return []
+    match = re.search(r'\(([\d\.]+) x ([\d\.]+) x ([\d\.]+)\s*(?:厘米|cm)\)', str(dim_str))
+    if not match:
+        return []
+    try:
+        return [
+            ('Height/Length', float(match.group(1)), 'cm'),
+            ('Width', float(match.group(2)), 'cm'),
+            ('Depth/Thick', float(match.group(3)), 'cm'),
+        ]
+    except ValueError:
+        return []
+
+
+_NPM_SIZE_RE = re.compile(r'(\w+?)(\d+\.?\d*)\s*(\w+)')
+
+
+def parse_npm_dimensions(size_str):
+    """解析 NPM 的尺寸字符串（如 "高12.3厘米 口径8.1厘米"）"""
+    if size_str is None or pd.isna(size_str):
+        return []
+    results = []
+    for type_raw, value_str, unit in _NPM_SIZE_RE.findall(str(size_str).strip()):
+        try:
+            value = Decimal(value_str)
+        except InvalidOperation:
+            continue
+
+        type_standard = type_raw
+        if '径长' in type_raw or '直径' in type_raw: type_standard = '直径'
+        elif '高' in type_raw: type_standard = '高'
+        elif '长' in type_raw: type_standard = '长'
+        elif '宽' in type_raw: type_standard = '宽'
+
+        results.append((type_standard, value, unit))
+    return results
+
+
+# 完整的中国朝代年份对照表 (BCE 用负数表示)
+DYNASTY_MAP = {
+    '夏': (-2070, -1600), '商': (-1600, -1046), '周': (-1046, -256),
+    '西周': (-1046, -771), '东周': (-770, -256), '春秋': (-770, -476),
+    '战国': (-475, -221), '秦': (-221, -207), '汉': (-202, 220),
+    '西汉': (-202, 9), '东汉': (25, 220),
+    '三国': (220, 280), '魏': (220, 266), '蜀': (221, 263), '吴': (229, 280),
+    '晋': (265, 420), '隋': (581, 618), '唐': (618, 907),
+    '宋': (960, 1279), '北宋': (960, 1127), '南宋': (1127, 1279),
+    '辽': (907, 1125), '金': (1115, 1234), '元': (1271, 1368),
+    '明': (1368, 1644), '清': (1644, 1912), '民国': (1912, datetime.now().year)
+}
+
+
+def map_dynasty_to_years(dynasty_str):
+    """将中文朝代名称转换为起始年份和结束年份。"""
+    if dynasty_str is None or pd.isna(dynasty_str): return (None, None)
+
+    match_year = re.search(r'公元(-?\d{3,4})年', str(dynasty_str))
+    if match_year:
+        year = int(match_year.group(1))
+        return (year, year)
+
+    clean_name = str(dynasty_str).strip().replace('代', '').replace('朝', '').replace('时期', '')
+
+    for key, years in DYNASTY_MAP.items():
+        if key in clean_name or clean_name in key:
+             return years
+
+    return (None, None)
+
+
+def npm_image_details(record):
+    """NPM 图像的附加信息：文件大小（MB → KB）与处理参数"""
+    size_mb = record.get('file_size_mb')
+    file_size_kb = Decimal(size_mb * 1024) if size_mb is not None and size_mb > 0 else None
+    return (file_size_kb, 'JPG', 'Unknown', Decimal('1.00'), datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+
+# --- 2. 来源配置 ---
+# file:              Excel 文件（相对项目根目录）
+# museum_code/name:  SOURCES 中的来源；museum_columns 给出时取表格第一行的值（缺失时用前两项）
+# lowercase_columns: 列名先转小写再映射
+# columns:           表格列名 → 统一字段名（Original_ID、Title_CN、...、Dimensions、Image_Link、Local_Path）
+# description_from_dimensions: 原始尺寸文字同时存入 Description_CN
+# clean:             取值清洗函数
+# parse_dimensions:  尺寸文字 → [(类型, 数值, 单位)]
+# parse_years:       Date_CN → (起始年, 结束年)；为 None 时留空（由 database/date_process.py 补算）
+# defaults:          字段为空时的默认值
+# image_required:    这些字段有任一非空时才写入图像记录
+# image_details:     record → (File_Size_KB, 格式, 分辨率, 压缩率, 处理时间)；为 None 时留空
+SOURCE_PROFILES = {
+    'MET': {
+        'file': 'database/data.xlsx',
+        'museum_code': 'MET',
+        'museum_name': '大都会艺术博物馆',
+        'museum_columns': None,
+        'lowercase_columns': False,
+        'columns': {
+            '馆藏编号（Object Number）': 'Original_ID',
+            '品名（Title）': 'Title_CN',
+            '材质（Medium）': 'Material',
+            '时代（Date）': 'Date_CN',
+            '所属部门（Curatorial Department）': 'Classification',
+            # 原始尺寸文本同时存入描述，防止正则解析失败导致信息丢失
+            '尺寸（Dimensions）': 'Dimensions',
+            '地区（Geography）': 'Geography',
+            '文化（Culture）': 'Culture',
+            '艺术家（Artist）': 'Artist',
+            '版权与来源（Credit Line）': 'Credit_Line',
+            '资源链接（Source URL）': 'Image_Link',
+            'Local Image Path': 'Local_Path',
+        },
+        'description_from_dimensions': True,
+        'clean': clean_text,
+        'parse_dimensions': parse_met_dimensions,
+        'parse_years': None,
+        'defaults': {},
+        'image_required': ('Image_Link', 'Local_Path'),
+        'image_details': None,
+    },
+    'NPM': {
+        'file': 'database_npm/内容清单_with_sizes.xlsx',
+        'museum_code': 'NPM',
+        'museum_name': '国立故宫博物院',
+        'museum_columns': ('museum_code', 'museum_name_cn'),
+        'lowercase_columns': True,
+        'columns': {
+            '标题': 'Title_CN', '文物编号': 'Original_ID', '分类': 'Classification',
+            '年代': 'Date_CN', '材质': 'Material', '尺寸': 'Dimensions',
+            '英文品名': 'Title_EN', '英文年代': 'Date_EN', '描述': 'Description_CN',
+            '页面链接': 'Page_Link', '图片链接': 'Image_Link',
+            '本地图片路径': 'Local_Path', '来源标题': 'museum_name_cn',
+            '来源': 'museum_code', '作者': 'Artist',
+            '图片大小(mb)': 'file_size_mb',
+            # Excel 中可能存在这些字段，也可能不存在
+            '地理': 'Geography', '文化': 'Culture', '版权说明': 'Credit_Line',
+        },
+        'description_from_dimensions': False,
+        'clean': clean_raw,
+        'parse_dimensions': parse_npm_dimensions,
+        'parse_years': map_dynasty_to_years,
+        # 地理与文化为空时统一为“中国”
+        'defaults': {'Geography': '中国', 'Culture': '中国'},
+        'image_required': ('Image_Link',),
+        'image_details': npm_image_details,
+    },
+}
+
+ARTIFACT_FIELDS = ['Original_ID', 'Title_CN', 'Title_EN', 'Description_CN', 'Classification',
+                   'Material', 'Date_CN', 'Date_EN']
+PROPERTY_FIELDS = ['Geography', 'Culture', 'Artist', 'Credit_Line', 'Page_Link']
+REQUIRED_FIELDS = ['Original_ID', 'Title_CN']
+# 搜索按原值筛选的字段：不论来源的清洗方式，写入前都去除两端空白
+TRIMMED_FIELDS = ['Material', 'Geography', 'Culture']
+
+INSERT_ARTIFACT_SQL = (
+    "INSERT INTO ARTIFACTS (Source_ID, Original_ID, Title_CN, Title_EN, Description_CN, "
+    "Classification, Material, Date_CN, Date_EN, Start_Year, End_Year, Row_Hash) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+)
+INSERT_PROPERTY_SQL = (
+    "INSERT INTO PROPERTIES (Artifact_PK, Geography, Culture, Artist, Credit_Line, Page_Link) "
+    "VALUES (%s, %s, %s, %s, %s, %s)"
+)
+INSERT_IMAGE_SQL = (
+    "INSERT INTO IMAGE_VERSIONS (Artifact_PK, Version_Type, Image_Link, Local_Path, File_Size_KB, "
+    "Processed_Format, Processed_Resolution, Compression_Ratio, Last_Processed_Time) "
+    "VALUES (%s, 'Original', %s, %s, %s, %s, %s, %s, %s)"
+)
+INSERT_DIMENSION_SQL = (
+    "INSERT INTO DIMENSIONS (Artifact_PK, Size_Type, Size_Value, Size_Unit) "
+    "VALUES (%s, %s, %s, %s)"
+)
+
+
+# --- 3. 读取与并行清洗 ---
+def _parse_source(path, profile):
+    df = pd.read_excel(path).astype(object)
+    columns = [str(col).strip() for col in df.columns]
+    df.columns = [col.lower() for col in columns] if profile['lowercase_columns'] else columns
+    df.rename(columns=profile['columns'], inplace=True)
+    for field in REQUIRED_FIELDS:
+        if field not in df.columns:
+            raise ValueError(f"缺少必需列: {field}")
+    required = REQUIRED_FIELDS + [c for c in (profile['museum_columns'] or ())[1:] if c in df.columns]
+    return df.dropna(subset=required)
+
+
+def read_source(profile, use_cache=None):
+    """
+    读取来源的 Excel 文件并映射列名，去掉缺少编号或标题的行
+    解析结果按文件内容与列名映射缓存（见 parse_cache.py），文件和映射都未变时跳过 Excel 解析
+    """
+    mapping_version = repr((sorted(profile['columns'].items()), profile['lowercase_columns'],
+                            profile['museum_columns'], REQUIRED_FIELDS))
+    df = load_frame(os.path.join(_ROOT, profile['file']), mapping_version,
+                    lambda path: _parse_source(path, profile), use_cache)
+    return df.astype(object)
+
+
+def row_hash(artifact, prop, image, dims):
+    """清洗后一行数据的内容哈希（不含每次导入都会变化的图像处理时间），用于增量导入判断是否有变化"""
+    payload = repr((artifact, prop, image[:-1] if image else None, dims))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def prepare_rows(source, chunk):
+    """
+    在工作进程中清洗一块数据，返回 [(文物字段, 属性字段, 图像字段或 None, 尺寸列表, 内容哈希)]
+    文物 / 属性 / 图像字段不含 Source_ID 与 Artifact_PK，由主进程写入时补上
+    """
+    profile = SOURCE_PROFILES[source]
+    clean = profile['clean']
+    defaults = profile['defaults']
+    rows = []
+    for record in chunk.to_dict('records'):
+        value = {field: clean(record.get(field)) for field in set(ARTIFACT_FIELDS + PROPERTY_FIELDS)
+                 | {'Dimensions', 'Image_Link', 'Local_Path'}}
+        for field, default in defaults.items():
+            if not value.get(field) or not str(value[field]).strip():
+                value[field] = default
+        for field in TRIMMED_FIELDS:
+            if isinstance(value[field], str):
+                value[field] = value[field].strip() or None
+        if profile['description_from_dimensions']:
+            value['Description_CN'] = value['Dimensions']
+
+        start_year, end_year = profile['parse_years'](value['Date_CN']) if profile['parse_years'] else (None, None)
+        artifact = tuple(value[f] for f in ARTIFACT_FIELDS) + (start_year, end_year)
+        prop = tuple(value[f] for f in PROPERTY_FIELDS)
+
+        image = None
+        if any(value[f] is not None for f in profile['image_required']):
+            details = profile['image_details'](record) if profile['image_details'] else (None,) * 5
+            image = (value['Image_Link'], value['Local_Path']) + tuple(details)
+
+        dims = profile['parse_dimensions'](value['Dimensions'])
+        rows.append((artifact, prop, image, dims, row_hash(artifact, prop, image, dims)))
+    return rows
+
+
+def _iter_prepared(source, df, workers, chunk_rows):
+    """按块清洗，保持原表顺序；workers <= 1 时在本进程内执行"""
+    chunks = [df.iloc[i:i + chunk_rows] for i in range(0, len(df), chunk_rows)]
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield prepare_rows(source, chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(prepare_rows, [source] * len(chunks), chunks)
+
+
+# --- 4. 写入 ---
+def get_or_create_source(conn, cursor, code, name, match_name=False):
+    """查找或创建来源，返回 Source_ID"""
+    if match_name:
+        cursor.execute("SELECT Source_ID FROM SOURCES WHERE Museum_Code = %s OR Museum_Name_CN = %s", (code, name))
+    else:
+        cursor.execute("SELECT Source_ID FROM SOURCES WHERE Museum_Code = %s", (code,))
+    result = cursor.fetchone()
+    if result:
+        print(f"找到现有Source_ID: {result[0]}")
+        return result[0]
+    cursor.execute("INSERT INTO SOURCES (Museum_Code, Museum_Name_CN) VALUES (%s, %s)", (code, name))
+    conn.commit()
+    print(f"创建新Source_ID: {cursor.lastrowid}")
+    return cursor.lastrowid
+
+
+def delete_source_rows(conn, cursor, source_id):
+    """删除该来源的旧数据（防止重复导入，但不影响其他来源的数据）"""
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    deleted = {}
+    for table in ('IMAGE_VERSIONS', 'PROPERTIES', 'DIMENSIONS'):
+        cursor.execute(f"""
+            DELETE t FROM {table} t
+            INNER JOIN ARTIFACTS a ON t.Artifact_PK = a.Artifact_PK
+            WHERE a.Source_ID = %s
+        """, (source_id,))
+        deleted[table] = cursor.rowcount
+    cursor.execute("DELETE FROM ARTIFACTS WHERE Source_ID = %s", (source_id,))
+    deleted['ARTIFACTS'] = cursor.rowcount
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    conn.commit()
+    print(f"已删除 {deleted['ARTIFACTS']} 条文物记录，{deleted['IMAGE_VERSIONS']} 条图像，"
+          f"{deleted['PROPERTIES']} 条属性，{deleted['DIMENSIONS']} 条尺寸记录。")
+
+
+def delete_artifacts(conn, cursor, artifact_ids):
+    """按主键删除文物及其属性、图像、尺寸记录"""
+    for i in range(0, len(artifact_ids), INSERT_BATCH):
+        chunk = artifact_ids[i:i + INSERT_BATCH]
+        placeholders = ', '.join(['%s'] * len(chunk))
+        for table in ('IMAGE_VERSIONS', 'PROPERTIES', 'DIMENSIONS', 'ARTIFACTS'):
+            cursor.execute(f"DELETE FROM {table} WHERE Artifact_PK IN ({placeholders})", chunk)
+        conn.commit()
+
+
+def ensure_row_hash_column(conn, cursor):
+    """確保 ARTIFACTS 表有内容哈希列 Row_Hash（增量导入使用）"""
+    try:
+        cursor.execute("ALTER TABLE ARTIFACTS ADD COLUMN Row_Hash CHAR(40) NULL COMMENT '导入时源数据行的内容哈希。'")
+        conn.commit()
+        print("列 Row_Hash 添加成功")
+    except Error as e:
+        if e.errno != 1060:  # 1060：列已存在
+            raise
+
+
+def _executemany(cursor, sql, rows):
+    for i in range(0, len(rows), INSERT_BATCH):
+        cursor.executemany(sql, rows[i:i + INSERT_BATCH])
+
+
+def _insert_children(cursor, pks, rows):
+    """按文物主键写入属性、图像、尺寸记录"""
+    _executemany(cursor, INSERT_PROPERTY_SQL, [(pk,) + row[1] for pk, row in zip(pks, rows)])
+    _executemany(cursor, INSERT_IMAGE_SQL,
+                 [(pk,) + row[2] for pk, row in zip(pks, rows) if row[2] is not None])
+    _executemany(cursor, INSERT_DIMENSION_SQL,
+                 [(pk,) + dim for pk, row in zip(pks, rows) for dim in row[3]])
+
+
+def write_rows(conn, cursor, source_id, rows):
+    """写入一块新文物（一个事务），返回写入的文物主键（与 rows 一一对应）"""
+    if not rows:
+        return []
+    cursor.execute("SELECT COALESCE(MAX(Artifact_PK), 0) FROM ARTIFACTS WHERE Source_ID = %s", (source_id,))
+    last_pk = cursor.fetchone()[0]
+
+    _executemany(cursor, INSERT_ARTIFACT_SQL, [(source_id,) + row[0] + (row[4],) for row in rows])
+
+    # 多行 INSERT 按行的顺序分配递增的主键，按主键顺序取回即与 rows 一一对应
+    cursor.execute("""
+        SELECT Artifact_PK FROM ARTIFACTS
+        WHERE Source_ID = %s AND Artifact_PK > %s
+        ORDER BY Artifact_PK
+    """, (source_id, last_pk))
+    pks = [row[0] for row in cursor.fetchall()]
+    if len(pks) != len(rows):
+        raise RuntimeError(f"取回的文物主键数（{len(pks)}）与写入的行数（{len(rows)}）不一致，是否有其他进程在导入同一来源？")
+
+    _insert_children(cursor, pks, rows)
+    conn.commit()
+    return pks
+
+
+# 增量导入时已变化文物的暂存表
+_CREATE_CHANGE_STAGING = """
+    CREATE TEMPORARY TABLE IF NOT EXISTS loader_changes (
+        Artifact_PK     INT PRIMARY KEY,
+        Title_CN        VARCHAR(255),
+        Title_EN        VARCHAR(255),
+        Description_CN  TEXT,
+        Classification  VARCHAR(100),
+        Material        VARCHAR(255),
+        Date_CN         VARCHAR(100),
+        Date_EN         VARCHAR(100),
+        Start_Year      INT,
+        End_Year        INT,
+        Row_Hash        CHAR(40),
+        Date_Changed    TINYINT NOT NULL DEFAULT 0
+    )
+"""
+
+_UPDATED_FIELDS = ARTIFACT_FIELDS[1:]
+
+
+def update_rows(conn, cursor, changes):
+    """
+    更新一块已变化的文物（一个事务），changes 为 [(Artifact_PK, row)]
+    文物字段经暂存表用一条 UPDATE ... JOIN 写回，主键不变（专辑收藏等引用保持有效）；
+    属性、尺寸与原始图像版本删除后按新数据重建。
+    来源配置不换算年份时（MET，由 date_process.py 补算）年代文字未变的文物保留已有年份
+    """
+    if not changes:
+        return
+    cursor.execute(_CREATE_CHANGE_STAGING)
+    cursor.execute("DELETE FROM loader_changes")
+    columns = ['Artifact_PK'] + _UPDATED_FIELDS + ['Start_Year', 'End_Year', 'Row_Hash']
+    _executemany(cursor,
+                 f"INSERT INTO loader_changes ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})",
+                 [(pk,) + row[0][1:] + (row[4],) for pk, row in changes])
+
+    cursor.execute("""
+        UPDATE loader_changes s
+        INNER JOIN ARTIFACTS a ON a.Artifact_PK = s.Artifact_PK
+        SET s.Date_Changed = NOT (a.Date_CN <=> s.Date_CN)
+    """)
+    assignments = [f"a.{field} = s.{field}" for field in _UPDATED_FIELDS] + [
+        f"a.{year} = IF(s.Date_Changed, s.{year}, COALESCE(s.{year}, a.{year}))" for year in ('Start_Year', 'End_Year')
+    ] + ["a.Row_Hash = s.Row_Hash"]
+    cursor.execute(f"""
+        UPDATE ARTIFACTS a
+        INNER JOIN loader_changes s ON s.Artifact_PK = a.Artifact_PK
+        SET {', '.join(assignments)}
+    """)
+
+    for table, condition in (('PROPERTIES', ''), ('DIMENSIONS', ''),
+                             ('IMAGE_VERSIONS', " WHERE t.Version_Type = 'Original'")):
+        cursor.execute(f"""
+            DELETE t FROM {table} t
+            INNER JOIN loader_changes s ON s.Artifact_PK = t.Artifact_PK{condition}
+        """)
+    _insert_children(cursor, [pk for pk, _ in changes], [row for _, row in changes])
+    conn.commit()
+
+
+def _write_with_retry(conn, write, items):
+    """
+    对 items 调用 write（一个事务，由 write 提交）；出错时回滚并二分重试，直到单行
+    返回 (写入成功的项, [(写入失败的项, 错误信息)])
+    """
+    try:
+        write(items)
+        return items, []
+    except Error as e:
+        conn.rollback()
+        if len(items) <= 1:
+            return [], [(item, str(e)) for item in items]
+    middle = len(items) // 2
+    first, first_failures = _write_with_retry(conn, write, items[:middle])
+    second, second_failures = _write_with_retry(conn, write, items[middle:])
+    return first + second, first_failures + second_failures
+
+
+def load_source(conn, cursor, source, workers, chunk_rows, delta=False, delete_missing=False, use_cache=None):
+    """
+    导入一个来源，返回统计 {'inserted', 'updated', 'unchanged', 'failed', 'deleted', 'missing', 'updated_ids'}
+    delta=False：删除该来源的旧数据后全部重新写入
+    delta=True： 按 Original_ID 与已有文物比对内容哈希，只新增新记录、更新有变化的记录；
+                 源文件中已不存在的文物在 delete_missing=True 时删除，否则只报告数量。
+                 同一编号出现多次时（全量导入按原样写入），源文件中第 k 次出现的行对应主键第 k 小的已有文物
+    """
+    profile = SOURCE_PROFILES[source]
+    started = time.perf_counter()
+    print(f"[{source}] 正在读取 {profile['file']} ...")
+    df = read_source(profile, use_cache)
+    print(f"[{source}] 准备导入 {len(df)} 条清洗后的数据。")
+
+    code, name = profile['museum_code'], profile['museum_name']
+    if profile['museum_columns'] and not df.empty:
+        code_column, name_column = profile['museum_columns']
+        if code_column in df.columns and pd.notna(df[code_column].iloc[0]):
+            code = df[code_column].iloc[0]
+        if name_column in df.columns and pd.notna(df[name_column].iloc[0]):
+            name = df[name_column].iloc[0]
+    source_id = get_or_create_source(conn, cursor, code, name, match_name=bool(profile['museum_columns']))
+
+    stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'failed': 0, 'deleted': 0, 'missing': 0, 'updated_ids': []}
+    existing = {}
+    if delta:
+        # 已有文物：Original_ID → [(Artifact_PK, Row_Hash)]，按主键顺序（即全量导入时在源文件中的先后顺序）
+        cursor.execute("""
+            SELECT Artifact_PK, Original_ID, Row_Hash FROM ARTIFACTS
+            WHERE Source_ID = %s ORDER BY Artifact_PK
+        """, (source_id,))
+        for pk, original_id, stored_hash in cursor.fetchall():
+            existing.setdefault(str(original_id), []).append((pk, stored_hash))
+    else:
+        delete_source_rows(conn, cursor, source_id)
+
+    # 源文件中每个编号已出现的次数：第 k 次出现的行与该编号的第 k 条已有文物比对
+    seen = {}
+    for rows in _iter_prepared(source, df, workers, chunk_rows):
+        new_rows, changes = [], []
+        for row in rows:
+            key = str(row[0][0])
+            occurrence = seen.get(key, 0)
+            seen[key] = occurrence + 1
+            matches = existing.get(key, ())
+            if occurrence >= len(matches):
+                new_rows.append(row)
+            elif matches[occurrence][1] != row[4]:
+                changes.append((matches[occurrence][0], row))
+            else:
+                stats['unchanged'] += 1
+        # 一块一个事务；出错时二分重试，只跳过真正出错的行
+        new_rows, failures = _write_with_retry(
+            conn, lambda part: write_rows(conn, cursor, source_id, part), new_rows)
+        changes, change_failures = _write_with_retry(
+            conn, lambda part: update_rows(conn, cursor, part), changes)
+        for row, message in failures + [(row, message) for (_, row), message in change_failures]:
+            print(f"[{source}] 编号 {row[0][0]} 导入失败，已跳过: {message}")
+        stats['failed'] += len(failures) + len(change_failures)
+        stats['inserted'] += len(new_rows)
+        stats['updated'] += len(changes)
+        stats['updated_ids'].extend(pk for pk, _ in changes)
+        done = stats['inserted'] + stats['updated'] + stats['unchanged'] + stats['failed']
+        print(f"[{source}] 已处理 {done}/{len(df)} 条（{done / (time.perf_counter() - started):.0f} 条/秒）")
+
+    if stats['failed']:
+        print(f"[{source}] 共 {stats['failed']} 条导入失败（见上方逐条信息）")
+    if delta:
+        # 已有文物中多于源文件出现次数的部分（包括编号已不存在的）视为已删除
+        vanished = [pk for key, matches in existing.items() for pk, _ in matches[seen.get(key, 0):]]
+        if delete_missing:
+            delete_artifacts(conn, cursor, vanished)
+            stats['deleted'] = len(vanished)
+        else:
+            stats['missing'] = len(vanished)
+        print(f"[{source}] 新增 {stats['inserted']} 条，更新 {stats['updated']} 条，未变 {stats['unchanged']} 条，"
+              + (f"删除 {stats['deleted']} 条" if delete_missing else f"源文件中已不存在 {stats['missing']} 条（未删除）"))
+    return stats
+
+
+def load_sources(sources=None, workers=None, chunk_rows=None, delta=False, delete_missing=False, use_cache=None):
+    """导入指定来源（默认全部），结束后补齐派生数据并让应用的搜索缓存失效"""
+    sources = sources or list(SOURCE_PROFILES)
+    workers = workers or os.cpu_count() or 1
+    chunk_rows = chunk_rows or CHUNK_ROWS
+
+    conn = None
+    try:
+        conn = mysql.connector.connect(**DB_CONFIG)
+        cursor = conn.cursor()
+        print("数据库连接成功")
+        ensure_row_hash_column(conn, cursor)
+
+        total = 0
+        failed = 0
+        updated_ids = []
+        for source in sources:
+            stats = load_source(conn, cursor, source, workers, chunk_rows, delta, delete_missing, use_cache)
+            total += stats['inserted'] + stats['updated']
+            failed += stats['failed']
+            updated_ids.extend(stats['updated_ids'])
+
+        # 全部完成后补齐年代分类列、文化/地理维度表，刷新浏览页汇总并提交事务（同时让应用的搜索缓存失效）
+        # 增量导入中被更新的文物年代文字可能已变化，重新分类
+        for i in range(0, len(updated_ids), INSERT_BATCH):
+            update_era_columns(cursor, updated_ids[i:i + INSERT_BATCH])
+        update_era_columns(cursor, only_missing=True)
+        sync_lookup_ids(cursor, only_missing=True)
+        refresh_browse_summaries(cursor)
+        bump_catalogue_version(cursor)
+        conn.commit()
+        print(f"\n任务完成！共写入 {total} 条文物数据（{', '.join(sources)}）"
+              + (f"，{failed} 条失败。" if failed else "。"))
+        cursor.close()
+
+    except Error as e:
+        print(f"数据库错误: {e}")
+    except Exception as e:
+        print(f"发生错误: {e}")
+    finally:
+        if conn and conn.is_connected():
+            conn.close()
+            print("数据库连接已关闭")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='导入馆藏数据（按来源配置）')
+    parser.add_argument('sources', nargs='*', choices=list(SOURCE_PROFILES), metavar='SOURCE',
+                        help=f"要导入的来源（{' / '.join(SOURCE_PROFILES)}，默认全部）")
+    parser.add_argument('--workers', type=int, default=None, help='清洗数据的进程数（默认 CPU 核数，1 为不使用进程池）')
+    parser.add_argument('--chunk-rows', type=int, default=None, help=f'每块的行数（默认 {CHUNK_ROWS}）')
+    parser.add_argument('--delta', action='store_true',
+                        help='增量导入：只新增新记录、更新内容有变化的记录，已有文物的主键保持不变')
+    parser.add_argument('--delete-missing', action='store_true',
+                        help='增量导入时删除源文件中已不存在的文物（默认只报告数量）')
+    parser.add_argument('--no-cache', action='store_true', help='不使用表格解析缓存，重新解析 Excel')
+    args = parser.parse_args()
+    load_sources(args.sources, args.workers, args.chunk_rows, args.delta, args.delete_missing,
+                 use_cache=False if args.no_cache else None)
@@ -4,6 +4,8 @@
 数据库名称: project
 """
 
+import os
+
 # 表名配置（新结构）
 TABLES = {
     'sources': 'SOURCES',
@@ -11,7 +13,10 @@ TABLES = {
     'dimensions': 'DIMENSIONS',
     'properties': 'PROPERTIES',
     'image_versions': 'IMAGE_VERSIONS',
-    'logs': 'LOGS'
+    'logs': 'LOGS',
+    'cultures': 'CULTURES',
+    'geographies': 'GEOGRAPHIES',
+    'dynasties': 'DYNASTIES'
 }
 
 # 字段名配置（新结构）
@@ -35,7 +40,11 @@ FIELDS = {
         'date_cn': 'Date_CN',
         'date_en': 'Date_EN',
         'start_year': 'Start_Year',
-        'end_year': 'End_Year'
+        'end_year': 'End_Year',
+        'effective_end_year': 'Effective_End_Year',
+        'shuffle_key': 'Shuffle_Key',
+        'era_system': 'Era_System',
+        'era_bucket': 'Era_Bucket'
     },
     # DIMENSIONS 表字段
     'dimension': {
@@ -53,7 +62,25 @@ FIELDS = {
         'culture': 'Culture',
         'artist': 'Artist',
         'credit_line': 'Credit_Line',
-        'page_link': 'Page_Link'
+        'page_link': 'Page_Link',
+        'culture_id': 'Culture_ID',
+        'geography_id': 'Geography_ID'
+    },
+    # CULTURES 表字段（文化维度表）
+    'culture': {
+        'id': 'Culture_ID',
+        'name': 'Culture_Name'
+    },
+    # DYNASTIES 表字段（朝代 → 年份区间）
+    'dynasty': {
+        'name': 'Dynasty_Name',
+        'start_year': 'Start_Year',
+        'end_year': 'End_Year'
+    },
+    # GEOGRAPHIES 表字段（地理维度表）
+    'geography': {
+        'id': 'Geography_ID',
+        'name': 'Geography_Name'
     },
     # IMAGE_VERSIONS 表字段
     'image': {
@@ -70,6 +97,25 @@ FIELDS = {
     }
 }
 
+# 维度表配置：PROPERTIES 中的文本列 → 维度表（稳定的整数 ID）及 PROPERTIES 上的外键列
+# 见 sql/database_migration_dimension_tables.sql 与 lookup_tables.py
+LOOKUP_DIMENSIONS = {
+    'culture': {
+        'table': TABLES['cultures'],
+        'id': FIELDS['culture']['id'],
+        'name': FIELDS['culture']['name'],
+        'source': FIELDS['property']['culture'],
+        'fk': FIELDS['property']['culture_id']
+    },
+    'geography': {
+        'table': TABLES['geographies'],
+        'id': FIELDS['geography']['id'],
+        'name': FIELDS['geography']['name'],
+        'source': FIELDS['property']['geography'],
+        'fk': FIELDS['property']['geography_id']
+    }
+}
+
 # 关联关系配置
 JOINS = {
     'sources': {
@@ -159,3 +205,31 @@ QUERIES = {
         'where': f"d.{FIELDS['dimension']['artifact_id']} = %s"
     }
 }
+
+# 搜索配置
+# mode: 'like'（默认，逐字段 LIKE 模糊匹配，无需额外索引）
+#       'fulltext'（使用 ngram FULLTEXT 索引，需先执行 sql/database_fulltext_search.sql）
+# relevance_candidates: 相关度排序时取回文本并打分的候选条数（按标题命中预排序后的前 N 条），
+#       超出部分按预排序顺序直接由 SQL 分页
+SEARCH_CONFIG = {
+    'mode': os.getenv('SEARCH_MODE', 'like'),
+    'relevance_candidates': int(os.getenv('SEARCH_RELEVANCE_CANDIDATES', 600))
+}
+
+# FULLTEXT 索引覆盖的字段（须与 sql/database_fulltext_search.sql 中的索引定义完全一致）
+FULLTEXT_INDEXES = {
+    'artifacts': [
+        FIELDS['artifact']['title_cn'],
+        FIELDS['artifact']['title_en'],
+        FIELDS['artifact']['description_cn'],
+        FIELDS['artifact']['date_cn'],
+        FIELDS['artifact']['date_en'],
+        FIELDS['artifact']['material'],
+        FIELDS['artifact']['classification']
+    ],
+    'properties': [
+        FIELDS['property']['culture'],
+        FIELDS['property']['artist'],
+        FIELDS['property']['geography']
+    ]
+}
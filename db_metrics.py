@@ -0,0 +1,198 @@
+"""
+请求级数据库与模板渲染耗时统计
+- 包装游标的 execute / executemany / callproc / fetch*，统计每个请求的查询次数与数据库耗时
+- 通过 Flask 的模板信号统计模板渲染耗时
+- 在响应中输出 Server-Timing 头（浏览器开发者工具可直接查看）
+- 数据库耗时超过阈值的请求会连同耗时最长的 SQL 一起写入日志
+
+环境变量：
+    SERVER_TIMING_ENABLED   是否输出 Server-Timing 头（默认 1）
+    DB_SLOW_REQUEST_MS      慢请求阈值，单位毫秒（默认 200，设为 0 关闭慢请求日志）
+    DB_SLOW_LOG_QUERIES     慢请求日志中最多列出的 SQL 条数（默认 10）
+"""
+
+import os
+import re
+import time
+
+from flask import g, has_app_context, request, before_render_template, template_rendered
+
+METRICS_CONFIG = {
+    'server_timing': os.getenv('SERVER_TIMING_ENABLED', '1') == '1',
+    'slow_request_ms': float(os.getenv('DB_SLOW_REQUEST_MS', 200)),
+    'slow_log_queries': int(os.getenv('DB_SLOW_LOG_QUERIES', 10)),
+}
+
+# 每个请求最多保留的 SQL 明细条数（计数不受限制）
+_MAX_RECORDED_QUERIES = 100
+# 日志中单条 SQL 的最大长度
+_MAX_SQL_LENGTH = 500
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class RequestMetrics:
+    """单个请求的统计数据"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        self.template_time = 0.0
+        self.queries = []
+        self._template_started = None
+
+    def add_query(self, sql, elapsed):
+        self.query_count += 1
+        self.db_time += elapsed
+        if len(self.queries) < _MAX_RECORDED_QUERIES:
+            self.queries.append([_compact_sql(sql), elapsed])
+
+    def add_fetch(self, elapsed):
+        """fetch 的耗时计入数据库时间，并累加到最近一条查询上"""
+        self.db_time += elapsed
+        if self.queries:
+            self.queries[-1][1] += elapsed
+
+
+def _compact_sql(sql):
+    if isinstance(sql, (bytes, bytearray)):
+        sql = sql.decode('utf-8', errors='replace')
+    sql = _WHITESPACE_RE.sub(' ', str(sql)).strip()
+    if len(sql) > _MAX_SQL_LENGTH:
+        sql = sql[:_MAX_SQL_LENGTH] + '...'
+    return sql
+
+
+def current_metrics():
+    """返回当前请求的统计对象，不在请求上下文中时返回 None"""
+    if not has_app_context():
+        return None
+    return g.get('_db_metrics')
+
+
+def record_pool_wait(elapsed):
+    """记录从连接池借出连接所花的时间"""
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.pool_wait += elapsed
+
+
+class InstrumentedCursor:
+    """计时游标：对外行为与原游标一致，只额外记录耗时"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def _timed(self, sql, func, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            metrics = current_metrics()
+            if metrics is not None:
+                metrics.add_query(sql, time.perf_counter() - start)
+
+    def _timed_fetch(self, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            metrics = current_metrics()
+            if metrics is not None:
+                metrics.add_fetch(time.perf_counter() - start)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        return self._timed(operation, self._cursor.execute, operation, params, *args, **kwargs)
+
+    def executemany(self, operation, seq_params):
+        return self._timed(operation, self._cursor.executemany, operation, seq_params)
+
+    def callproc(self, procname, args=()):
+        return self._timed(f"CALL {procname}", self._cursor.callproc, procname, args)
+
+    def fetchone(self):
+        return self._timed_fetch(self._cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._timed_fetch(self._cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._timed_fetch(self._cursor.fetchall)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def _on_before_render(sender, template, context, **extra):
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics._template_started = time.perf_counter()
+
+
+def _on_template_rendered(sender, template, context, **extra):
+    metrics = current_metrics()
+    if metrics is not None and metrics._template_started is not None:
+        metrics.template_time += time.perf_counter() - metrics._template_started
+        metrics._template_started = None
+
+
+def _start_request():
+    g._db_metrics = RequestMetrics()
+
+
+def _finish_request(response):
+    metrics = g.get('_db_metrics')
+    if metrics is None:
+        return response
+
+    total_ms = (time.perf_counter() - metrics.started) * 1000
+    db_ms = metrics.db_time * 1000
+
+    if METRICS_CONFIG['server_timing']:
+        timings = [
+            f'db;dur={db_ms:.1f};desc="{metrics.query_count} queries"',
+            f'pool;dur={metrics.pool_wait * 1000:.1f}',
+            f'tpl;dur={metrics.template_time * 1000:.1f}',
+            f'total;dur={total_ms:.1f}',
+        ]
+        response.headers.add('Server-Timing', ', '.join(timings))
+
+    threshold = METRICS_CONFIG['slow_request_ms']
+    if threshold > 0 and db_ms >= threshold:
+        _log_slow_request(metrics, db_ms, total_ms)
+
+    return response
+
+
+def _log_slow_request(metrics, db_ms, total_ms):
+    from flask import current_app
+
+    slowest = sorted(metrics.queries, key=lambda q: q[1], reverse=True)
+    slowest = slowest[:METRICS_CONFIG['slow_log_queries']]
+    lines = [
+        f"慢请求 {request.method} {request.full_path.rstrip('?')}: "
+        f"数据库 {db_ms:.1f}ms / 总计 {total_ms:.1f}ms, {metrics.query_count} 条查询, "
+        f"模板 {metrics.template_time * 1000:.1f}ms"
+    ]
+    for sql, elapsed in slowest:
+        lines.append(f"  {elapsed * 1000:8.1f}ms  {sql}")
+    current_app.logger.warning('\n'.join(lines))
+
+
+def init_app(app):
+    """注册请求钩子与模板渲染信号"""
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    before_render_template.connect(_on_before_render, app)
+    template_rendered.connect(_on_template_rendered, app)
@@ -0,0 +1,169 @@
+"""
+数据库连接池
+为 Flask 应用提供有界的 MySQL 连接池：
+- 每个请求最多借出一条连接，绑定在 flask.g 上，请求结束（teardown）时统一归还
+- 借出前做健康检查（ping），连接失效时自动重连
+- 池大小、等待超时等参数可通过环境变量配置
+
+环境变量：
+    DB_POOL_NAME           连接池名称（默认 relics_pool）
+    DB_POOL_SIZE           连接池大小（默认 8，mysql-connector 上限为 32）
+    DB_POOL_TIMEOUT        池耗尽时等待空闲连接的秒数（默认 5）
+    DB_POOL_PING_ATTEMPTS  健康检查失败时的重连次数（默认 2）
+"""
+
+import os
+import time
+import threading
+
+from flask import g, has_app_context
+from mysql.connector import Error, errors, pooling
+
+import db_metrics
+
+POOL_CONFIG = {
+    'pool_name': os.getenv('DB_POOL_NAME', 'relics_pool'),
+    'pool_size': int(os.getenv('DB_POOL_SIZE', 8)),
+    'timeout': float(os.getenv('DB_POOL_TIMEOUT', 5)),
+    'ping_attempts': int(os.getenv('DB_POOL_PING_ATTEMPTS', 2)),
+}
+
+# 借出连接时轮询空闲连接的间隔（秒）
+_POLL_INTERVAL = 0.05
+
+_pool = None
+_pool_lock = threading.Lock()
+_db_config = None
+
+
+class RequestConnection:
+    """
+    请求级连接的包装对象
+    路由和辅助函数仍按原来的写法调用 close()，但请求内共享同一条连接，
+    因此这里的 close() 不做任何事，真正的归还由 teardown 完成。
+    cursor() 返回计时游标（见 db_metrics），其余属性和方法全部委托给底层的池化连接。
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, *args, **kwargs):
+        return db_metrics.InstrumentedCursor(self._conn.cursor(*args, **kwargs))
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def init_app(app, db_config):
+    """注册连接池配置与请求结束时的归还钩子"""
+    global _db_config
+    _db_config = dict(db_config)
+    app.teardown_appcontext(release_request_connection)
+
+
+def get_pool():
+    """获取（必要时创建）连接池，数据库不可用时返回 None"""
+    global _pool
+    if _pool is not None:
+        return _pool
+
+    with _pool_lock:
+        if _pool is None:
+            try:
+                _pool = pooling.MySQLConnectionPool(
+                    pool_name=POOL_CONFIG['pool_name'],
+                    pool_size=POOL_CONFIG['pool_size'],
+                    pool_reset_session=True,
+                    **_db_config
+                )
+            except Error as e:
+                print(f"Error creating MySQL connection pool: {e}")
+                return None
+    return _pool
+
+
+def _ensure_healthy(conn):
+    """借出前的健康检查：连接断开时按配置次数重连"""
+    try:
+        conn.ping(reconnect=True, attempts=POOL_CONFIG['ping_attempts'], delay=0)
+        return True
+    except Error as e:
+        print(f"MySQL connection health check failed: {e}")
+        return False
+
+
+def checkout_connection():
+    """
+    从连接池借出一条健康的连接
+    池耗尽时最多等待 DB_POOL_TIMEOUT 秒；失败返回 None。
+    调用方负责 close()（即归还到池中）。
+    """
+    pool = get_pool()
+    if pool is None:
+        return None
+
+    deadline = time.monotonic() + POOL_CONFIG['timeout']
+    while True:
+        try:
+            conn = pool.get_connection()
+        except errors.PoolError:
+            if time.monotonic() >= deadline:
+                print("Error connecting to MySQL: connection pool exhausted")
+                return None
+            time.sleep(_POLL_INTERVAL)
+            continue
+        except Error as e:
+            print(f"Error connecting to MySQL: {e}")
+            return None
+
+        if _ensure_healthy(conn):
+            return conn
+
+        # 重连失败：归还这条连接，不再重试，交由调用方按“无法连接”处理
+        try:
+            conn.close()
+        except Error:
+            pass
+        return None
+
+
+def get_request_connection():
+    """
+    获取当前请求绑定的连接
+    同一请求内多次调用返回同一条连接；不在请求上下文中时（启动初始化、后台线程）
+    直接借出一条池化连接，由调用方 close() 归还。
+    """
+    if not has_app_context():
+        return checkout_connection()
+
+    wrapper = g.get('_db_conn')
+    if wrapper is None:
+        start = time.perf_counter()
+        conn = checkout_connection()
+        db_metrics.record_pool_wait(time.perf_counter() - start)
+        if conn is None:
+            return None
+        wrapper = RequestConnection(conn)
+        g._db_conn = wrapper
+    return wrapper
+
+
+def release_request_connection(exc=None):
+    """teardown 钩子：回滚未提交的事务并把连接归还到池中"""
+    wrapper = g.pop('_db_conn', None)
+    if wrapper is None:
+        return
+
+    conn = wrapper._conn
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+    except Error:
+        pass
+    try:
+        conn.close()
+    except Error as e:
+        print(f"Error returning connection to pool: {e}")
@@ -0,0 +1,233 @@
+"""
+年代分类
+根据 Date_CN 文字把文物归入 (纪年体系, 年代分类)：
+- 东方纪年：宋 / 明 / 清 / 元 / 唐 / 漢 / 其他東
+- 西方纪年：古代 / 中世纪 / 近世 / 近代 / 现代 / 其他西
+分类结果在写入时保存到 ARTIFACTS.Era_System / Era_Bucket（带索引），
+年代浏览与搜索的年代筛选直接按列查询，不再逐行在 Python 中分类。
+"""
+
+import os
+import re
+from functools import lru_cache
+
+from mysql.connector import Error
+
+ERA_CLASSIFIER_CONFIG = {
+    'cache_size': int(os.getenv('ERA_CLASSIFIER_CACHE', 4096)),
+}
+
+
+# 1. 轉換工具：把「十九世紀」變成 19
+_CN_DIGITS = {'一':1, '二':2, '三':3, '四':4, '五':5, '六':6, '七':7, '八':8, '九':9, '十':10}
+
+def chinese_to_int_century(cn_str):
+    if not cn_str: return 0
+    s = cn_str.replace('世紀', '').replace('世纪', '').strip()
+    if not s: return 0
+    if s.isdigit(): return int(s)
+    
+    # 簡單處理：十, 十九, 二十, 二十一
+    if len(s) == 1: return _CN_DIGITS.get(s, 0)
+    if len(s) == 2:
+        if s[0] == '十': return 10 + _CN_DIGITS.get(s[1], 0)
+        if s[1] == '十': return _CN_DIGITS.get(s[0], 0) * 10
+    if len(s) == 3:
+        return _CN_DIGITS.get(s[0], 0) * 10 + _CN_DIGITS.get(s[2], 0)
+    return 0
+
+# 2. 東方朝代關鍵字
+# 1. 關鍵字清單：加入更多特徵
+EAST_DYNASTY_KEYWORDS = [
+    "宋", "北宋", "南宋", "明", "清", "元", "唐", "漢", "汉", "秦", "晉", "晋", "隋",
+    "康熙", "雍正", "乾隆", "嘉慶", "道光", "咸豐", "同治", "光緒", "宣統", "錢", "銭"
+]
+
+# 東方年代分類關鍵字 → (優先級, 分類)：同一字串命中多個時取優先級最小者
+# 宋 > 清（含年號）> 明 > 元 > 唐 > 漢
+EAST_BUCKET_KEYWORDS = {
+    "宋": (0, "宋"),
+    "康熙": (1, "清"), "雍正": (1, "清"), "乾隆": (1, "清"), "嘉慶": (1, "清"), "道光": (1, "清"),
+    "咸豐": (1, "清"), "同治": (1, "清"), "光緒": (1, "清"), "清": (1, "清"),
+    "明": (2, "明"),
+    "元": (3, "元"),
+    "唐": (4, "唐"),
+    "漢": (5, "漢"), "汉": (5, "漢"),
+}
+
+
+def _keyword_pattern(keywords):
+    """把關鍵字清單編譯成一個交替正則（長詞優先），一次掃描即可找出全部命中"""
+    return re.compile('|'.join(re.escape(k) for k in sorted(set(keywords), key=len, reverse=True)))
+
+
+# 預編譯的匹配模式（模組載入時編譯一次）
+_EAST_KEYWORD_RE = _keyword_pattern(EAST_DYNASTY_KEYWORDS)
+_EAST_BUCKET_RE = _keyword_pattern(EAST_BUCKET_KEYWORDS)
+_BCE_RE = re.compile(r"公元前|BCE|BC")
+_CENTURY_RE = re.compile(r"(\d{1,2})\s*世[紀纪]")
+_CN_CENTURY_RE = re.compile(r"([一二三四五六七八九十]+)\s*(世紀|世纪)")
+_YEAR_RE = re.compile(r"(\d{3,4})")
+
+
+def is_east_chronology(date_cn: str) -> bool:
+    """
+    含東方朝代或年號關鍵字即為東方纪年，否則（公元前、世紀、純數字年份等）歸西方
+    """
+    if not date_cn:
+        return False
+    return _EAST_KEYWORD_RE.search(str(date_cn)) is not None
+
+def normalize_east_bucket(date_cn: str) -> str:
+    if not date_cn:
+        return "其他東"
+    hits = [EAST_BUCKET_KEYWORDS[k] for k in _EAST_BUCKET_RE.findall(str(date_cn))]
+    if hits:
+        return min(hits)[1]
+    # 針對「購錢」或無法判定的故宮文物保底
+    return "其他東"
+
+def _century_bucket(cent):
+    if cent <= 4:
+        return "古代"
+    if 5 <= cent <= 15:
+        return "中世纪"
+    if 16 <= cent <= 18:
+        return "近世"
+    if cent == 19:
+        return "近代"
+    return "现代"
+
+def _year_bucket(y):
+    if y <= 500:
+        return "古代"
+    if 501 <= y <= 1500:
+        return "中世纪"
+    if 1501 <= y <= 1800:
+        return "近世"
+    if 1801 <= y <= 1900:
+        return "近代"
+    return "现代"
+
+def normalize_west_bucket(date_cn: str) -> str:
+    """
+    西方纪年桶：古代 / 中世纪 / 近世 / 近代 / 现代 / 其他西
+    按最早年份或世纪粗分。
+    """
+    if not date_cn:
+        return "其他西"
+    s = date_cn.strip()
+
+    # 1. BCE / 公元前：当成古代
+    if _BCE_RE.search(s):
+        return "古代"
+
+    # 2. 数字世纪：19世纪 / 20世纪
+    m_cent = _CENTURY_RE.search(s)
+    if m_cent:
+        return _century_bucket(int(m_cent.group(1)))
+
+    # 3. 中文数字世纪：十二世纪 / 二十世纪
+    m_cn_cent = _CN_CENTURY_RE.search(s)
+    if m_cn_cent:
+        cent = chinese_to_int_century(m_cn_cent.group(1))
+        if cent > 0:
+            return _century_bucket(cent)
+        return "其他西"
+
+    # 4. 具体年份：1707, 1893, 410 等
+    m_year = _YEAR_RE.search(s)
+    if m_year:
+        return _year_bucket(int(m_year.group(1)))
+
+    return "其他西"
+
+
+@lru_cache(maxsize=ERA_CLASSIFIER_CONFIG['cache_size'])
+def _classify(date_cn):
+    if is_east_chronology(date_cn):
+        return ("东方纪年", normalize_east_bucket(date_cn))
+    return ("西方纪年", normalize_west_bucket(date_cn))
+
+
+def normalize_era_from_date_cn(date_cn: str):
+    """
+    返回 (system, bucket)
+    system: 东方纪年 / 西方纪年
+    bucket: 东方: 宋/明/清/元/唐/漢/其他東
+            西方: 古代/中世纪/近世/近代/现代/其他西
+    Date_CN 的取值重复度很高，结果按原始字符串缓存（有界 LRU，ERA_CLASSIFIER_CACHE 条）
+    """
+    if not date_cn:
+        return ("西方纪年", "其他西")
+    return _classify(date_cn)
+
+
+def classify_many(dates):
+    """
+    批量分类：返回与 dates 等长的 (system, bucket) 列表
+    相同的年代文字只分类一次
+    """
+    results = {}
+    for date_cn in dates:
+        if date_cn not in results:
+            results[date_cn] = normalize_era_from_date_cn(date_cn)
+    return [results[date_cn] for date_cn in dates]
+
+
+# MySQL 错误码：列不存在
+ER_BAD_FIELD_ERROR = 1054
+# 批量更新时每条 UPDATE 最多包含的 ID 数
+_UPDATE_BATCH = 1000
+
+
+def era_columns(date_cn):
+    """返回写入 Era_System / Era_Bucket 的值；年代文字为空时为 (None, None)"""
+    if not date_cn or not str(date_cn).strip():
+        return (None, None)
+    return normalize_era_from_date_cn(str(date_cn).strip())
+
+
+def update_era_columns(cursor, artifact_ids=None, only_missing=False):
+    """
+    重新计算文物的 Era_System / Era_Bucket 并写回（由调用方 commit）
+    artifact_ids: 只处理这些文物（导入后调用）；为 None 时处理全部文物
+    only_missing: 只处理尚未分类的文物（导入脚本与启动检查使用）
+    返回更新的文物数；年代列尚未创建时打印提示并返回 0
+    """
+    conditions = []
+    params = []
+    if artifact_ids is not None:
+        artifact_ids = [int(i) for i in artifact_ids if i is not None]
+        if not artifact_ids:
+            return 0
+        conditions.append(f"Artifact_PK IN ({', '.join(['%s'] * len(artifact_ids))})")
+        params.extend(artifact_ids)
+    if only_missing:
+        conditions.append("Era_Bucket IS NULL AND Date_CN IS NOT NULL AND Date_CN != ''")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+    try:
+        cursor.execute(f"SELECT Artifact_PK, Date_CN FROM ARTIFACTS {where}", params)
+        rows = cursor.fetchall()
+    except Error as e:
+        if e.errno != ER_BAD_FIELD_ERROR:
+            raise
+        print("ARTIFACTS 表缺少 Era_System / Era_Bucket 列，请执行 sql/database_migration_era_columns.sql")
+        return 0
+
+    # 按分类结果分组，每组用 WHERE Artifact_PK IN (...) 批量更新
+    groups = {}
+    for row in rows:
+        pk, date_cn = (row['Artifact_PK'], row['Date_CN']) if isinstance(row, dict) else row
+        groups.setdefault(era_columns(date_cn), []).append(pk)
+
+    for (system, bucket), pks in groups.items():
+        for i in range(0, len(pks), _UPDATE_BATCH):
+            chunk = pks[i:i + _UPDATE_BATCH]
+            cursor.execute(
+                f"UPDATE ARTIFACTS SET Era_System = %s, Era_Bucket = %s "
+                f"WHERE Artifact_PK IN ({', '.join(['%s'] * len(chunk))})",
+                [system, bucket] + chunk
+            )
+    return len(rows)
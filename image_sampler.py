@@ -0,0 +1,154 @@
+"""
+首页背景图片采样器
+首页每次访问都需要随机 6 张图片（随机浏览 / 文化 / 地理 / 年代四类），
+原先每类都用 ORDER BY RAND() 对整个连接结果排序。这里改为：
+- 后台线程定期（默认 5 分钟）流式读取各类别的图片路径，用蓄水池抽样保留固定大小的候选池
+- 请求时直接从内存候选池中随机抽取，不访问数据库
+- 导入或替换图像后可调用 request_refresh() 立即触发一次刷新
+
+环境变量：
+    HOMEPAGE_SAMPLER_REFRESH   刷新间隔秒数（默认 300）
+    HOMEPAGE_SAMPLER_POOL      每个类别的候选池大小（默认 500）
+"""
+
+import os
+import random
+import threading
+
+from mysql.connector import Error
+
+SAMPLER_CONFIG = {
+    'refresh_seconds': int(os.getenv('HOMEPAGE_SAMPLER_REFRESH', 300)),
+    'pool_size': int(os.getenv('HOMEPAGE_SAMPLER_POOL', 500)),
+}
+
+# 各类别的候选图片查询（不排序，流式读取后做蓄水池抽样）
+CATEGORY_QUERIES = {
+    'random': """
+        SELECT iv.Local_Path
+        FROM IMAGE_VERSIONS iv
+        INNER JOIN ARTIFACTS a ON iv.Artifact_PK = a.Artifact_PK
+        WHERE iv.Local_Path IS NOT NULL AND iv.Local_Path != ''
+    """,
+    'culture': """
+        SELECT DISTINCT iv.Local_Path
+        FROM IMAGE_VERSIONS iv
+        INNER JOIN PROPERTIES p ON iv.Artifact_PK = p.Artifact_PK
+        WHERE iv.Local_Path IS NOT NULL AND iv.Local_Path != ''
+            AND p.Culture IS NOT NULL AND p.Culture != ''
+    """,
+    'geography': """
+        SELECT DISTINCT iv.Local_Path
+        FROM IMAGE_VERSIONS iv
+        INNER JOIN PROPERTIES p ON iv.Artifact_PK = p.Artifact_PK
+        WHERE iv.Local_Path IS NOT NULL AND iv.Local_Path != ''
+            AND p.Geography IS NOT NULL AND p.Geography != ''
+    """,
+    'era': """
+        SELECT DISTINCT iv.Local_Path
+        FROM IMAGE_VERSIONS iv
+        INNER JOIN ARTIFACTS a ON iv.Artifact_PK = a.Artifact_PK
+        WHERE iv.Local_Path IS NOT NULL AND iv.Local_Path != ''
+            AND a.Date_CN IS NOT NULL AND a.Date_CN != ''
+    """,
+}
+
+# 流式读取时每批取回的行数
+_FETCH_BATCH = 1000
+# 首次加载失败后的重试间隔（秒）
+_RETRY_SECONDS = 30
+
+
+def reservoir_sample(rows, size, rng=random):
+    """蓄水池抽样（Algorithm R）：单次遍历，从任意长度的可迭代对象中均匀抽取 size 个元素"""
+    reservoir = []
+    for i, item in enumerate(rows):
+        if i < size:
+            reservoir.append(item)
+        else:
+            j = rng.randrange(i + 1)
+            if j < size:
+                reservoir[j] = item
+    return reservoir
+
+
+class ImageSampler:
+    """
+    按类别维护内存中的图片候选池
+    get_connection: 返回数据库连接的函数（由调用方 close 归还）
+    normalize: 图片路径规范化函数
+    """
+
+    def __init__(self, get_connection, normalize, pool_size=None, refresh_seconds=None):
+        self._get_connection = get_connection
+        self._normalize = normalize
+        self.pool_size = pool_size or SAMPLER_CONFIG['pool_size']
+        self.refresh_seconds = refresh_seconds or SAMPLER_CONFIG['refresh_seconds']
+        self._pools = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def _stream_paths(self, cursor, query):
+        cursor.execute(query)
+        while True:
+            rows = cursor.fetchmany(_FETCH_BATCH)
+            if not rows:
+                break
+            for row in rows:
+                yield row[0]
+
+    def refresh(self):
+        """重新抽样所有类别；失败时保留上一次的候选池"""
+        conn = self._get_connection()
+        if conn is None:
+            return False
+
+        try:
+            cursor = conn.cursor()
+            pools = {}
+            for category, query in CATEGORY_QUERIES.items():
+                sample = reservoir_sample(self._stream_paths(cursor, query), self.pool_size)
+                paths = [self._normalize(p) for p in sample]
+                pools[category] = [p for p in paths if p]
+            cursor.close()
+        except Error as e:
+            print(f"Error refreshing homepage image pools: {e}")
+            return False
+        finally:
+            conn.close()
+
+        # 整体替换，读取方无需加锁
+        self._pools = pools
+        self._loaded = True
+        return True
+
+    def draw(self, category, k=6):
+        """从某类别的候选池中随机抽取 k 张图片（不足 k 张时全部返回）"""
+        self.ensure_started()
+        pool = self._pools.get(category, [])
+        return random.sample(pool, min(k, len(pool)))
+
+    def request_refresh(self):
+        """数据变化（导入、替换图像）后调用，让后台线程尽快刷新"""
+        self._wakeup.set()
+
+    def ensure_started(self):
+        """首次使用时同步加载一次，并启动后台刷新线程"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            if not self._loaded:
+                self.refresh()
+            self._thread = threading.Thread(target=self._run, name='homepage-image-sampler', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            # 尚未成功加载过（例如启动时数据库不可用）时缩短重试间隔
+            self._wakeup.wait(self.refresh_seconds if self._loaded else _RETRY_SECONDS)
+            self._wakeup.clear()
+            self.refresh()
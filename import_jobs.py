@@ -0,0 +1,251 @@
+"""
+后台导入任务
+后台导入原先在 POST 请求内完成整个导入，大文件会占用工作线程数分钟、在反向代理后超时。这里改为：
+- 上传的文件先保存到磁盘，在 IMPORT_JOBS 表中创建一条排队（queued）的任务，请求立即返回
+- 后台线程按提交顺序逐个执行任务，每处理完一块就把已处理行数与新增 / 更新 / 跳过 / 失败数写回任务行，
+  管理页面轮询 /admin/import/jobs/<id> 显示进度
+- 执行任务前先取得 MySQL 命名锁（GET_LOCK），多个进程同时部署时导入也只会一个接一个地执行，
+  不会并行写同一批表；取得锁时仍为 running 的任务必然是进程中断遗留的，标记为失败
+- 任务结束（成功或失败）后删除暂存的上传文件
+
+环境变量：
+    IMPORT_JOB_DIR     上传文件的暂存目录（默认项目目录下的 uploads/imports）
+    IMPORT_JOB_POLL    工作线程检查排队任务的间隔秒数（默认 10，提交任务时会立即唤醒本进程的工作线程）
+
+本模块不依赖 Flask。
+"""
+
+import os
+import threading
+import time
+import uuid
+
+from mysql.connector import Error
+
+IMPORT_JOB_CONFIG = {
+    'upload_dir': os.getenv('IMPORT_JOB_DIR',
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads', 'imports')),
+    'poll_seconds': float(os.getenv('IMPORT_JOB_POLL', 10)),
+}
+
+JOBS_TABLE = 'IMPORT_JOBS'
+
+# 串行执行导入的 MySQL 命名锁
+IMPORT_LOCK_NAME = 'relics_admin_import'
+
+# 任务状态
+QUEUED, RUNNING, COMPLETED, FAILED = 'queued', 'running', 'completed', 'failed'
+
+CREATE_JOBS_TABLE = f"""
+    CREATE TABLE IF NOT EXISTS {JOBS_TABLE} (
+        Job_ID          INT AUTO_INCREMENT PRIMARY KEY,
+        File_Name       VARCHAR(255) NOT NULL,
+        File_Path       VARCHAR(500) NOT NULL,
+        Import_Mode     VARCHAR(10) NOT NULL DEFAULT 'skip',
+        User_ID         VARCHAR(50),
+        Status          VARCHAR(20) NOT NULL DEFAULT 'queued',
+        Rows_Processed  INT NOT NULL DEFAULT 0,
+        Inserted        INT NOT NULL DEFAULT 0,
+        Updated         INT NOT NULL DEFAULT 0,
+        Skipped         INT NOT NULL DEFAULT 0,
+        Failed          INT NOT NULL DEFAULT 0,
+        Message         TEXT,
+        Created_Time    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        Started_Time    DATETIME NULL,
+        Finished_Time   DATETIME NULL,
+        KEY idx_import_jobs_status (Status, Job_ID)
+    )
+"""
+
+_JOB_COLUMNS = """
+    Job_ID AS job_id, File_Name AS file_name, Import_Mode AS import_mode, User_ID AS user_id,
+    Status AS status, Rows_Processed AS rows_processed, Inserted AS inserted, Updated AS updated,
+    Skipped AS skipped, Failed AS failed, Message AS message,
+    Created_Time AS created_time, Started_Time AS started_time, Finished_Time AS finished_time
+"""
+
+_UPDATE_PROGRESS = f"""
+    UPDATE {JOBS_TABLE}
+    SET Rows_Processed = %s, Inserted = %s, Updated = %s, Skipped = %s, Failed = %s
+    WHERE Job_ID = %s
+"""
+
+
+def ensure_jobs_table(cursor):
+    """创建任务表（由调用方 commit）"""
+    cursor.execute(CREATE_JOBS_TABLE)
+
+
+def _serialize(job):
+    """任务行 → 可直接 jsonify 的字典（时间转为字符串）"""
+    for key in ('created_time', 'started_time', 'finished_time'):
+        if job.get(key) is not None:
+            job[key] = job[key].strftime('%Y-%m-%d %H:%M:%S')
+    return job
+
+
+class ImportJobManager:
+    """
+    导入任务队列
+    get_connection: 返回数据库连接的函数（由调用方 close 归还）
+    run_import: 执行导入的函数 run_import(path, file_name, import_mode, user_id, progress)，
+                progress(rows_processed, result) 在每处理完一块后调用；返回结果字典
+                （'inserted' / 'updated' / 'skipped' / 'failed' / 'message'），失败时抛出异常
+    """
+
+    def __init__(self, get_connection, run_import, upload_dir=None, poll_seconds=None):
+        self._get_connection = get_connection
+        self._run_import = run_import
+        self.upload_dir = upload_dir or IMPORT_JOB_CONFIG['upload_dir']
+        self.poll_seconds = poll_seconds or IMPORT_JOB_CONFIG['poll_seconds']
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    # --- 提交与查询（请求内调用） ---
+    def submit(self, upload, file_name, import_mode, user_id):
+        """保存上传的文件（带 save(path) 方法的对象）并创建排队任务，返回任务 ID；数据库不可用时返回 None"""
+        os.makedirs(self.upload_dir, exist_ok=True)
+        path = os.path.join(self.upload_dir, f"{time.strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}_{file_name}")
+        upload.save(path)
+
+        conn = self._get_connection()
+        if conn is None:
+            os.remove(path)
+            return None
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                INSERT INTO {JOBS_TABLE} (File_Name, File_Path, Import_Mode, User_ID, Status)
+                VALUES (%s, %s, %s, %s, %s)
+            """, (file_name, path, import_mode, user_id, QUEUED))
+            job_id = cursor.lastrowid
+            conn.commit()
+            cursor.close()
+        except Error:
+            os.remove(path)
+            raise
+        finally:
+            conn.close()
+
+        self.ensure_started()
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        """单个任务的状态（不存在时返回 None）"""
+        jobs = self._query(f"SELECT {_JOB_COLUMNS} FROM {JOBS_TABLE} WHERE Job_ID = %s", (job_id,))
+        return jobs[0] if jobs else None
+
+    def recent(self, limit=10):
+        """最近提交的任务（新的在前）"""
+        return self._query(f"SELECT {_JOB_COLUMNS} FROM {JOBS_TABLE} ORDER BY Job_ID DESC LIMIT %s", (limit,))
+
+    def _query(self, sql, params):
+        conn = self._get_connection()
+        if conn is None:
+            return []
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(sql, params)
+            jobs = [_serialize(job) for job in cursor.fetchall()]
+            cursor.close()
+            return jobs
+        except Error as e:
+            print(f"Error loading import jobs: {e}")
+            return []
+        finally:
+            conn.close()
+
+    # --- 后台执行 ---
+    def ensure_started(self):
+        """启动后台工作线程（进程内只启动一次）"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='import-jobs', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self.run_pending()
+            self._wakeup.wait(self.poll_seconds)
+            self._wakeup.clear()
+
+    def run_pending(self):
+        """取得导入锁后依次执行所有排队的任务；其他进程正在导入时直接返回"""
+        conn = self._get_connection()
+        if conn is None:
+            return
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT GET_LOCK(%s, 0)", (IMPORT_LOCK_NAME,))
+            if cursor.fetchone()[0] != 1:
+                cursor.close()
+                return
+            try:
+                # 持有锁时不可能有其他任务在执行，仍为 running 的是进程中断遗留的
+                cursor.execute(f"""
+                    UPDATE {JOBS_TABLE} SET Status = %s, Message = %s, Finished_Time = NOW()
+                    WHERE Status = %s
+                """, (FAILED, '导入进程中断', RUNNING))
+                conn.commit()
+                while True:
+                    job = self._claim_next(conn, cursor)
+                    if job is None:
+                        break
+                    self._execute(conn, cursor, *job)
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (IMPORT_LOCK_NAME,))
+                cursor.fetchone()
+                cursor.close()
+        except Error as e:
+            print(f"Error running import jobs: {e}")
+        finally:
+            conn.close()
+
+    def _claim_next(self, conn, cursor):
+        """把最早排队的任务标记为 running，返回 (Job_ID, 文件名, 路径, 导入模式, 用户)"""
+        cursor.execute(f"""
+            SELECT Job_ID, File_Name, File_Path, Import_Mode, User_ID FROM {JOBS_TABLE}
+            WHERE Status = %s ORDER BY Job_ID LIMIT 1
+        """, (QUEUED,))
+        job = cursor.fetchone()
+        if job is None:
+            return None
+        cursor.execute(f"UPDATE {JOBS_TABLE} SET Status = %s, Started_Time = NOW() WHERE Job_ID = %s",
+                       (RUNNING, job[0]))
+        conn.commit()
+        return tuple(job)
+
+    def _execute(self, conn, cursor, job_id, file_name, path, import_mode, user_id):
+        def progress(rows_processed, result):
+            cursor.execute(_UPDATE_PROGRESS, (
+                rows_processed, result['inserted'], result['updated'],
+                result['skipped'], result['failed'], job_id
+            ))
+            conn.commit()
+
+        try:
+            result = self._run_import(path, file_name, import_mode, user_id, progress)
+            cursor.execute(f"""
+                UPDATE {JOBS_TABLE}
+                SET Status = %s, Inserted = %s, Updated = %s, Skipped = %s, Failed = %s,
+                    Message = %s, Finished_Time = NOW()
+                WHERE Job_ID = %s
+            """, (COMPLETED, result['inserted'], result['updated'], result['skipped'],
+                  result['failed'], result.get('message'), job_id))
+        except Exception as e:
+            print(f"Import job {job_id} failed: {e}")
+            cursor.execute(f"""
+                UPDATE {JOBS_TABLE} SET Status = %s, Message = %s, Finished_Time = NOW()
+                WHERE Job_ID = %s
+            """, (FAILED, f'导入失败: {e}', job_id))
+        conn.commit()
+
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,64 @@
+"""
+文化 / 地理维度表
+PROPERTIES.Culture / Geography 的每个不同取值在 CULTURES / GEOGRAPHIES 中有一个稳定的整数 ID，
+PROPERTIES.Culture_ID / Geography_ID 为指向维度表的外键（带索引）：
+- 文化、地理详情页按主键取名称、按外键筛选文物，不再为了把序号换成名称而重新分组统计
+- ID 一经分配不再变化（文物数量变化不影响链接）
+- 导入时（后台导入、导入脚本）与应用启动时调用 sync_lookup_ids() 补齐维度表与外键
+
+本模块不依赖 Flask，导入脚本可直接调用。
+"""
+
+from mysql.connector import Error
+
+from db_config import TABLES, FIELDS, LOOKUP_DIMENSIONS
+
+# MySQL 错误码：表不存在 / 列不存在
+ER_NO_SUCH_TABLE = 1146
+ER_BAD_FIELD_ERROR = 1054
+
+
+def sync_lookup_ids(cursor, artifact_ids=None, only_missing=False):
+    """
+    把 PROPERTIES 中出现的文化、地理名称写入维度表，并回填外键（由调用方 commit）
+    artifact_ids: 只处理这些文物的属性行（导入后调用）；为 None 时处理全部
+    only_missing: 只处理外键尚未填写的属性行（导入脚本与启动检查使用）
+    维度表或外键列尚未创建时打印提示并返回 False
+    """
+    conditions = []
+    params = []
+    if artifact_ids is not None:
+        artifact_ids = [int(i) for i in artifact_ids if i is not None]
+        if not artifact_ids:
+            return True
+        conditions.append(f"p.{FIELDS['property']['artifact_id']} IN ({', '.join(['%s'] * len(artifact_ids))})")
+        params.extend(artifact_ids)
+
+    try:
+        for dim in LOOKUP_DIMENSIONS.values():
+            dim_conditions = list(conditions)
+            if only_missing:
+                dim_conditions.append(f"p.{dim['fk']} IS NULL")
+            where = ''.join(f" AND {c}" for c in dim_conditions)
+
+            # 1. 新出现的名称分配 ID（名称唯一，已有的保持原 ID）
+            cursor.execute(f"""
+                INSERT IGNORE INTO {dim['table']} ({dim['name']})
+                SELECT DISTINCT TRIM(p.{dim['source']})
+                FROM {TABLES['properties']} p
+                WHERE p.{dim['source']} IS NOT NULL AND TRIM(p.{dim['source']}) != ''{where}
+            """, params)
+
+            # 2. 回填外键（名称为空时置为 NULL）
+            cursor.execute(f"""
+                UPDATE {TABLES['properties']} p
+                LEFT JOIN {dim['table']} d ON d.{dim['name']} = TRIM(p.{dim['source']})
+                SET p.{dim['fk']} = d.{dim['id']}
+                WHERE 1 = 1{where}
+            """, params)
+    except Error as e:
+        if e.errno not in (ER_NO_SUCH_TABLE, ER_BAD_FIELD_ERROR):
+            raise
+        print("缺少 CULTURES / GEOGRAPHIES 维度表或外键列，请执行 sql/database_migration_dimension_tables.sql")
+        return False
+    return True
@@ -0,0 +1,139 @@
+"""
+表格解析缓存
+pd.read_excel 解析大表格很慢（重新导入时大部分时间花在这里），且每次运行都要重复。
+这里把解析并映射列名后的 DataFrame 保存为旁路缓存文件，下次读取同一文件时直接载入：
+- 缓存键 = 文件内容的 SHA-1 + 调用方给出的映射版本（列名映射等变化时自动失效）+ pandas 版本
+- 安装了 pyarrow 时保存为 Parquet，读取时内存映射；未安装或该表无法转为 Parquet（如同一列混有数字与文字）时
+  退回 pickle
+- 写入先写临时文件再改名，并发运行不会读到写了一半的缓存；缓存文件超过上限时删除最久未使用的
+- 缓存读写失败只打印提示，退回直接解析
+
+环境变量：
+    PARSE_CACHE          设为 0 时不使用缓存（默认 1）
+    PARSE_CACHE_DIR      缓存目录（默认项目目录下的 .cache/parsed）
+    PARSE_CACHE_MAX_FILES  保留的缓存文件数上限（默认 32）
+
+本模块不依赖 Flask，导入脚本可直接调用。
+"""
+
+import hashlib
+import os
+import pickle
+import uuid
+
+import pandas as pd
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 为可选依赖
+    pyarrow = None
+    pq = None
+
+PARSE_CACHE_CONFIG = {
+    'enabled': os.getenv('PARSE_CACHE', '1') != '0',
+    'cache_dir': os.getenv('PARSE_CACHE_DIR',
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'parsed')),
+    'max_files': int(os.getenv('PARSE_CACHE_MAX_FILES', 32)),
+}
+
+# 缓存文件格式变化时递增，使旧缓存全部失效
+CACHE_FORMAT_VERSION = 1
+
+_READ_BLOCK = 1 << 20
+
+
+def file_digest(path):
+    """文件内容的 SHA-1（按块读取）"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_READ_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(path, mapping_version):
+    """文件内容 + 映射版本 + pandas 版本 → 缓存文件名（不含扩展名）"""
+    meta = hashlib.sha1(f"{CACHE_FORMAT_VERSION}|{pd.__version__}|{mapping_version}".encode('utf-8')).hexdigest()
+    return f"{file_digest(path)}_{meta[:12]}"
+
+
+def _read(base):
+    """读取缓存；不存在时返回 None"""
+    parquet_path, pickle_path = base + '.parquet', base + '.pkl'
+    if pq is not None and os.path.exists(parquet_path):
+        path = parquet_path
+        df = pq.read_table(parquet_path, memory_map=True).to_pandas()
+    elif os.path.exists(pickle_path):
+        path = pickle_path
+        with open(pickle_path, 'rb') as f:
+            df = pickle.load(f)
+    else:
+        return None
+    os.utime(path)  # 记录最近使用时间，清理时保留常用的缓存
+    return df
+
+
+def _write(base, df):
+    """写入缓存（优先 Parquet，失败时退回 pickle）"""
+    tmp = f"{base}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        if pq is not None:
+            try:
+                pq.write_table(pyarrow.Table.from_pandas(df), tmp)
+                os.replace(tmp, base + '.parquet')
+                return
+            except (pyarrow.ArrowException, TypeError, ValueError):
+                pass  # 列类型无法转为 Parquet，退回 pickle
+        with open(tmp, 'wb') as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, base + '.pkl')
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _prune(cache_dir, max_files):
+    """缓存文件超过上限时删除最久未使用的"""
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(('.parquet', '.pkl')):
+            path = os.path.join(cache_dir, name)
+            entries.append((os.path.getmtime(path), path))
+    entries.sort(reverse=True)
+    for _, path in entries[max_files:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def load_frame(path, mapping_version, parse, use_cache=None):
+    """
+    读取表格文件解析后的 DataFrame：有缓存时直接载入，否则调用 parse(path) 解析并写入缓存
+    mapping_version: 解析结果所依赖的映射配置（列名映射等）的字符串表示，变化后旧缓存不再命中
+    use_cache: 为 None 时按 PARSE_CACHE 环境变量
+    """
+    if use_cache is None:
+        use_cache = PARSE_CACHE_CONFIG['enabled']
+    if not use_cache:
+        return parse(path)
+
+    cache_dir = PARSE_CACHE_CONFIG['cache_dir']
+    base = os.path.join(cache_dir, cache_key(path, mapping_version))
+    try:
+        df = _read(base)
+        if df is not None:
+            print(f"使用解析缓存: {os.path.basename(path)}")
+            return df
+    except Exception as e:
+        print(f"读取解析缓存失败，重新解析: {e}")
+
+    df = parse(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _write(base, df)
+        _prune(cache_dir, PARSE_CACHE_CONFIG['max_files'])
+    except Exception as e:
+        print(f"写入解析缓存失败: {e}")
+    return df
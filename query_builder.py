@@ -3,7 +3,26 @@ SQL查询构建器
 根据 db_config.py 中的配置自动生成SQL查询
 """
 
-from db_config import QUERIES, TABLES, FIELDS, JOINS
+import re
+
+from db_config import QUERIES, TABLES, FIELDS, JOINS, SEARCH_CONFIG, FULLTEXT_INDEXES, LOOKUP_DIMENSIONS
+
+# 朝代 → 年份区间（DYNASTIES 表的初始数据；搜索的 ?dynasty= 参数按此换算为年代区间）
+DYNASTY_YEAR_RANGES = {
+    '汉': (-202, 220),
+    '唐': (618, 907),
+    '宋': (960, 1279),
+    '元': (1271, 1368),
+    '明': (1368, 1644),
+    '清': (1644, 1911),
+}
+
+def build_year_overlap_condition(alias='a'):
+    """年代区间筛选：文物的 [Start_Year, Effective_End_Year] 与所查区间重叠
+    参数为 (结束年, 起始年)；两列上的复合索引可把它变成索引范围扫描
+    """
+    return (f"{alias}.{FIELDS['artifact']['start_year']} <= %s "
+            f"AND {alias}.{FIELDS['artifact']['effective_end_year']} >= %s")
 
 def build_index_query():
     """构建首页查询SQL"""
@@ -70,40 +89,43 @@ def build_images_query():
     
     return query.strip()
 
-def build_search_query(search_term, start_year=None, end_year=None):
-    """构建搜索查询SQL
-    搜索范围包括：标题（中英文）、描述（中文）、文化、艺术家、时代（中英文）、地区、材质、分类、博物馆名称
-    支持年代筛选，对宋、明、清代有特殊处理
-    返回查询字符串和参数列表
-    
-    Args:
-        search_term: 搜索关键词
-        start_year: 起始年份（可选）
-        end_year: 结束年份（可选）
-    
-    Returns:
-        tuple: (查询字符串, 参数列表) 或 (None, []) 如果 search_term 为空
+def build_fulltext_against(search_term):
+    """把搜索关键词转换为 BOOLEAN MODE 下的 AGAINST 表达式
+    ngram 分词时，短语检索 "..." 等价于子串匹配；
+    比 ngram_token_size（默认 2）短的关键词（如单字"宋"）用前缀通配 宋* 匹配
     """
-    if not search_term:
-        return None, []
+    # 去掉 BOOLEAN MODE 的运算符，避免用户输入改变查询语义
+    term = re.sub(r'[\"+\-<>()~*@]', ' ', search_term).strip()
+    if not term:
+        return None
+    if len(term) < 2:
+        return f"{term}*"
+    return f'"{term}"'
+
+def _build_search_match(search_term, mode):
+    """构建搜索命中部分：返回 (FROM 子句, WHERE 条件, 参数列表)"""
+    if mode == 'fulltext':
+        against = build_fulltext_against(search_term)
+        if against is not None:
+            artifact_columns = ', '.join(FULLTEXT_INDEXES['artifacts'])
+            property_columns = ', '.join(FULLTEXT_INDEXES['properties'])
+            # 各分支都能走索引（FULLTEXT 索引 / SOURCES 小表 + Source_ID 外键索引），UNION 去重后再回表
+            from_clause = f"""(
+                SELECT {FIELDS['artifact']['id']} FROM {TABLES['artifacts']}
+                WHERE MATCH({artifact_columns}) AGAINST (%s IN BOOLEAN MODE)
+                UNION
+                SELECT {FIELDS['property']['artifact_id']} FROM {TABLES['properties']}
+                WHERE MATCH({property_columns}) AGAINST (%s IN BOOLEAN MODE)
+                UNION
+                SELECT a2.{FIELDS['artifact']['id']} FROM {TABLES['artifacts']} a2
+                INNER JOIN {TABLES['sources']} s2 ON a2.{FIELDS['artifact']['source_id']} = s2.{FIELDS['source']['id']}
+                WHERE s2.{FIELDS['source']['museum_name_cn']} LIKE %s
+            ) hits
+            INNER JOIN {TABLES['artifacts']} a ON a.{FIELDS['artifact']['id']} = hits.{FIELDS['artifact']['id']}"""
+            return from_clause, "1=1", [against, against, f"%{search_term}%"]
     
-    # 构建基础查询
-    base_query = f"""
-        SELECT 
-            a.{FIELDS['artifact']['id']} AS artifact_id, 
-            a.{FIELDS['artifact']['title_cn']} AS title, 
-            a.{FIELDS['artifact']['date_cn']} AS date_text,
-            a.{FIELDS['artifact']['start_year']} AS start_year,
-            a.{FIELDS['artifact']['end_year']} AS end_year,
-            ANY_VALUE(iv.{FIELDS['image']['local_path']}) AS local_path,
-            ANY_VALUE(p.{FIELDS['property']['culture']}) AS culture_name,
-            ANY_VALUE(p.{FIELDS['property']['geography']}) AS geography,
-            ANY_VALUE(a.{FIELDS['artifact']['material']}) AS medium
-        FROM {TABLES['artifacts']} a
-        LEFT JOIN {TABLES['image_versions']} iv ON a.{FIELDS['artifact']['id']} = iv.{FIELDS['image']['artifact_id']}
-        LEFT JOIN {TABLES['properties']} p ON a.{FIELDS['artifact']['id']} = p.{FIELDS['property']['artifact_id']}
-        LEFT JOIN {TABLES['sources']} s ON a.{FIELDS['artifact']['source_id']} = s.{FIELDS['source']['id']}
-        WHERE (
+    from_clause = f"{TABLES['artifacts']} a"
+    where_clause = f"""(
             a.{FIELDS['artifact']['title_cn']} LIKE %s 
             OR a.{FIELDS['artifact']['title_en']} LIKE %s
             OR a.{FIELDS['artifact']['description_cn']} LIKE %s 
@@ -115,8 +137,7 @@ def build_search_query(search_term, start_year=None, end_year=None):
             OR a.{FIELDS['artifact']['material']} LIKE %s
             OR a.{FIELDS['artifact']['classification']} LIKE %s
             OR s.{FIELDS['source']['museum_name_cn']} LIKE %s
-        )
-    """
+        )"""
     
     search_pattern = f"%{search_term}%"
     # 为所有搜索字段提供相同的搜索模式
@@ -133,29 +154,189 @@ def build_search_query(search_term, start_year=None, end_year=None):
         search_pattern,  # Classification
         search_pattern   # Museum_Name_CN
     ]
+    return from_clause, where_clause, params
+
+# 搜索筛选参数 → 对应的列（写入时已去除两端空白，直接比较原列以便使用索引，见 sql/database_migration_search_filters.sql）
+SEARCH_FILTER_COLUMNS = {
+    'culture': f"p.{FIELDS['property']['culture']}",
+    'material': f"a.{FIELDS['artifact']['material']}",
+    'region': f"p.{FIELDS['property']['geography']}",
+}
+
+# 搜索排序方式 → ORDER BY 子句（年份为空的排在最后，同年份按入库倒序）
+SEARCH_SORT_ORDERS = {
+    'era_asc': f"a.{FIELDS['artifact']['start_year']} IS NULL, a.{FIELDS['artifact']['start_year']} ASC, a.{FIELDS['artifact']['id']} DESC",
+    'era_desc': f"a.{FIELDS['artifact']['start_year']} IS NULL, a.{FIELDS['artifact']['start_year']} DESC, a.{FIELDS['artifact']['id']} DESC",
+    'newest': f"a.{FIELDS['artifact']['id']} DESC",
+}
+
+# 相关度排序的 SQL 预排序：标题（中英文）命中关键词的排在前面，同组按入库倒序；
+# 应用内再对预排序的前若干条做 BM25 打分
+SEARCH_RELEVANCE_ORDER = (f"(a.{FIELDS['artifact']['title_cn']} LIKE %s OR a.{FIELDS['artifact']['title_en']} LIKE %s) DESC, "
+                          f"a.{FIELDS['artifact']['id']} DESC")
+
+def _build_search_where(search_term, start_year, end_year, mode, filters=None):
+    """
+    构建搜索的 FROM / WHERE：关键词命中 + 年代区间 + 文化/材质/地区筛选
+    返回 (FROM 子句（含 PROPERTIES、SOURCES 连接）, WHERE 条件, 参数列表)
+    """
+    from_clause, where_clause, params = _build_search_match(search_term, mode or SEARCH_CONFIG['mode'])
+    from_clause += f"""
+        LEFT JOIN {TABLES['properties']} p ON a.{FIELDS['artifact']['id']} = p.{FIELDS['property']['artifact_id']}
+        LEFT JOIN {TABLES['sources']} s ON a.{FIELDS['artifact']['source_id']} = s.{FIELDS['source']['id']}"""
     
-    # 年代筛选逻辑（解决清代跑到宋代的问题）
+    # 年代筛选：区间重叠（起止年份均参与，宋、明、清等朝代由调用方换算为年份区间）
     if start_year is not None and end_year is not None:
-        date_cn_field = FIELDS['artifact']['date_cn']
-        start_year_field = FIELDS['artifact']['start_year']
-        # 使用文字匹配优先，避免数字填错导致的乱象
-        if start_year == 960 and end_year == 1279:  # 宋
-            base_query += f" AND (a.{date_cn_field} LIKE '%%宋%%')"
-        elif start_year == 1368 and end_year == 1644:  # 明
-            base_query += f" AND (a.{date_cn_field} LIKE '%%明%%')"
-        elif start_year == 1644 and end_year == 1911:  # 清
-            base_query += f" AND (a.{date_cn_field} LIKE '%%清%%' OR a.{date_cn_field} LIKE '%%康熙%%' OR a.{date_cn_field} LIKE '%%乾隆%%' OR a.{date_cn_field} LIKE '%%雍正%%')"
+        where_clause += f" AND {build_year_overlap_condition()}"
+        params.append(end_year)
+        params.append(start_year)
+    
+    # 年代分类筛选：值为 "纪年体系__年代分类"，按写入时保存的 Era_System / Era_Bucket 列匹配
+    filters = dict(filters or {})
+    era_values = filters.pop('era', None)
+    if era_values:
+        era_pairs = [value.split('__', 1) for value in era_values if '__' in value]
+        if era_pairs:
+            placeholders = ', '.join(['(%s, %s)'] * len(era_pairs))
+            where_clause += f" AND (a.{FIELDS['artifact']['era_system']}, a.{FIELDS['artifact']['era_bucket']}) IN ({placeholders})"
+            for pair in era_pairs:
+                params.extend(pair)
         else:
-            # 西方或自定义区间，使用数字 start_year 字段
-            base_query += f" AND a.{start_year_field} BETWEEN %s AND %s"
-            params.append(start_year)
-            params.append(end_year)
+            where_clause += " AND 1 = 0"
+    
+    # 文化 / 材质 / 地区筛选：参数化的 IN 条件
+    for key, values in filters.items():
+        if values:
+            placeholders = ', '.join(['%s'] * len(values))
+            where_clause += f" AND {SEARCH_FILTER_COLUMNS[key]} IN ({placeholders})"
+            params.extend(value.strip() for value in values)
+    
+    return from_clause, where_clause, params
+
+def build_search_query(search_term, start_year=None, end_year=None, mode=None, with_text=False,
+                       filters=None, sort_by=None, limit=None, offset=0):
+    """构建搜索查询SQL
+    搜索范围包括：标题（中英文）、描述（中文）、文化、艺术家、时代（中英文）、地区、材质、分类、博物馆名称
+    支持年代筛选：文物的起止年份区间与所查区间重叠即命中
+    返回查询字符串和参数列表
+    
+    Args:
+        search_term: 搜索关键词
+        start_year: 起始年份（可选）
+        end_year: 结束年份（可选）
+        mode: 'like' 或 'fulltext'（可选，默认取 SEARCH_CONFIG['mode']）
+        with_text: 是否额外返回英文标题、描述等文本列（相关度打分用）
+        filters: {'culture': [...], 'material': [...], 'region': [...], 'era': [...]}（可选）
+        sort_by: 'era_asc' / 'era_desc' / 'newest' / 'relevance'（可选，默认按入库倒序；
+            'relevance' 为标题命中优先的预排序，见 SEARCH_RELEVANCE_ORDER）
+        limit: 每页条数（可选，不传则返回全部结果）
+        offset: 跳过的条数
+    
+    Returns:
+        tuple: (查询字符串, 参数列表) 或 (None, []) 如果 search_term 为空
+    """
+    if not search_term:
+        return None, []
+    
+    from_clause, where_clause, params = _build_search_where(search_term, start_year, end_year, mode, filters)
+    
+    text_columns = ''
+    if with_text:
+        text_columns = f""",
+            a.{FIELDS['artifact']['title_en']} AS title_en,
+            a.{FIELDS['artifact']['description_cn']} AS description,
+            a.{FIELDS['artifact']['classification']} AS classification,
+            ANY_VALUE(p.{FIELDS['property']['artist']}) AS artist,
+            ANY_VALUE(s.{FIELDS['source']['museum_name_cn']}) AS museum_name"""
+    
+    # 构建基础查询
+    base_query = f"""
+        SELECT 
+            a.{FIELDS['artifact']['id']} AS artifact_id, 
+            a.{FIELDS['artifact']['title_cn']} AS title, 
+            a.{FIELDS['artifact']['date_cn']} AS date_text,
+            a.{FIELDS['artifact']['start_year']} AS start_year,
+            a.{FIELDS['artifact']['end_year']} AS end_year,
+            ANY_VALUE(iv.{FIELDS['image']['local_path']}) AS local_path,
+            ANY_VALUE(p.{FIELDS['property']['culture']}) AS culture_name,
+            ANY_VALUE(p.{FIELDS['property']['geography']}) AS geography,
+            ANY_VALUE(a.{FIELDS['artifact']['material']}) AS medium{text_columns}
+        FROM {from_clause}
+        LEFT JOIN {TABLES['image_versions']} iv ON a.{FIELDS['artifact']['id']} = iv.{FIELDS['image']['artifact_id']}
+        WHERE {where_clause}
+    """
     
     # 分组与排序
-    base_query += f" GROUP BY a.{FIELDS['artifact']['id']} ORDER BY a.{FIELDS['artifact']['id']} DESC"
+    if sort_by == 'relevance':
+        order_by = SEARCH_RELEVANCE_ORDER
+        params.extend([f"%{search_term}%"] * 2)
+    else:
+        order_by = SEARCH_SORT_ORDERS.get(sort_by, SEARCH_SORT_ORDERS['newest'])
+    base_query += f" GROUP BY a.{FIELDS['artifact']['id']} ORDER BY {order_by}"
+    
+    # 分页
+    if limit is not None:
+        base_query += " LIMIT %s OFFSET %s"
+        params.extend([limit, offset])
     
     return base_query.strip(), params
 
+def build_search_count_query(search_term, start_year=None, end_year=None, mode=None, filters=None):
+    """构建搜索结果总数查询SQL（分页用），条件与 build_search_query 相同
+    
+    Returns:
+        tuple: (查询字符串, 参数列表) 或 (None, []) 如果 search_term 为空
+    """
+    if not search_term:
+        return None, []
+    
+    from_clause, where_clause, params = _build_search_where(search_term, start_year, end_year, mode, filters)
+    query = f"""
+        SELECT COUNT(DISTINCT a.{FIELDS['artifact']['id']}) AS total
+        FROM {from_clause}
+        WHERE {where_clause}
+    """
+    
+    return query.strip(), params
+
+def build_search_facets_query(search_term, start_year=None, end_year=None, mode=None):
+    """构建搜索筛选项统计SQL
+    在关键词与年代区间命中的文物上（不含文化/材质/地区筛选）分组计数，
+    每件文物取一个文化、材质、地区、年代分类，与原先在结果行上逐条统计的口径一致。
+    年代分类的值为 "纪年体系__年代分类"（未分类的文物不计入）。
+    
+    Returns:
+        tuple: (查询字符串, 参数列表)，结果列为 facet ('culture' / 'material' / 'region' / 'era'), value, count
+    """
+    if not search_term:
+        return None, []
+    
+    from_clause, where_clause, params = _build_search_where(search_term, start_year, end_year, mode)
+    query = f"""
+        WITH matched AS (
+            SELECT 
+                a.{FIELDS['artifact']['id']},
+                ANY_VALUE(p.{FIELDS['property']['culture']}) AS culture,
+                ANY_VALUE(a.{FIELDS['artifact']['material']}) AS material,
+                ANY_VALUE(p.{FIELDS['property']['geography']}) AS geography,
+                ANY_VALUE(a.{FIELDS['artifact']['era_system']}) AS era_system,
+                ANY_VALUE(a.{FIELDS['artifact']['era_bucket']}) AS era_bucket
+            FROM {from_clause}
+            WHERE {where_clause}
+            GROUP BY a.{FIELDS['artifact']['id']}
+        )
+        SELECT 'culture' AS facet, culture AS value, COUNT(*) AS count FROM matched GROUP BY culture
+        UNION ALL
+        SELECT 'material', material, COUNT(*) FROM matched GROUP BY material
+        UNION ALL
+        SELECT 'region', geography, COUNT(*) FROM matched GROUP BY geography
+        UNION ALL
+        SELECT 'era', CONCAT(era_system, '__', era_bucket), COUNT(*) FROM matched
+        WHERE era_bucket IS NOT NULL GROUP BY era_system, era_bucket
+    """
+    
+    return query.strip(), params
+
 def build_cultures_browse_query():
     """构建文化浏览页面查询SQL
     返回所有文化及其文物数量和代表性图片（从PROPERTIES表获取文化信息）
@@ -194,6 +375,153 @@ def build_culture_artifacts_query(culture_name):
     
     return query.strip()
 
+def build_browse_summary_query():
+    """构建浏览页查询SQL：读取物化的 BROWSE_SUMMARIES（见 browse_summaries.py）
+    参数为 (维度, 分组)：('culture', '') / ('geography', '') / ('era', 纪年体系)
+    结果列为 id, value_group, name, artifact_count, representative_image
+    """
+    query = f"""
+        SELECT 
+            s.Value_ID AS id,
+            s.Value_Group AS value_group,
+            s.Value_Name AS name,
+            s.Artifact_Count AS artifact_count,
+            iv.{FIELDS['image']['local_path']} AS representative_image
+        FROM BROWSE_SUMMARIES s
+        LEFT JOIN {TABLES['image_versions']} iv ON iv.{FIELDS['image']['id']} = s.Representative_Version_PK
+        WHERE s.Dimension = %s AND s.Value_Group = %s AND s.Artifact_Count > 0
+        ORDER BY s.Artifact_Count DESC, s.Value_Name
+    """
+    
+    return query.strip()
+
+def build_lookup_name_query(kind):
+    """按主键取文化 / 地理名称（参数：ID）"""
+    dim = LOOKUP_DIMENSIONS[kind]
+    return f"SELECT {dim['name']} AS name FROM {dim['table']} WHERE {dim['id']} = %s"
+
+def build_lookup_artifacts_query(kind):
+    """构建某个文化 / 地理区域下的文物列表查询SQL（参数：ID，按外键索引筛选）"""
+    dim = LOOKUP_DIMENSIONS[kind]
+    query = f"""
+        SELECT 
+            a.{FIELDS['artifact']['id']} AS artifact_id,
+            a.{FIELDS['artifact']['title_cn']} AS title,
+            a.{FIELDS['artifact']['date_cn']} AS date_text,
+            ANY_VALUE(iv.{FIELDS['image']['local_path']}) AS local_path
+        FROM {TABLES['properties']} p
+        INNER JOIN {TABLES['artifacts']} a ON a.{FIELDS['artifact']['id']} = p.{FIELDS['property']['artifact_id']}
+        LEFT JOIN {TABLES['image_versions']} iv ON a.{FIELDS['artifact']['id']} = iv.{FIELDS['image']['artifact_id']}
+        WHERE p.{dim['fk']} = %s
+        GROUP BY a.{FIELDS['artifact']['id']}
+        ORDER BY a.{FIELDS['artifact']['id']} DESC
+    """
+    
+    return query.strip()
+
+def build_random_page_query(inclusive_start=False):
+    """构建随机浏览分页查询SQL
+    按持久化的随机排列键 Shuffle_Key 做索引范围扫描，取 (lower, upper) 区间内的一页，
+    代表图用相关子查询获取，避免对整个 ARTIFACTS×IMAGE_VERSIONS 连接做 GROUP BY
+
+    Args:
+        inclusive_start: 下界是否包含（首页从种子位置开始时包含，翻页续读时不包含）
+
+    Returns:
+        str: 查询字符串，参数顺序为 (下界, 上界, 条数)
+    """
+    lower_op = '>=' if inclusive_start else '>'
+    query = f"""
+        SELECT 
+            a.{FIELDS['artifact']['id']} AS artifact_id,
+            a.{FIELDS['artifact']['title_cn']} AS title,
+            a.{FIELDS['artifact']['date_cn']} AS date_text,
+            a.{FIELDS['artifact']['shuffle_key']} AS shuffle_key,
+            (SELECT iv.{FIELDS['image']['local_path']}
+             FROM {TABLES['image_versions']} iv
+             WHERE iv.{FIELDS['image']['artifact_id']} = a.{FIELDS['artifact']['id']}
+             ORDER BY iv.{FIELDS['image']['id']}
+             LIMIT 1) AS local_path
+        FROM {TABLES['artifacts']} a
+        WHERE a.{FIELDS['artifact']['shuffle_key']} {lower_op} %s
+            AND a.{FIELDS['artifact']['shuffle_key']} < %s
+        ORDER BY a.{FIELDS['artifact']['shuffle_key']}
+        LIMIT %s
+    """
+    
+    return query.strip()
+
+def build_era_artifacts_query():
+    """构建年代分类详情页查询SQL（按 Era_System / Era_Bucket 索引分页）
+    
+    Returns:
+        str: 查询字符串，参数顺序为 (纪年体系, 年代分类, 条数, 偏移)
+    """
+    query = f"""
+        SELECT 
+            a.{FIELDS['artifact']['id']} AS artifact_id,
+            a.{FIELDS['artifact']['title_cn']} AS title,
+            a.{FIELDS['artifact']['date_cn']} AS date_text,
+            (SELECT iv.{FIELDS['image']['local_path']}
+             FROM {TABLES['image_versions']} iv
+             WHERE iv.{FIELDS['image']['artifact_id']} = a.{FIELDS['artifact']['id']}
+             ORDER BY iv.{FIELDS['image']['id']}
+             LIMIT 1) AS local_path
+        FROM {TABLES['artifacts']} a
+        WHERE a.{FIELDS['artifact']['era_system']} = %s AND a.{FIELDS['artifact']['era_bucket']} = %s
+        ORDER BY a.{FIELDS['artifact']['id']} DESC
+        LIMIT %s OFFSET %s
+    """
+    
+    return query.strip()
+
+def build_era_count_query():
+    """构建年代分类文物总数查询SQL，参数为 (纪年体系, 年代分类)"""
+    query = f"""
+        SELECT COUNT(*) AS total
+        FROM {TABLES['artifacts']}
+        WHERE {FIELDS['artifact']['era_system']} = %s AND {FIELDS['artifact']['era_bucket']} = %s
+    """
+    
+    return query.strip()
+
+def build_dynasties_query():
+    """构建朝代年份区间查询SQL（DYNASTIES 表）"""
+    return (f"SELECT {FIELDS['dynasty']['name']} AS name, {FIELDS['dynasty']['start_year']} AS start_year, "
+            f"{FIELDS['dynasty']['end_year']} AS end_year FROM {TABLES['dynasties']}")
+
+def build_search_cards_query(count):
+    """构建按 ID 列表取搜索结果卡片的查询SQL
+    匹配、筛选和排序已完成（内存索引或缓存的 ID 顺序），这里只取当前页文物的标题、代表图、年代、文化与材质
+
+    Args:
+        count: ID 个数
+
+    Returns:
+        str: 查询字符串，参数为文物 ID 列表（结果顺序由调用方还原）
+    """
+    placeholders = ', '.join(['%s'] * count)
+    query = f"""
+        SELECT 
+            a.{FIELDS['artifact']['id']} AS artifact_id,
+            a.{FIELDS['artifact']['title_cn']} AS title,
+            a.{FIELDS['artifact']['date_cn']} AS date_text,
+            a.{FIELDS['artifact']['material']} AS medium,
+            (SELECT p.{FIELDS['property']['culture']}
+             FROM {TABLES['properties']} p
+             WHERE p.{FIELDS['property']['artifact_id']} = a.{FIELDS['artifact']['id']}
+             LIMIT 1) AS culture_name,
+            (SELECT iv.{FIELDS['image']['local_path']}
+             FROM {TABLES['image_versions']} iv
+             WHERE iv.{FIELDS['image']['artifact_id']} = a.{FIELDS['artifact']['id']}
+             ORDER BY iv.{FIELDS['image']['id']}
+             LIMIT 1) AS local_path
+        FROM {TABLES['artifacts']} a
+        WHERE a.{FIELDS['artifact']['id']} IN ({placeholders})
+    """
+    
+    return query.strip()
+
 # 使用示例（可选，如果使用配置化方案）
 if __name__ == '__main__':
     print("首页查询：")
@@ -210,4 +538,16 @@ if __name__ == '__main__':
     query2, params2 = build_search_query("测试", 1644, 1911)
     print(query2)
     print("参数:", params2)
+    print("\n带筛选、排序与分页的搜索查询示例：")
+    query4, params4 = build_search_query("测试", filters={'culture': ['明']}, sort_by='era_asc', limit=60, offset=60)
+    print(query4)
+    print("参数:", params4)
+    print("\n筛选项统计查询示例：")
+    query5, params5 = build_search_facets_query("测试")
+    print(query5)
+    print("参数:", params5)
+    print("\nFULLTEXT 模式的搜索查询示例：")
+    query3, params3 = build_search_query("青铜", mode='fulltext')
+    print(query3)
+    print("参数:", params3)
 
@@ -0,0 +1,171 @@
+"""
+搜索结果缓存
+相同的搜索（关键词 + 年代区间）在缓存有效期内直接复用候选结果与筛选项统计，不再重新扫描
+（SQL 路径只缓存排好序的文物 ID 与分数，不缓存含文本的整行）：
+- 有界 LRU + TTL：条目数与存活时间均可配置
+- 键为规范化后的查询（全角转半角、转小写、合并空白）
+- 目录版本号（CATALOGUE_VERSION 表）在后台导入、替换图像、导入脚本运行后递增，
+  本进程最多每隔 CATALOGUE_VERSION_TTL 秒读取一次，版本变化时清空缓存
+
+环境变量：
+    SEARCH_CACHE_SIZE        最多缓存的查询数（默认 128，设为 0 关闭缓存）
+    SEARCH_CACHE_TTL         单条缓存的存活秒数（默认 600）
+    CATALOGUE_VERSION_TTL    重新读取目录版本号的间隔秒数（默认 5）
+
+本模块不依赖 Flask，导入脚本可直接调用 bump_catalogue_version()。
+"""
+
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from mysql.connector import Error
+
+SEARCH_CACHE_CONFIG = {
+    'size': int(os.getenv('SEARCH_CACHE_SIZE', 128)),
+    'ttl': float(os.getenv('SEARCH_CACHE_TTL', 600)),
+    'version_ttl': float(os.getenv('CATALOGUE_VERSION_TTL', 5)),
+}
+
+# MySQL 错误码：表不存在
+ER_NO_SUCH_TABLE = 1146
+
+CATALOGUE_VERSION_QUERY = "SELECT Version FROM CATALOGUE_VERSION WHERE Id = 1"
+BUMP_CATALOGUE_VERSION_SQL = "UPDATE CATALOGUE_VERSION SET Version = Version + 1 WHERE Id = 1"
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_query(term):
+    """规范化搜索关键词：全角转半角、转小写、合并空白（LIKE 与内存索引均不区分大小写）"""
+    term = unicodedata.normalize('NFKC', term or '')
+    return _WHITESPACE_RE.sub(' ', term).strip().lower()
+
+
+def bump_catalogue_version(cursor):
+    """
+    递增目录版本号，使所有进程中的搜索缓存失效
+    在写入数据的同一事务中调用，由调用方 commit；版本表不存在时只打印提示
+    """
+    try:
+        cursor.execute(BUMP_CATALOGUE_VERSION_SQL)
+    except Error as e:
+        if e.errno != ER_NO_SUCH_TABLE:
+            raise
+        print("CATALOGUE_VERSION 表不存在，搜索缓存只能依靠 TTL 过期。请执行 sql/database_catalogue_version.sql")
+
+
+class LRUCache:
+    """线程安全的 LRU + TTL 缓存"""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SearchCache:
+    """
+    按目录版本号失效的搜索缓存
+    get_connection: 返回数据库连接的函数（由调用方 close 归还）
+    """
+
+    def __init__(self, get_connection, maxsize=None, ttl=None, version_ttl=None):
+        self._get_connection = get_connection
+        self._cache = LRUCache(
+            SEARCH_CACHE_CONFIG['size'] if maxsize is None else maxsize,
+            ttl or SEARCH_CACHE_CONFIG['ttl'],
+        )
+        self.version_ttl = SEARCH_CACHE_CONFIG['version_ttl'] if version_ttl is None else version_ttl
+        self._version = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def _read_version(self):
+        conn = self._get_connection()
+        if conn is None:
+            return self._version
+        try:
+            cursor = conn.cursor()
+            cursor.execute(CATALOGUE_VERSION_QUERY)
+            row = cursor.fetchone()
+            cursor.close()
+            return row[0] if row else None
+        except Error as e:
+            if e.errno != ER_NO_SUCH_TABLE:
+                print(f"Error reading catalogue version: {e}")
+            return self._version
+        finally:
+            conn.close()
+
+    def _sync_version(self):
+        """距上次检查超过 version_ttl 时重新读取版本号，版本变化则清空缓存"""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.version_ttl:
+            return
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.version_ttl:
+                return
+            version = self._read_version()
+            if version != self._version:
+                self._cache.clear()
+                self._version = version
+            self._checked_at = now
+
+    def get(self, key):
+        if self._cache.maxsize <= 0:
+            return None
+        self._sync_version()
+        return self._cache.get(key)
+
+    def put(self, key, value):
+        self._cache.put(key, value)
+
+    def bump_version(self):
+        """本进程内的数据变更（后台导入、替换图像）：递增版本号并立即清空本地缓存"""
+        self._cache.clear()
+        self._checked_at = None
+        conn = self._get_connection()
+        if conn is None:
+            return
+        try:
+            cursor = conn.cursor()
+            bump_catalogue_version(cursor)
+            conn.commit()
+            cursor.close()
+        except Error as e:
+            print(f"Error bumping catalogue version: {e}")
+        finally:
+            conn.close()
@@ -0,0 +1,516 @@
+"""
+进程内倒排索引（可选）
+启动后在后台从 ARTIFACTS / PROPERTIES / SOURCES 构建倒排索引，/search 直接在内存中
+把关键词解析为文物 ID，只需再从 MySQL 取当前页的卡片数据，不再执行 11 路 LIKE。
+
+分词规则：
+- 中文（CJK）连续片段：索引单字和相邻二字组（bigram）；查询时片段长度 >= 2 用 bigram，单字用单字
+- 英文与数字：按单词切分并转小写；查询的最后一个英文单词支持前缀匹配（bron → bronze）
+注意：bigram 取交集是子串匹配的近似（两个 bigram 可能分散在不同字段），与 LIKE 结果可能略有差异。
+
+存储结构：
+- 倒排表：token → array('I')，元素为内部文档槽位号，按追加顺序天然有序；
+  并行的 array('f') 保存按字段权重加权后的词频，供 BM25 相关度打分（见 search_ranking.py）
+- 每个槽位保存文物 ID 以及筛选/排序所需的属性（文化、地区、材质、年代文字以驻留字符串编号存储，
+  起止年份存为 array('i')），无需回查数据库即可完成筛选与统计
+- 增量更新：文物变化时旧槽位标记删除、追加新槽位；删除比例过高时整体重建
+
+环境变量：
+    SEARCH_INDEX_ENABLED   是否启用内存索引（默认 0）
+    SEARCH_INDEX_REBUILD   定期全量重建间隔秒数（默认 3600，用于同步导入脚本等外部写入）
+    SEARCH_INDEX_REFRESH_MAX  一次增量刷新的文物数上限，超过时改为全量重建（默认 20000）
+"""
+
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left
+
+from mysql.connector import Error
+
+from search_ranking import FIELD_WEIGHTS, bm25, idf
+
+SEARCH_INDEX_CONFIG = {
+    'enabled': os.getenv('SEARCH_INDEX_ENABLED', '0') == '1',
+    'rebuild_seconds': int(os.getenv('SEARCH_INDEX_REBUILD', 3600)),
+    'refresh_max': int(os.getenv('SEARCH_INDEX_REFRESH_MAX', 20000)),
+}
+
+# 前缀匹配最多展开的词数
+_MAX_PREFIX_EXPANSION = 50
+# 已删除槽位超过该比例时触发整体重建
+_COMPACT_RATIO = 0.2
+# 流式读取时每批取回的行数
+_FETCH_BATCH = 2000
+# 增量刷新时每条 IN 查询包含的文物 ID 数
+_REFRESH_BATCH = 1000
+# 年份缺失时在 array('i') 中使用的占位值
+_NO_YEAR = -(2 ** 31)
+
+_CJK_RUN_RE = re.compile(r'[㐀-䶿一-鿿豈-﫿]+')
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+# 建索引时读取的字段：文本字段参与分词，属性字段用于筛选、统计与排序
+_DOCUMENT_QUERY = """
+    SELECT
+        a.Artifact_PK, a.Title_CN, a.Title_EN, a.Description_CN,
+        a.Date_CN, a.Date_EN, a.Material, a.Classification,
+        a.Start_Year, a.End_Year,
+        p.Culture, p.Artist, p.Geography,
+        s.Museum_Name_CN
+    FROM ARTIFACTS a
+    LEFT JOIN PROPERTIES p ON a.Artifact_PK = p.Artifact_PK
+    LEFT JOIN SOURCES s ON a.Source_ID = s.Source_ID
+    {where}
+    ORDER BY a.Artifact_PK
+"""
+
+# 参与分词的列及其所属字段分组（列序号对应 _DOCUMENT_QUERY）
+_TEXT_FIELDS = (
+    (1, 'title'), (2, 'title'), (3, 'description'),
+    (4, 'metadata'), (5, 'metadata'), (6, 'metadata'), (7, 'metadata'),
+    (10, 'metadata'), (11, 'metadata'), (12, 'metadata'), (13, 'source'),
+)
+
+# SQL 搜索结果行（build_search_query(with_text=True)）的列及其字段分组
+_ROW_FIELDS = (
+    ('title', 'title'), ('title_en', 'title'), ('description', 'description'),
+    ('date_text', 'metadata'), ('culture_name', 'metadata'), ('artist', 'metadata'),
+    ('geography', 'metadata'), ('medium', 'metadata'), ('classification', 'metadata'),
+    ('museum_name', 'source'),
+)
+
+# 上述列中只用于打分、页面不展示的列
+_RANKING_ONLY_COLUMNS = ('title_en', 'description', 'artist', 'classification', 'museum_name')
+
+
+def count_tokens(text):
+    """文档分词：中文单字 + bigram，英文/数字单词；返回 {token: 出现次数}"""
+    counts = {}
+    if not text:
+        return counts
+    text = str(text)
+    for run in _CJK_RUN_RE.findall(text):
+        for token in run:
+            counts[token] = counts.get(token, 0) + 1
+        for i in range(len(run) - 1):
+            token = run[i:i + 2]
+            counts[token] = counts.get(token, 0) + 1
+    for token in _WORD_RE.findall(text.lower()):
+        counts[token] = counts.get(token, 0) + 1
+    return counts
+
+
+def document_terms(fields):
+    """
+    fields: (字段分组, 文本) 的序列
+    返回 ({token: 加权词频}, 加权文档长度)
+    """
+    weighted = {}
+    length = 0.0
+    for field, text in fields:
+        weight = FIELD_WEIGHTS[field]
+        for token, count in count_tokens(text).items():
+            weighted[token] = weighted.get(token, 0.0) + weight * count
+            length += weight * count
+    return weighted, length
+
+
+def tokenize_query(text):
+    """
+    查询分词：返回 (精确匹配的 token 列表, 需要前缀匹配的英文单词或 None)
+    """
+    exact = []
+    for run in _CJK_RUN_RE.findall(text):
+        if len(run) == 1:
+            exact.append(run)
+        else:
+            exact.extend(run[i:i + 2] for i in range(len(run) - 1))
+    words = _WORD_RE.findall(text.lower())
+    prefix = None
+    if words:
+        prefix = words.pop()
+    exact.extend(words)
+    return exact, prefix
+
+
+class SearchIndex:
+    """倒排索引本体（线程安全：读写均在同一把锁内完成，单次操作都很短）"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}
+        self._weights = {}
+        self._doc_ids = array('I')
+        self._slot_of = {}
+        self._deleted = set()
+        # 驻留字符串：编号 0 表示空值
+        self._strings = [None]
+        self._string_codes = {None: 0}
+        self._culture = array('I')
+        self._geography = array('I')
+        self._material = array('I')
+        self._date = array('I')
+        self._start_year = array('i')
+        self._end_year = array('i')
+        self._doc_len = array('f')
+        self._total_len = 0.0
+        self._sorted_words = None
+
+    @property
+    def size(self):
+        return len(self._slot_of)
+
+    @property
+    def needs_compaction(self):
+        return len(self._deleted) > max(1000, len(self._doc_ids) * _COMPACT_RATIO)
+
+    def _intern(self, value):
+        if value is not None:
+            value = str(value).strip() or None
+        code = self._string_codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._strings.append(value)
+            self._string_codes[value] = code
+        return code
+
+    def add_document(self, row, extra_texts=()):
+        """添加（或替换）一个文物文档；row 为 _DOCUMENT_QUERY 的一行"""
+        artifact_id = row[0]
+        fields = [(field, row[col]) for col, field in _TEXT_FIELDS]
+        fields.extend(('metadata', text) for text in extra_texts)
+        weighted, length = document_terms(fields)
+
+        with self._lock:
+            old_slot = self._slot_of.get(artifact_id)
+            if old_slot is not None:
+                self._deleted.add(old_slot)
+
+            slot = len(self._doc_ids)
+            self._doc_ids.append(artifact_id)
+            self._slot_of[artifact_id] = slot
+            self._culture.append(self._intern(row[10]))
+            self._geography.append(self._intern(row[12]))
+            self._material.append(self._intern(row[6]))
+            self._date.append(self._intern(row[4]))
+            self._start_year.append(_NO_YEAR if row[8] is None else int(row[8]))
+            self._end_year.append(_NO_YEAR if row[9] is None else int(row[9]))
+            self._doc_len.append(length)
+            self._total_len += length
+
+            for token, tf in weighted.items():
+                posting = self._postings.get(token)
+                if posting is None:
+                    posting = self._postings[token] = array('I')
+                    self._weights[token] = array('f')
+                    if self._sorted_words is not None and token.isascii():
+                        self._sorted_words = None
+                posting.append(slot)
+                self._weights[token].append(tf)
+
+    def remove_document(self, artifact_id):
+        with self._lock:
+            slot = self._slot_of.pop(artifact_id, None)
+            if slot is not None:
+                self._deleted.add(slot)
+
+    def _expand_prefix(self, prefix):
+        if self._sorted_words is None:
+            self._sorted_words = sorted(t for t in self._postings if t.isascii())
+        words = self._sorted_words
+        start = bisect_left(words, prefix)
+        expanded = []
+        for word in words[start:start + _MAX_PREFIX_EXPANSION]:
+            if not word.startswith(prefix):
+                break
+            expanded.append(word)
+        return expanded
+
+    def _match_slots(self, term):
+        """
+        返回 (匹配的槽位集合, 参与打分的 token 列表)；
+        关键词中没有可索引的内容时返回 (None, [])
+        """
+        exact, prefix = tokenize_query(term)
+        if not exact and not prefix:
+            return None, []
+
+        scoring_tokens = list(dict.fromkeys(exact))
+        postings = []
+        for token in scoring_tokens:
+            posting = self._postings.get(token)
+            if not posting:
+                return set(), []
+            postings.append(posting)
+
+        prefix_slots = None
+        if prefix:
+            prefix_slots = set()
+            for word in self._expand_prefix(prefix):
+                prefix_slots.update(self._postings[word])
+                scoring_tokens.append(word)
+            if not prefix_slots:
+                return set(), []
+
+        # 从最短的倒排表开始求交集
+        postings.sort(key=len)
+        if postings:
+            slots = set(postings[0])
+            for posting in postings[1:]:
+                slots.intersection_update(posting)
+                if not slots:
+                    return slots, []
+            if prefix_slots is not None:
+                slots &= prefix_slots
+        else:
+            slots = prefix_slots
+        return slots - self._deleted, scoring_tokens
+
+    def _score(self, slots, tokens):
+        """对匹配的槽位做 BM25 打分：逐个遍历查询词的倒排表，只累加命中集合内的文档"""
+        doc_count = len(self._doc_ids)
+        avg_len = self._total_len / doc_count if doc_count else 0.0
+        doc_len = self._doc_len
+        scores = dict.fromkeys(slots, 0.0)
+        for token in tokens:
+            posting = self._postings[token]
+            token_idf = idf(doc_count, len(posting))
+            for slot, tf in zip(posting, self._weights[token]):
+                if slot in scores:
+                    scores[slot] += bm25(tf, doc_len[slot], avg_len, token_idf)
+        return scores
+
+    def search(self, term):
+        """
+        在内存中检索关键词，返回与 SQL 搜索结果同形的行（不含标题与图片，带相关度 score），
+        按 artifact_id 降序排列；无法用索引处理时返回 None（调用方退回 SQL）
+        """
+        with self._lock:
+            slots, tokens = self._match_slots(term)
+            if slots is None:
+                return None
+            scores = self._score(slots, tokens)
+            strings = self._strings
+            rows = []
+            for slot, score in scores.items():
+                start_year = self._start_year[slot]
+                end_year = self._end_year[slot]
+                rows.append({
+                    'artifact_id': self._doc_ids[slot],
+                    'date_text': strings[self._date[slot]],
+                    'start_year': None if start_year == _NO_YEAR else start_year,
+                    'end_year': None if end_year == _NO_YEAR else end_year,
+                    'culture_name': strings[self._culture[slot]],
+                    'geography': strings[self._geography[slot]],
+                    'medium': strings[self._material[slot]],
+                    'score': score,
+                })
+        rows.sort(key=lambda r: r['artifact_id'], reverse=True)
+        return rows
+
+
+def filter_by_year(rows, start_year, end_year):
+    """年代区间筛选，与 build_search_query 的 SQL 条件一致：[起始年份, 结束年份] 与所查区间重叠"""
+    if start_year is None or end_year is None:
+        return rows
+    return [r for r in rows
+            if r['start_year'] is not None and r['start_year'] <= end_year
+            and (r['end_year'] if r['end_year'] is not None else r['start_year']) >= start_year]
+
+
+def score_rows(rows, term):
+    """
+    SQL 搜索结果的相关度打分（未启用内存索引时使用）
+    没有全库统计，文档频率与平均长度按本次候选集合计算；结果写入每行的 score，
+    打分后丢弃只用于打分的文本列（描述等），减少搜索缓存的内存占用
+    """
+    exact, prefix = tokenize_query(term)
+    tokens = list(dict.fromkeys(exact))
+    docs = [document_terms((field, row.get(key)) for key, field in _ROW_FIELDS) for row in rows]
+    if not docs:
+        return rows
+
+    def token_tf(weighted, token, is_prefix):
+        if is_prefix:
+            return sum(tf for t, tf in weighted.items() if t.startswith(token))
+        return weighted.get(token, 0.0)
+
+    query = [(t, False) for t in tokens]
+    if prefix:
+        query.append((prefix, True))
+
+    doc_count = len(docs)
+    avg_len = sum(length for _, length in docs) / doc_count
+    for row in rows:
+        row['score'] = 0.0
+    for token, is_prefix in query:
+        tfs = [token_tf(weighted, token, is_prefix) for weighted, _ in docs]
+        token_idf = idf(doc_count, sum(1 for tf in tfs if tf > 0))
+        for row, tf, (_, length) in zip(rows, tfs, docs):
+            row['score'] += bm25(tf, length, avg_len, token_idf)
+    for row in rows:
+        for key in _RANKING_ONLY_COLUMNS:
+            row.pop(key, None)
+    return rows
+
+
+def _iter_documents(cursor, where='', params=()):
+    """流式读取文物，逐个返回 (row, extra_texts)；同一文物的多条 PROPERTIES 记录合并为一个文档"""
+    cursor.execute(_DOCUMENT_QUERY.format(where=where), params)
+    pending = None
+    extra = []
+    while True:
+        rows = cursor.fetchmany(_FETCH_BATCH)
+        if not rows:
+            break
+        for row in rows:
+            if pending is not None and row[0] == pending[0]:
+                extra.extend(row[c] for c in (10, 11, 12))
+                continue
+            if pending is not None:
+                yield pending, extra
+            pending, extra = row, []
+    if pending is not None:
+        yield pending, extra
+
+
+def _load_documents(cursor, index, where='', params=()):
+    """流式读取文物并写入索引"""
+    for row, extra in _iter_documents(cursor, where, params):
+        index.add_document(row, extra)
+
+
+class SearchIndexManager:
+    """
+    管理索引的生命周期：首次使用时在后台线程构建，定期全量重建，支持按文物 ID 增量刷新
+    get_connection: 返回数据库连接的函数（由调用方 close 归还）
+    """
+
+    def __init__(self, get_connection, enabled=None, rebuild_seconds=None, refresh_max=None):
+        self._get_connection = get_connection
+        self.enabled = SEARCH_INDEX_CONFIG['enabled'] if enabled is None else enabled
+        self.rebuild_seconds = rebuild_seconds or SEARCH_INDEX_CONFIG['rebuild_seconds']
+        self.refresh_max = refresh_max or SEARCH_INDEX_CONFIG['refresh_max']
+        self._index = None
+        # 全量构建期间被刷新的文物 ID（不在构建时为 None）
+        self._pending = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    @property
+    def ready(self):
+        return self._index is not None
+
+    def build(self):
+        """
+        全量构建新索引，完成后整体替换旧索引
+        构建期间刷新过的文物（构建读取时可能还是旧数据）在替换前重新读取到新索引中
+        """
+        with self._lock:
+            self._pending = set()
+        index = SearchIndex()
+        if not self._load(index):
+            with self._lock:
+                self._pending = None
+            return False
+        while True:
+            with self._lock:
+                pending, self._pending = self._pending, set()
+                if len(pending) > self.refresh_max:
+                    # 刷新过多时不再逐个补读，替换后立即再重建一次
+                    self._wakeup.set()
+                    pending = None
+                if not pending:
+                    self._index = index
+                    self._pending = None
+                    break
+            self._refresh_index(index, sorted(pending))
+        print(f"搜索索引已就绪：{index.size} 件文物")
+        return True
+
+    def _load(self, index):
+        """从数据库读取全部文物写入 index"""
+        conn = self._get_connection()
+        if conn is None:
+            return False
+        try:
+            cursor = conn.cursor()
+            _load_documents(cursor, index)
+            cursor.close()
+        except Error as e:
+            print(f"Error building search index: {e}")
+            return False
+        finally:
+            conn.close()
+        return True
+
+    def refresh_artifacts(self, artifact_ids):
+        """
+        文物新增、更新或删除后调用：重新读取这些文物并更新索引
+        按 _REFRESH_BATCH 个 ID 一批读取，一批全部读到后才替换索引中的旧文档（库中已不存在的从索引删除）；
+        读取出错时索引保留旧文档并安排全量重建。ID 数超过 refresh_max 时直接安排全量重建。
+        正在全量构建时同时记下这些 ID，由 build() 在替换前应用到新索引
+        """
+        artifact_ids = list(dict.fromkeys(int(i) for i in artifact_ids if i is not None))
+        if not artifact_ids:
+            return
+        with self._lock:
+            index = self._index
+            if self._pending is not None:
+                self._pending.update(artifact_ids)
+        if index is None:
+            return
+        if len(artifact_ids) > self.refresh_max:
+            self._wakeup.set()
+            return
+        self._refresh_index(index, artifact_ids)
+
+    def _refresh_index(self, index, artifact_ids):
+        conn = self._get_connection()
+        if conn is None:
+            return
+        try:
+            cursor = conn.cursor()
+            for i in range(0, len(artifact_ids), _REFRESH_BATCH):
+                chunk = artifact_ids[i:i + _REFRESH_BATCH]
+                placeholders = ','.join(['%s'] * len(chunk))
+                documents = list(_iter_documents(cursor, f"WHERE a.Artifact_PK IN ({placeholders})", chunk))
+                for row, extra in documents:
+                    index.add_document(row, extra)
+                for artifact_id in set(chunk).difference(row[0] for row, _ in documents):
+                    index.remove_document(artifact_id)
+            cursor.close()
+        except Error as e:
+            print(f"Error refreshing search index: {e}")
+            self._wakeup.set()
+        finally:
+            conn.close()
+        if index.needs_compaction:
+            self._wakeup.set()
+
+    def search(self, term):
+        """索引未启用或未就绪时返回 None，调用方应走 SQL 搜索"""
+        if not self.enabled:
+            return None
+        self.ensure_started()
+        index = self._index
+        if index is None:
+            return None
+        return index.search(term)
+
+    def ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='search-index', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self.build()
+            self._wakeup.wait(self.rebuild_seconds)
+            self._wakeup.clear()
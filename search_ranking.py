@@ -0,0 +1,48 @@
+"""
+搜索相关度排序
+BM25 打分（带字段权重，近似 BM25F）：
+- 各字段的词频先乘以字段权重再相加，标题命中的权重高于描述命中
+- 文档长度同样按字段权重加权，用于长度归一化
+- 只需要前 k 条结果时用堆取 top-k，不对全部结果排序
+
+环境变量：
+    SEARCH_BM25_K1   词频饱和参数（默认 1.2）
+    SEARCH_BM25_B    长度归一化参数（默认 0.75）
+"""
+
+import heapq
+import math
+import os
+
+RANKING_CONFIG = {
+    'k1': float(os.getenv('SEARCH_BM25_K1', 1.2)),
+    'b': float(os.getenv('SEARCH_BM25_B', 0.75)),
+}
+
+# 字段分组及其权重
+FIELD_WEIGHTS = {
+    'title': 3.0,        # 中英文标题
+    'metadata': 1.5,     # 年代、文化、艺术家、地区、材质、分类
+    'description': 1.0,  # 中文描述
+    'source': 0.5,       # 博物馆名称
+}
+
+
+def idf(doc_count, doc_freq):
+    """逆文档频率（BM25 的平滑形式，恒为正）"""
+    return math.log(1 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+
+
+def bm25(tf, doc_len, avg_len, idf_value):
+    """单个词对单个文档的 BM25 得分；tf 与 doc_len 均为按字段权重加权后的值"""
+    if tf <= 0:
+        return 0.0
+    k1 = RANKING_CONFIG['k1']
+    b = RANKING_CONFIG['b']
+    norm = 1 - b + b * (doc_len / avg_len if avg_len else 1.0)
+    return idf_value * tf * (k1 + 1) / (tf + k1 * norm)
+
+
+def top_k(rows, k):
+    """按 score 取前 k 条（分数相同时新入库的在前），返回已排好序的列表"""
+    return heapq.nlargest(k, rows, key=lambda r: (r.get('score', 0.0), r.get('artifact_id', 0)))
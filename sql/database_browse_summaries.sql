@@ -0,0 +1,21 @@
+USE project;
+
+-- ============================================
+-- 浏览页汇总表
+-- 文化、地理、年代浏览页读取此表（每个维度取值一行），不再每次访问都对三表连接分组统计
+-- 应用启动时（init_browse_summaries）会自动创建并全量刷新；
+-- 后台导入、替换图像后增量刷新，导入脚本结束时全量刷新，也可执行 flask refresh-browse-summaries
+-- 需先执行 database_migration_era_columns.sql 与 database_migration_dimension_tables.sql
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS BROWSE_SUMMARIES (
+    Dimension                  VARCHAR(20) NOT NULL COMMENT '维度：culture / geography / era。',
+    Value_Group                VARCHAR(20) NOT NULL DEFAULT '' COMMENT '分组：年代维度为纪年体系（东方纪年 / 西方纪年），其他维度为空。',
+    Value_Name                 VARCHAR(100) NOT NULL COMMENT '取值：文化名称 / 地理名称 / 年代分类。',
+    Value_ID                   INT NULL COMMENT '文化、地理维度对应 CULTURES / GEOGRAPHIES 的稳定 ID。',
+    Artifact_Count             INT NOT NULL DEFAULT 0 COMMENT '该取值下的文物数。',
+    Representative_Version_PK  INT NULL COMMENT '代表图：IMAGE_VERSIONS 的主键。',
+    Updated_Time               TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '最后刷新时间。',
+    PRIMARY KEY (Dimension, Value_Group, Value_Name),
+    KEY idx_browse_summaries_id (Dimension, Value_ID)
+) COMMENT '浏览页汇总（物化统计）';
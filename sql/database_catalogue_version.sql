@@ -0,0 +1,16 @@
+USE project;
+
+-- ============================================
+-- 目录版本号：搜索缓存的失效依据
+-- 后台导入、替换图像以及 database/ 下的导入脚本每次写入后递增 Version，
+-- 各应用进程发现版本变化后清空搜索缓存（见 search_cache.py）
+-- 应用启动时（init_catalogue_version）也会自动检查并创建
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS CATALOGUE_VERSION (
+    Id TINYINT PRIMARY KEY,
+    Version BIGINT NOT NULL DEFAULT 0,
+    Updated_Time TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) COMMENT = '目录版本号（单行）';
+
+INSERT IGNORE INTO CATALOGUE_VERSION (Id, Version) VALUES (1, 0);
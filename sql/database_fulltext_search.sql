@@ -0,0 +1,20 @@
+USE project;
+
+-- ============================================
+-- 全文检索：为搜索字段建立 ngram FULLTEXT 索引
+-- 执行后设置环境变量 SEARCH_MODE=fulltext 启用（见 db_config.SEARCH_CONFIG）
+-- 未执行本脚本时搜索会自动退回 LIKE 模式
+--
+-- ngram 分词的词元长度由服务器参数 ngram_token_size 决定（默认 2，适合中文），
+-- 修改该参数后需要重建索引
+-- ============================================
+
+ALTER TABLE ARTIFACTS
+ADD FULLTEXT INDEX ft_artifacts_search (
+    Title_CN, Title_EN, Description_CN, Date_CN, Date_EN, Material, Classification
+) WITH PARSER ngram;
+
+ALTER TABLE PROPERTIES
+ADD FULLTEXT INDEX ft_properties_search (
+    Culture, Artist, Geography
+) WITH PARSER ngram;
@@ -0,0 +1,42 @@
+USE project;
+
+-- ============================================
+-- 迁移：文化 / 地理维度表
+-- PROPERTIES.Culture / Geography 的每个不同取值分配稳定的整数 ID，
+-- 文化、地理详情页（/culture/<id>、/geography/<id>）按主键取名称、按外键索引筛选文物
+-- 应用启动时（init_lookup_tables）也会自动检查并创建，并为外键为空的属性行回填；
+-- 导入（后台导入、database/ 与 database_npm/ 下的导入脚本）时同步维护
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS CULTURES (
+    Culture_ID    INT AUTO_INCREMENT PRIMARY KEY COMMENT '主键。文化的稳定编号（用于 /culture/<id>）。',
+    Culture_Name  VARCHAR(100) NOT NULL COMMENT '文化名称（PROPERTIES.Culture 去除首尾空白后的值）。',
+    UNIQUE KEY uk_cultures_name (Culture_Name)
+) COMMENT '文化维度表';
+
+CREATE TABLE IF NOT EXISTS GEOGRAPHIES (
+    Geography_ID    INT AUTO_INCREMENT PRIMARY KEY COMMENT '主键。地理区域的稳定编号（用于 /geography/<id>）。',
+    Geography_Name  VARCHAR(100) NOT NULL COMMENT '地理名称（PROPERTIES.Geography 去除首尾空白后的值）。',
+    UNIQUE KEY uk_geographies_name (Geography_Name)
+) COMMENT '地理维度表';
+
+ALTER TABLE PROPERTIES
+ADD COLUMN Culture_ID INT NULL COMMENT '外键。链接到 CULTURES 表（由 Culture 同步）。',
+ADD COLUMN Geography_ID INT NULL COMMENT '外键。链接到 GEOGRAPHIES 表（由 Geography 同步）。',
+ADD CONSTRAINT fk_prop_culture FOREIGN KEY (Culture_ID) REFERENCES CULTURES (Culture_ID) ON DELETE SET NULL,
+ADD CONSTRAINT fk_prop_geography FOREIGN KEY (Geography_ID) REFERENCES GEOGRAPHIES (Geography_ID) ON DELETE SET NULL;
+
+CREATE INDEX idx_properties_culture_id ON PROPERTIES (Culture_ID, Artifact_PK);
+CREATE INDEX idx_properties_geography_id ON PROPERTIES (Geography_ID, Artifact_PK);
+
+-- 回填现有数据
+INSERT IGNORE INTO CULTURES (Culture_Name)
+SELECT DISTINCT TRIM(Culture) FROM PROPERTIES WHERE Culture IS NOT NULL AND TRIM(Culture) != '';
+
+INSERT IGNORE INTO GEOGRAPHIES (Geography_Name)
+SELECT DISTINCT TRIM(Geography) FROM PROPERTIES WHERE Geography IS NOT NULL AND TRIM(Geography) != '';
+
+UPDATE PROPERTIES p
+LEFT JOIN CULTURES c ON c.Culture_Name = TRIM(p.Culture)
+LEFT JOIN GEOGRAPHIES g ON g.Geography_Name = TRIM(p.Geography)
+SET p.Culture_ID = c.Culture_ID, p.Geography_ID = g.Geography_ID;
@@ -0,0 +1,15 @@
+USE project;
+
+-- ============================================
+-- 迁移：年代分类列
+-- 年代分类（东方纪年/西方纪年 + 朝代或时期）在写入时计算并保存，
+-- 年代浏览页和搜索的年代筛选按索引查询，不再逐行在 Python 中分类
+-- 应用启动时（init_era_columns）也会自动检查并添加，并为尚未分类的文物补算；
+-- 分类规则变化后可执行 flask backfill-eras 全量重算
+-- ============================================
+
+ALTER TABLE ARTIFACTS
+ADD COLUMN Era_System VARCHAR(10) NULL COMMENT '纪年体系：东方纪年 / 西方纪年（由 Date_CN 计算，见 era_classifier.py）',
+ADD COLUMN Era_Bucket VARCHAR(10) NULL COMMENT '年代分类：宋、明、清… / 古代、中世纪…（Date_CN 为空时为 NULL）';
+
+CREATE INDEX idx_artifacts_era ON ARTIFACTS (Era_System, Era_Bucket, Artifact_PK);
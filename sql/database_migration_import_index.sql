@@ -0,0 +1,10 @@
+USE project;
+
+-- ============================================
+-- 迁移：导入去重索引
+-- 后台批量导入（bulk_import.py）按 Source_ID + Original_ID 把暂存表与 ARTIFACTS 连接，
+-- 区分新增与已存在的文物；该索引让连接按索引查找，而不是逐批扫描整张 ARTIFACTS
+-- 应用启动时（init_import_index）也会自动检查并创建
+-- ============================================
+
+CREATE INDEX idx_artifacts_source_original ON ARTIFACTS (Source_ID, Original_ID);
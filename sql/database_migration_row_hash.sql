@@ -0,0 +1,11 @@
+USE project;
+
+-- ============================================
+-- 迁移：导入内容哈希
+-- 导入器（database/loader.py）为每一行清洗后的源数据计算内容哈希并保存在 Row_Hash，
+-- 增量导入（--delta）按 Source_ID + Original_ID 比对哈希，只新增和更新有变化的文物
+-- 导入器启动时（ensure_row_hash_column）也会自动检查并添加
+-- ============================================
+
+ALTER TABLE ARTIFACTS
+ADD COLUMN Row_Hash CHAR(40) NULL COMMENT '导入时源数据行的内容哈希。';
@@ -0,0 +1,15 @@
+USE project;
+
+-- ============================================
+-- 迁移：搜索筛选列
+-- 搜索的文化 / 材质 / 地区筛选直接比较原列（Culture IN (...)），不再对列套用 TRIM()，
+-- 以便使用下面的索引。先去除已有数据两端的空白（导入器与后台导入写入时已去除），再建立索引
+-- ============================================
+
+UPDATE PROPERTIES SET Culture = TRIM(Culture) WHERE Culture <> TRIM(Culture);
+UPDATE PROPERTIES SET Geography = TRIM(Geography) WHERE Geography <> TRIM(Geography);
+UPDATE ARTIFACTS SET Material = TRIM(Material) WHERE Material <> TRIM(Material);
+
+CREATE INDEX idx_properties_culture ON PROPERTIES (Culture, Artifact_PK);
+CREATE INDEX idx_properties_geography ON PROPERTIES (Geography, Artifact_PK);
+CREATE INDEX idx_artifacts_material ON ARTIFACTS (Material, Artifact_PK);
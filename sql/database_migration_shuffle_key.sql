@@ -0,0 +1,12 @@
+USE project;
+
+-- ============================================
+-- 迁移：随机浏览的持久化排列键
+-- 随机浏览按 Shuffle_Key 做索引范围扫描分页，替代 ORDER BY RAND()
+-- 应用启动时（init_shuffle_key）也会自动检查并添加
+-- ============================================
+
+ALTER TABLE ARTIFACTS
+ADD COLUMN Shuffle_Key DOUBLE NOT NULL DEFAULT (RAND()) COMMENT '随机浏览的排列键，取值 [0, 1)，可通过 flask reshuffle 重新生成';
+
+CREATE INDEX idx_artifacts_shuffle_key ON ARTIFACTS (Shuffle_Key);
@@ -0,0 +1,30 @@
+USE project;
+
+-- ============================================
+-- 迁移：年代区间筛选
+-- 搜索的年代筛选改为区间重叠：Start_Year <= 所查结束年 AND Effective_End_Year >= 所查起始年
+-- Effective_End_Year 为 End_Year（为空时取 Start_Year）的存储生成列，两个复合索引
+-- 分别服务于「较早的区间」（按 Start_Year 范围扫描）与「较晚的区间」（按 Effective_End_Year 范围扫描）
+-- 朝代（宋、明、清……）的年份区间保存在 DYNASTIES 表，搜索的 ?dynasty= 参数按此换算
+-- 应用启动时（init_year_interval）也会自动检查并添加
+-- ============================================
+
+ALTER TABLE ARTIFACTS
+ADD COLUMN Effective_End_Year INT AS (COALESCE(End_Year, Start_Year)) STORED COMMENT '年代区间的结束年份（End_Year 为空时取 Start_Year）';
+
+CREATE INDEX idx_artifacts_year_start ON ARTIFACTS (Start_Year, Effective_End_Year);
+CREATE INDEX idx_artifacts_year_end ON ARTIFACTS (Effective_End_Year, Start_Year);
+
+CREATE TABLE IF NOT EXISTS DYNASTIES (
+    Dynasty_Name  VARCHAR(20) PRIMARY KEY COMMENT '朝代名称（搜索参数 ?dynasty= 的取值）。',
+    Start_Year    INT NOT NULL COMMENT '起始年份（负数表示公元前）。',
+    End_Year      INT NOT NULL COMMENT '结束年份。'
+) COMMENT '朝代年份区间';
+
+INSERT IGNORE INTO DYNASTIES (Dynasty_Name, Start_Year, End_Year) VALUES
+('汉', -202, 220),
+('唐', 618, 907),
+('宋', 960, 1279),
+('元', 1271, 1368),
+('明', 1368, 1644),
+('清', 1644, 1911);
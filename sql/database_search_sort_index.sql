@@ -0,0 +1,9 @@
+USE project;
+
+-- ============================================
+-- 迁移：搜索排序索引
+-- 搜索按年代排序（sort=era_asc / era_desc）时 ORDER BY Start_Year, Artifact_PK，
+-- 该索引让分页查询可以按索引顺序读取，并覆盖“同年份按入库倒序”的次序
+-- ============================================
+
+CREATE INDEX idx_artifacts_start_year ON ARTIFACTS (Start_Year, Artifact_PK);
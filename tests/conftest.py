@@ -0,0 +1,8 @@
+import os
+import sys
+
+# 测试直接导入项目根目录与 database/ 下的模块
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (_ROOT, os.path.join(_ROOT, 'database')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,206 @@
+"""bulk_import：整列清洗与校验、集合式写入的重复行合并与出错二分重试"""
+
+import pandas as pd
+from mysql.connector import Error
+
+import bulk_import
+from bulk_import import (INT_MAX, STAGING_COLUMNS, _apply_with_retry, import_dataframe,
+                         prepare_import_frame, validate_chunks)
+
+_ORIGINAL_ID = STAGING_COLUMNS.index('Original_ID')
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeCursor:
+    """
+    模拟暂存表：记录写入 import_staging 的行，ARTIFACTS 中已有 existing 中的编号；
+    暂存表含 failing 中的编号时写入 ARTIFACTS 失败（模拟该行违反约束）
+    """
+
+    def __init__(self, existing=(), failing=()):
+        self.existing = set(existing)
+        self.failing = set(failing)
+        self.staged = []
+        self.batches = []
+        self.logged = []
+
+    def execute(self, sql, params=None):
+        sql = ' '.join(sql.split())
+        if sql.startswith('DELETE FROM import_staging'):
+            self.staged = []
+        elif sql.startswith('INSERT INTO ARTIFACTS'):
+            bad = [row[_ORIGINAL_ID] for row in self.staged if row[_ORIGINAL_ID] in self.failing]
+            if bad:
+                raise Error(msg=f"bad row {bad[0]}", errno=1406)
+            self.batches.append([row[_ORIGINAL_ID] for row in self.staged])
+
+    def executemany(self, sql, rows):
+        if 'import_staging' in sql:
+            self.staged.extend(rows)
+        elif 'LOGS' in sql:
+            self.logged.extend(rows)
+
+    def fetchall(self):
+        return [
+            (row[0], 1000 + row[0], 1 if row[_ORIGINAL_ID] in self.existing else 0)
+            for row in self.staged
+        ]
+
+
+def _frame(**columns):
+    n = len(next(iter(columns.values())))
+    base = {'Source_ID': ['1'] * n, 'Original_ID': [f'A{i}' for i in range(n)], 'Title_CN': ['碗'] * n}
+    base.update(columns)
+    return pd.DataFrame(base)
+
+
+def test_integer_columns_outside_int_range_fail_before_sql():
+    df = _frame(Source_ID=['1', '99999999999', '1', str(INT_MAX)],
+                Start_Year=['1e30', '12.7', '-2147483649', None])
+    records, failures = prepare_import_frame(df)
+    assert [(row, message) for row, _, message in failures] == [
+        (2, 'Start_Year 超出整数范围'),
+        (3, 'Source_ID 超出整数范围'),
+        (4, 'Start_Year 超出整数范围'),
+    ]
+    assert records['Source_ID'].tolist() == [INT_MAX]
+    assert records['Start_Year'].isna().all()
+
+
+def test_invalid_and_out_of_range_integers_are_reported_separately():
+    report = validate_chunks([_frame(Source_ID=['x', '99999999999', '1'], End_Year=['1', '2', '3e10'])])
+    assert report['rule_counts'] == {
+        'Source_ID 不是有效的整数': 1,
+        'Source_ID 超出整数范围': 1,
+        'End_Year 超出整数范围': 1,
+    }
+    assert (report['total'], report['valid'], report['failed']) == (3, 0, 3)
+
+
+def test_int_range_is_mysql_int():
+    assert (bulk_import.INT_MIN, bulk_import.INT_MAX) == (-2147483648, 2147483647)
+
+
+def test_validation_report_keeps_only_the_first_errors():
+    df = _frame(Title_CN=[None] * 5 + ['碗'])
+    seen = []
+    report = validate_chunks([df.iloc[:3], df.iloc[3:]], error_limit=2,
+                             progress=lambda rows, r: seen.append((rows, r['failed'])))
+    assert report['errors'] == ['行 2: Title_CN 不能为空', '行 3: Title_CN 不能为空']
+    assert (report['failed'], report['errors_omitted']) == (5, 3)
+    assert seen == [(3, 3), (6, 5)]
+
+
+def test_prepare_import_frame_coerces_whole_columns():
+    df = _frame(Source_ID=[' 3 ', 4.0, '5.9'],
+                Title_CN=['  碗 ', '瓶', '盘'],
+                Start_Year=['12.7', 'x', None],
+                Size_Value=['66 x 35.6 x 27.3', 12, 'abc'],
+                Culture=[' 唐 ', '', None])
+    records, failures = prepare_import_frame(df, first_row=10)
+    assert failures == []
+    assert records['Row_Num'].tolist() == [10, 11, 12]
+    assert records['Source_ID'].tolist() == [3, 4, 5]
+    assert records['Title_CN'].tolist() == ['碗', '瓶', '盘']
+    assert records['Start_Year'].tolist()[0] == 12 and records['Start_Year'].isna().tolist() == [False, True, True]
+    assert records['Size_Value'].tolist()[:2] == [66.0, 12.0] and pd.isna(records['Size_Value'][2])
+    assert records['Culture'].tolist()[0] == '唐' and records['Culture'].isna().tolist() == [False, True, True]
+    assert list(records.columns) == STAGING_COLUMNS
+
+
+def test_prepare_import_frame_reports_first_broken_rule():
+    df = _frame(Source_ID=[None, '1', '1'], Original_ID=['A', None, 'C'], Title_CN=[None, '瓶', '盘'])
+    records, failures = prepare_import_frame(df)
+    assert failures == [(2, None, 'Title_CN 不能为空'), (3, '瓶', 'Original_ID 不能为空')]
+    assert records['Original_ID'].tolist() == ['C']
+
+
+def _staged(cursor):
+    return [dict(zip(STAGING_COLUMNS + ['Is_Duplicate'], row)) for row in cursor.staged]
+
+
+def test_update_mode_collapses_duplicate_keys_to_last_non_null_values():
+    df = _frame(Original_ID=['A', 'B', 'A', 'A'],
+                Title_CN=['甲', '乙', '甲2', '甲3'],
+                Material=['铜', None, None, '玉'],
+                Culture=['唐', None, '宋', None])
+    cursor = FakeCursor()
+    result = import_dataframe(FakeConnection(), cursor, df, 'update', batch_size=100)
+
+    staged = _staged(cursor)
+    assert [(row['Row_Num'], row['Is_Duplicate']) for row in staged] == [(2, 0), (3, 0), (4, 1), (5, 1)]
+    # 第一次出现的行号代表该文物，文物与属性的每列取最后一个非空值；重复行不再带这些字段
+    first = staged[0]
+    assert (first['Title_CN'], first['Material'], first['Culture']) == ('甲3', '玉', '宋')
+    assert all(row['Title_CN'] is None and row['Culture'] is None for row in staged[2:])
+    assert (result['inserted'], result['updated'], result['failed']) == (2, 2, 0)
+
+
+def test_update_mode_stages_sizes_and_images_of_each_duplicate_row():
+    df = _frame(Original_ID=['A', 'A', 'A'],
+                Size_Type=['高', '宽', '高'], Size_Value=['25', '30', '26'], Size_Unit=['cm', None, 'mm'],
+                Image_Link=['x', None, 'z'], Local_Path=[None, 'y', None],
+                Version_Type=[None, 'Thumbnail', 'Original'])
+    cursor = FakeCursor()
+    result = import_dataframe(FakeConnection(), cursor, df, 'update', batch_size=100)
+
+    staged = _staged(cursor)
+    dimensions = [(row['Size_Type'], row['Size_Value'], row['Size_Unit']) for row in staged]
+    images = [(row['Image_Link'], row['Local_Path']) for row in staged]
+    # 尺寸与图像不跨行拼接：不同类型各自一行，同一尺寸类型 / 图像版本只保留最后一行
+    assert dimensions == [(None, None, None), ('宽', 30.0, None), ('高', 26.0, 'mm')]
+    assert images == [(None, None), (None, 'y'), ('z', None)]
+    assert (result['inserted'], result['updated'], result['failed']) == (1, 2, 0)
+
+
+def test_duplicate_rows_fail_with_their_first_row():
+    df = _frame(Original_ID=['A', 'B', 'A'], Title_CN=['甲', '乙', '甲2'], Size_Type=[None, None, '高'],
+                Size_Value=[None, None, '3'])
+    cursor = FakeCursor(failing={'A'})
+    result = import_dataframe(FakeConnection(), cursor, df, 'update', 'u', batch_size=1)
+    assert (result['inserted'], result['updated'], result['failed']) == (1, 0, 2)
+    assert result['errors'] == ['行 2: 1406: bad row A', '行 4: 1406: bad row A']
+
+
+def test_skip_mode_keeps_first_occurrence_and_counts_duplicates_as_skipped():
+    df = _frame(Original_ID=['A', 'A', 'B'], Title_CN=['甲', '甲2', '乙'])
+    cursor = FakeCursor(existing={'B'})
+    result = import_dataframe(FakeConnection(), cursor, df, 'skip', batch_size=100)
+    assert [row[STAGING_COLUMNS.index('Title_CN')] for row in cursor.staged] == ['甲', '乙']
+    assert (result['inserted'], result['skipped'], result['failed']) == (1, 2, 0)
+
+
+def test_apply_with_retry_bisects_down_to_failing_rows():
+    records, _ = prepare_import_frame(_frame(Original_ID=[f'A{i}' for i in range(8)]))
+    rows = bulk_import._to_rows(records)
+    conn, cursor = FakeConnection(), FakeCursor(failing={'A2', 'A7'})
+
+    statuses, failures = _apply_with_retry(conn, cursor, rows, 'skip', 'u')
+
+    assert sorted(statuses) == [2, 3, 5, 6, 7, 8]  # 行号 = 编号 + 2，A2、A7 失败
+    assert [(row[_ORIGINAL_ID], message) for row, message in failures] == \
+        [('A2', '1406: bad row A2'), ('A7', '1406: bad row A7')]
+    # 成功的子批各提交一次；每次失败都回滚
+    assert sorted(id for batch in cursor.batches for id in batch) == ['A0', 'A1', 'A3', 'A4', 'A5', 'A6']
+    assert conn.commits == len(cursor.batches)
+    assert conn.rollbacks == 7
+
+
+def test_import_dataframe_counts_and_logs_rows_that_fail_in_sql():
+    df = _frame(Original_ID=['A', 'B', 'C'], Title_CN=['甲', '乙', '丙'])
+    cursor = FakeCursor(failing={'B'})
+    result = import_dataframe(FakeConnection(), cursor, df, 'skip', 'u', batch_size=100)
+    assert (result['inserted'], result['failed']) == (2, 1)
+    assert result['errors'] == ['行 3: 1406: bad row B']
+    assert cursor.logged == [('u', '批量导入失败 - 第3行: 乙. 错误: 1406: bad row B')]
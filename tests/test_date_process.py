@@ -0,0 +1,61 @@
+"""parse_date_column（整列解析）与 parse_date_string（逐行解析）的一致性及有意的差异"""
+
+import pandas as pd
+import pytest
+
+from date_process import _MAX_NUMBER, parse_date_column, parse_date_string
+
+# 含数字的值：两种实现的规则相同
+SHARED_CASES = [
+    '9世纪', '九世纪', '十世纪', '18世纪', '12世纪晚期',
+    '公元前1世纪', '公元前3世纪', '约公元前1世纪',
+    '1890-1896', '1775-79', '1895-05', '1999-01', '500-550', '1368至1644',
+    '公元前221-前207年', '公元前221–前207年', 'B.C. 500',
+    '约1600年', '1864', '公元1725年', '1736–95年', '明（1368–1644年）',
+    '日期为伊斯兰历1119年/西元 1707 年',
+]
+
+
+def _as_tuples(frame):
+    return [
+        tuple(None if pd.isna(value) else int(value) for value in row)
+        for row in frame[['start_year', 'end_year']].itertuples(index=False, name=None)
+    ]
+
+
+def test_matches_row_parser_on_shared_rules():
+    assert _as_tuples(parse_date_column(SHARED_CASES)) == [parse_date_string(v) for v in SHARED_CASES]
+
+
+def test_repeated_and_missing_values_keep_input_order():
+    dates = pd.Series(['1864', None, '9世纪', '1864', '', None], index=[10, 11, 12, 13, 14, 15])
+    result = parse_date_column(dates)
+    assert list(result.index) == list(dates.index)
+    assert _as_tuples(result) == [(1864, 1864), (None, None), (800, 899), (1864, 1864), (None, None), (None, None)]
+
+
+@pytest.mark.parametrize('value', [str(_MAX_NUMBER), '12345678901234567890'])
+def test_oversized_numbers_are_unparsed(value):
+    # 有意的差异：逐行版本原样返回超出 INT 范围的数字，整列版本视为无法解析
+    assert parse_date_string(value) == (int(value), int(value))
+    assert _as_tuples(parse_date_column([value])) == [(None, None)]
+
+
+@pytest.mark.parametrize('value, years', [
+    ('清', (1644, 1912)),
+    ('清代', (1644, 1912)),
+    ('明 宣德', (1368, 1644)),
+    ('唐朝', (618, 907)),
+    ('战国时期', (-475, -221)),
+    ('西周晚期', (-1046, -771)),
+    ('南宋', (1127, 1279)),
+])
+def test_dynasty_names_are_mapped(value, years):
+    # 有意的差异：逐行版本不处理不含数字的值，整列版本按朝代对照表换算
+    assert parse_date_string(value) == (None, None)
+    assert _as_tuples(parse_date_column([value])) == [years]
+
+
+@pytest.mark.parametrize('value', ['公元前', '公元后', '西元', '纪元前', '明治时代', '元年', '古代'])
+def test_non_dynasty_text_is_unparsed(value):
+    assert _as_tuples(parse_date_column([value])) == [(None, None)]
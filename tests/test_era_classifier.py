@@ -0,0 +1,108 @@
+"""classify_many（预编译规则 + 缓存）与原逐条关键字判断的分类结果一致"""
+
+import itertools
+import re
+
+from era_classifier import classify_many, normalize_era_from_date_cn
+
+
+# --- 原实现（预编译之前）的分类规则，作为对照 ---
+_REF_EAST_KEYWORDS = [
+    "宋", "北宋", "南宋", "明", "清", "元", "唐", "漢", "汉", "秦", "晉", "晋", "隋",
+    "康熙", "雍正", "乾隆", "嘉慶", "道光", "咸豐", "同治", "光緒", "宣統", "錢", "銭"
+]
+_REF_CN = {'一': 1, '二': 2, '三': 3, '四': 4, '五': 5, '六': 6, '七': 7, '八': 8, '九': 9, '十': 10}
+
+
+def _ref_cn_century(cn_str):
+    s = cn_str.replace('世紀', '').replace('世纪', '').strip()
+    if not s: return 0
+    if s.isdigit(): return int(s)
+    if len(s) == 1: return _REF_CN.get(s, 0)
+    if len(s) == 2:
+        if s[0] == '十': return 10 + _REF_CN.get(s[1], 0)
+        if s[1] == '十': return _REF_CN.get(s[0], 0) * 10
+    if len(s) == 3:
+        return _REF_CN.get(s[0], 0) * 10 + _REF_CN.get(s[2], 0)
+    return 0
+
+
+def _ref_century_bucket(cent):
+    if cent <= 4: return "古代"
+    if cent <= 15: return "中世纪"
+    if cent <= 18: return "近世"
+    if cent == 19: return "近代"
+    return "现代"
+
+
+def _ref_east_bucket(s):
+    if "宋" in s: return "宋"
+    if any(k in s for k in ["康熙", "雍正", "乾隆", "嘉慶", "道光", "咸豐", "同治", "光緒", "清"]): return "清"
+    if "明" in s: return "明"
+    if "元" in s: return "元"
+    if "唐" in s: return "唐"
+    if any(k in s for k in ["漢", "汉"]): return "漢"
+    return "其他東"
+
+
+def _ref_west_bucket(s):
+    s = s.strip()
+    if "公元前" in s or "BCE" in s or "BC" in s:
+        return "古代"
+    m_cent = re.search(r"(\d{1,2})\s*世紀|(\d{1,2})\s*世纪", s)
+    if m_cent:
+        return _ref_century_bucket(int(m_cent.group(1) or m_cent.group(2)))
+    m_cn_cent = re.search(r"([一二三四五六七八九十]+)\s*(世紀|世纪)", s)
+    if m_cn_cent:
+        cent = _ref_cn_century(m_cn_cent.group(1))
+        return _ref_century_bucket(cent) if cent > 0 else "其他西"
+    m_year = re.search(r"(\d{3,4})", s)
+    if m_year:
+        y = int(m_year.group(1))
+        if y <= 500: return "古代"
+        if y <= 1500: return "中世纪"
+        if y <= 1800: return "近世"
+        if y <= 1900: return "近代"
+        return "现代"
+    return "其他西"
+
+
+def reference_classify(date_cn):
+    if not date_cn:
+        return ("西方纪年", "其他西")
+    s = str(date_cn).strip()
+    if any(k in s for k in _REF_EAST_KEYWORDS):
+        return ("东方纪年", _ref_east_bucket(s))
+    return ("西方纪年", _ref_west_bucket(date_cn))
+
+
+REPRESENTATIVE = [
+    None, '', '  ',
+    # 东方：宋 / 明 / 清 的优先级与年号
+    '北宋', '南宋', '宋 元祐', '宋或明', '元末明初', '明 宣德', '明代', '明末清初', '清 乾隆', '清代',
+    '康熙年间', '雍正', '光緒', '乾隆（1736–95年）', '明（1368–1644年）', '宋（960–1279年）',
+    '唐', '唐代', '汉', '東漢', '元代', '秦', '晉', '隋', '宣統', '購錢', '清，十九世纪',
+    # 西方：公元前、世纪、年份
+    '公元前3世纪', '公元前1046–前771年', '约公元前1世纪', 'BCE 500', '500 BC',
+    '4世纪', '5世纪', '15世纪', '16世纪', '18世纪晚期', '19世纪', '20世纪', '21 世纪',
+    '十二世纪', '十九世紀', '二十世纪', '二十一世纪', '十世纪',
+    '410', '500', '501', '1500', '1501', '1707', '1800', '1801', '1893', '1900', '1901', '2001',
+    '约1700年', '1368–1644年', '日期为伊斯兰历1119年/西元 1707 年', '不详', '12', '明治时代',
+]
+
+
+def test_representative_dates_match_reference():
+    assert classify_many(REPRESENTATIVE) == [reference_classify(d) for d in REPRESENTATIVE]
+
+
+def test_generated_dates_match_reference():
+    prefixes = ['', '约', '公元前', '清 ', '明', '南宋', '日本 ', 'BC ']
+    cores = ['9世纪', '十五世纪', '1700', '1893年', '300', '二十世紀', '光緒年間', '']
+    suffixes = ['', '年', '晚期', '–1800', '（元）']
+    dates = [p + c + s for p, c, s in itertools.product(prefixes, cores, suffixes)]
+    assert classify_many(dates) == [reference_classify(d) for d in dates]
+
+
+def test_classify_many_matches_single_classification():
+    dates = REPRESENTATIVE * 3
+    assert classify_many(dates) == [normalize_era_from_date_cn(d) for d in dates]
@@ -0,0 +1,116 @@
+"""loader：按块写入出错时二分重试；增量导入按出现次序比对重复的编号"""
+
+import pandas as pd
+import pytest
+from mysql.connector import Error
+
+import loader
+
+
+class FakeConnection:
+    def __init__(self):
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _row(original_id, content='v'):
+    """prepare_rows 返回的一行：(文物字段, 属性字段, 图像字段, 尺寸列表, 内容哈希)"""
+    return ((original_id,), (), None, [], f"{original_id}:{content}")
+
+
+@pytest.fixture
+def fake_source(monkeypatch):
+    """替换读取与写入：written 记录每次成功写入的编号，failing 中的编号写入时出错"""
+    state = {'rows': [], 'failing': set(), 'written': [], 'updated': []}
+
+    def write(target):
+        def apply(conn, cursor, *args):
+            items = args[-1]
+            ids = [(item[1] if isinstance(item[0], int) else item)[0][0] for item in items]
+            bad = state['failing'].intersection(ids)
+            if bad:
+                raise Error(msg=f"Data too long for row {min(bad)}", errno=1406)
+            state[target].append(ids)
+        return apply
+
+    monkeypatch.setattr(loader, 'read_source', lambda profile, use_cache=None: pd.DataFrame(index=range(len(state['rows']))))
+    monkeypatch.setattr(loader, 'get_or_create_source', lambda *args, **kwargs: 1)
+    monkeypatch.setattr(loader, 'delete_source_rows', lambda *args: None)
+    monkeypatch.setattr(loader, '_iter_prepared',
+                        lambda source, df, workers, chunk_rows: iter([state['rows'][i:i + chunk_rows]
+                                                                     for i in range(0, len(state['rows']), chunk_rows)]))
+    monkeypatch.setattr(loader, 'write_rows', write('written'))
+    monkeypatch.setattr(loader, 'update_rows', write('updated'))
+    monkeypatch.setattr(loader, 'delete_artifacts', lambda conn, cursor, ids: state.__setitem__('deleted', ids))
+    return state
+
+
+class FakeCursor:
+    """只用于读取已有文物：返回 [(Artifact_PK, Original_ID, Row_Hash)]"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, sql, params=None):
+        pass
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_failed_chunk_is_bisected_down_to_the_bad_rows(fake_source):
+    fake_source['rows'] = [_row(f"A{i}") for i in range(10)]
+    fake_source['failing'] = {'A3', 'A8'}
+    conn = FakeConnection()
+
+    stats = loader.load_source(conn, None, 'MET', workers=1, chunk_rows=5)
+
+    written = sorted(i for ids in fake_source['written'] for i in ids)
+    assert written == ['A0', 'A1', 'A2', 'A4', 'A5', 'A6', 'A7', 'A9']
+    assert (stats['inserted'], stats['failed']) == (8, 2)
+    assert conn.rollbacks > 0
+
+
+def test_write_with_retry_reports_each_failing_item():
+    calls = []
+
+    def write(items):
+        calls.append(list(items))
+        if 'x' in items:
+            raise Error(msg='bad', errno=1406)
+
+    written, failures = loader._write_with_retry(FakeConnection(), write, ['a', 'x', 'b', 'c'])
+    assert written == ['a', 'b', 'c']
+    assert [(item, message) for item, message in failures] == [('x', '1406: bad')]
+    assert calls[0] == ['a', 'x', 'b', 'c']
+
+
+def test_write_with_retry_does_nothing_for_empty_chunks():
+    assert loader._write_with_retry(FakeConnection(), lambda items: None, []) == ([], [])
+
+
+def test_delta_matches_duplicate_ids_by_occurrence(fake_source):
+    # 全量导入按原样写入了重复的编号 D（主键 2、3）
+    fake_source['rows'] = [_row('A'), _row('D'), _row('D', 'w'), _row('B')]
+    cursor = FakeCursor([(1, 'A', 'A:v'), (2, 'D', 'D:v'), (3, 'D', 'D:v'), (4, 'B', 'B:v'), (5, 'C', 'C:v')])
+
+    stats = loader.load_source(FakeConnection(), cursor, 'MET', workers=1, chunk_rows=10,
+                               delta=True, delete_missing=True)
+
+    # 第二个 D 与主键 3 比对（内容有变化则原地更新）；只有源文件中已不存在的 C 被删除
+    assert (stats['unchanged'], stats['updated'], stats['inserted']) == (3, 1, 0)
+    assert stats['updated_ids'] == [3]
+    assert fake_source['deleted'] == [5]
+
+
+def test_delta_inserts_extra_occurrences_and_deletes_surplus_ones(fake_source):
+    fake_source['rows'] = [_row('D'), _row('E'), _row('E')]
+    cursor = FakeCursor([(1, 'D', 'D:v'), (2, 'D', 'D:v'), (3, 'E', 'E:v')])
+
+    stats = loader.load_source(FakeConnection(), cursor, 'MET', workers=1, chunk_rows=10,
+                               delta=True, delete_missing=False)
+
+    assert (stats['unchanged'], stats['inserted'], stats['missing']) == (2, 1, 1)
+    assert fake_source['written'] == [['E']]
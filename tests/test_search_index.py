@@ -0,0 +1,114 @@
+"""search_index：增量刷新分批读取，读取失败时保留旧文档，全量构建期间的刷新不丢失"""
+
+from mysql.connector import Error
+
+import search_index
+from search_index import SearchIndex, SearchIndexManager
+
+
+def _row(artifact_id, title):
+    return (artifact_id, title, None, None, None, None, None, None, None, None, None, None, None, None)
+
+
+class FakeCursor:
+    """按 IN 参数返回 table 中的文物；failing 中的文物出现在查询里时抛出 Error"""
+
+    def __init__(self, table, failing=()):
+        self.table = table
+        self.failing = set(failing)
+        self.queries = []
+        self._rows = []
+
+    def execute(self, sql, params=()):
+        self.queries.append(list(params))
+        if self.failing.intersection(params):
+            raise Error(msg='lost connection', errno=2013)
+        self._rows = [_row(i, self.table[i]) for i in sorted(params) if i in self.table]
+
+    def fetchmany(self, size):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+    def close(self):
+        pass
+
+
+def _ids(index, term):
+    return sorted(row['artifact_id'] for row in index.search(term))
+
+
+def _manager(cursor, refresh_max=None):
+    manager = SearchIndexManager(lambda: FakeConnection(cursor), enabled=True, refresh_max=refresh_max)
+    manager._index = SearchIndex()
+    for artifact_id in (1, 2, 3):
+        manager._index.add_document(_row(artifact_id, '青铜鼎'))
+    return manager
+
+
+def test_refresh_replaces_updated_and_removes_deleted_documents(monkeypatch):
+    monkeypatch.setattr(search_index, '_REFRESH_BATCH', 2)
+    cursor = FakeCursor({1: '玉璧', 3: '青铜鼎', 4: '玉琮'})
+    manager = _manager(cursor)
+
+    manager.refresh_artifacts([1, 2, 2, 4, None])
+
+    assert cursor.queries == [[1, 2], [4]]
+    assert _ids(manager._index, '玉') == [1, 4]
+    assert _ids(manager._index, '青铜') == [3]
+    assert manager._index.size == 3
+    assert not manager._wakeup.is_set()
+
+
+def test_refresh_keeps_old_documents_when_a_batch_fails(monkeypatch):
+    monkeypatch.setattr(search_index, '_REFRESH_BATCH', 2)
+    cursor = FakeCursor({1: '玉璧', 2: '玉琮', 3: '玉环'}, failing={3})
+    manager = _manager(cursor)
+
+    manager.refresh_artifacts([1, 2, 3])
+
+    # 第一批已替换；第二批读取失败，旧文档仍在索引中，并安排全量重建
+    assert _ids(manager._index, '玉') == [1, 2]
+    assert _ids(manager._index, '青铜') == [3]
+    assert manager._wakeup.is_set()
+
+
+def test_refresh_of_many_artifacts_schedules_a_rebuild():
+    cursor = FakeCursor({})
+    manager = _manager(cursor, refresh_max=2)
+
+    manager.refresh_artifacts([1, 2, 3])
+
+    assert cursor.queries == []
+    assert manager._index.size == 3
+    assert manager._wakeup.is_set()
+
+
+def test_refresh_during_build_is_applied_to_the_new_index(monkeypatch):
+    cursor = FakeCursor({1: '青铜鼎', 2: '青铜爵'})
+    manager = _manager(cursor)
+
+    def load(index):
+        # 构建读到的是旧数据，读取完成前文物 1 被修改并刷新（只作用于当前的旧索引）
+        for artifact_id in (1, 2):
+            index.add_document(_row(artifact_id, '青铜器'))
+        cursor.table[1] = '玉璧'
+        manager.refresh_artifacts([1])
+        return True
+
+    monkeypatch.setattr(manager, '_load', load)
+    assert manager.build()
+
+    assert _ids(manager._index, '玉') == [1]
+    assert _ids(manager._index, '青铜') == [2]
+    assert manager._pending is None